@@ -0,0 +1,96 @@
+"""
+Buffer throughput benchmark
+
+Push messages through a node buffer from a number of interleaved origins, and
+measure how many messages per second go through the synchronisation step. Both
+the built-in passthrough synchroniser and a legacy full-scan synchroniser (a
+plain ``next_batch``-style callable) are measured.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.buffer_throughput --messages 200000
+"""
+
+import argparse
+import json
+import time
+
+from juturna.components import Buffer
+from juturna.components import Message
+from juturna.components._synchronisers import _SYNCHRONISERS
+from juturna.payloads import BytesPayload
+
+
+def _legacy_passthrough(sources: dict) -> dict:
+    return {source: list(range(len(sources[source]))) for source in sources}
+
+
+def run(messages: int, origins: int, synchroniser: str) -> dict:
+    """
+    Run the buffer benchmark.
+
+    Parameters
+    ----------
+    messages : int
+        Number of messages to push through the buffer.
+    origins : int
+        Number of origins the messages are spread across.
+    synchroniser : str
+        Either ``passthrough`` (the built-in synchroniser) or ``legacy``.
+
+    Returns
+    -------
+    dict
+        Throughput of the buffer, in messages per second.
+
+    """
+    sync = (
+        _legacy_passthrough
+        if synchroniser == 'legacy'
+        else _SYNCHRONISERS['passthrough']()
+    )
+
+    buffer = Buffer('bench', sync)
+    payload = BytesPayload(cnt=b'0' * 64)
+    to_push = [
+        Message(creator=f'origin_{i % origins}', version=i, payload=payload)
+        for i in range(messages)
+    ]
+
+    start = time.perf_counter()
+
+    for message in to_push:
+        buffer.put(message)
+        buffer.get(block=False)
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        'origins': origins,
+        'synchroniser': synchroniser,
+        'messages': messages,
+        'msg_per_s': round(messages / elapsed),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', '-m', type=int, default=200_000)
+    parser.add_argument(
+        '--origins', '-o', type=int, nargs='+', default=[1, 4, 16]
+    )
+
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            [
+                run(args.messages, origins, sync)
+                for sync in ('passthrough', 'legacy')
+                for origins in args.origins
+            ],
+            indent=2,
+        )
+    )
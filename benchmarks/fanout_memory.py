@@ -0,0 +1,123 @@
+"""
+Fan-out memory benchmark
+
+Send 1080p frames from a single source node to a number of sink nodes, and
+measure the peak memory allocated while the frames flow through the graph.
+Every sink derives a new payload from the received frame, either sharing the
+frame through a draft (``shared``), or defensively copying it (``copy``).
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.fanout_memory --frames 50 --sinks 8
+"""
+
+import argparse
+import json
+import threading
+import tracemalloc
+
+import numpy as np
+
+from juturna.components import Message
+from juturna.components import Node
+from juturna.payloads import Draft, ImagePayload
+
+
+class _Sink(Node):
+    def __init__(self, mode: str, done: threading.Semaphore, **kwargs):
+        super().__init__(**kwargs)
+
+        self._mode = mode
+        self._done = done
+        self.shared = 0
+
+    def update(self, message: Message[ImagePayload]):
+        frame = message.payload.image
+        draft = Draft(ImagePayload, copy_from=message.payload)
+
+        if self._mode == 'copy':
+            draft.image = frame.copy()
+
+        derived = draft.compile()
+        self.shared += np.shares_memory(derived.image, frame)
+        self._done.release()
+
+
+def run(frames: int, sinks: int, mode: str) -> dict:
+    """
+    Run the fan-out benchmark.
+
+    Parameters
+    ----------
+    frames : int
+        Number of frames to send.
+    sinks : int
+        Number of sink nodes receiving every frame.
+    mode : str
+        Either ``shared`` (zero-copy) or ``copy``.
+
+    Returns
+    -------
+    dict
+        Peak memory allocated while sending the frames, and how many derived
+        payloads shared their pixel buffer with the original frame.
+
+    """
+    done = threading.Semaphore(0)
+    source = Node(node_name='source', pipe_name='bench')
+    receivers = [
+        _Sink(mode, done, node_name=f'sink_{i}', pipe_name='bench')
+        for i in range(sinks)
+    ]
+
+    for sink in receivers:
+        source.add_destination(sink.name, sink)
+        sink.start()
+
+    tracemalloc.start()
+
+    for version in range(frames):
+        frame = np.full((1080, 1920, 3), version % 255, dtype=np.uint8)
+        source.transmit(
+            Message[ImagePayload](
+                creator='source',
+                version=version,
+                payload=ImagePayload(image=frame, width=1920, height=1080),
+            )
+        )
+
+        # wait for all sinks to process the frame before the next one
+        for _ in range(sinks):
+            done.acquire()
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for sink in receivers:
+        sink.stop()
+
+    return {
+        'mode': mode,
+        'frames': frames,
+        'sinks': sinks,
+        'frame_mib': round(1080 * 1920 * 3 / 2**20, 2),
+        'peak_mib': round(peak / 2**20, 2),
+        'shared': sum(sink.shared for sink in receivers),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', '-f', type=int, default=50)
+    parser.add_argument('--sinks', '-s', type=int, default=8)
+
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            [run(args.frames, args.sinks, mode) for mode in ('shared', 'copy')],
+            indent=2,
+        )
+    )
@@ -0,0 +1,93 @@
+"""
+Idle nodes benchmark
+
+Start a number of nodes that never receive any message, and measure how much
+CPU time and how many context switches the process spends while they idle.
+The benchmark also reports how long it takes to stop all the nodes.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.idle_nodes --nodes 1000 --window 10
+"""
+
+import argparse
+import json
+import resource
+import time
+
+from juturna.components import Node
+from juturna.components._scheduler import PoolScheduler
+
+
+def _ctx_switches() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def run(nodes: int, window: float, scheduler: str = 'threaded') -> dict:
+    """
+    Run the idle benchmark.
+
+    Parameters
+    ----------
+    nodes : int
+        Number of idle nodes to start.
+    window : float
+        Observation window, in seconds.
+    scheduler : str
+        Node scheduler, either ``threaded`` or ``pool``.
+
+    Returns
+    -------
+    dict
+        CPU seconds and context switches spent over the window, and the time
+        spent stopping all the nodes.
+
+    """
+    idle = [
+        Node(node_name=f'idle_{i}', pipe_name='bench') for i in range(nodes)
+    ]
+
+    for node in idle:
+        node.scheduler = PoolScheduler() if scheduler == 'pool' else None
+        node.start()
+
+    # let all threads settle before measuring
+    time.sleep(1)
+
+    cpu_start, ctx_start = time.process_time(), _ctx_switches()
+    time.sleep(window)
+    cpu_end, ctx_end = time.process_time(), _ctx_switches()
+
+    stop_start = time.perf_counter()
+
+    for node in idle:
+        node.stop()
+
+    stop_end = time.perf_counter()
+
+    return {
+        'nodes': nodes,
+        'scheduler': scheduler,
+        'window_s': window,
+        'cpu_s': round(cpu_end - cpu_start, 4),
+        'cpu_pct': round(100 * (cpu_end - cpu_start) / window, 2),
+        'ctx_switches': ctx_end - ctx_start,
+        'stop_s': round(stop_end - stop_start, 4),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--nodes', '-n', type=int, default=1000)
+    parser.add_argument('--window', '-w', type=float, default=10.0)
+    parser.add_argument(
+        '--scheduler', '-s', choices=['threaded', 'pool'], default='threaded'
+    )
+
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.nodes, args.window, args.scheduler), indent=2))
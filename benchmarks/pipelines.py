@@ -0,0 +1,92 @@
+"""
+Pipeline regression benchmark
+
+Run the standard topologies (linear chain, wide fan-out, fan-in with a
+synchroniser, and a warp round-trip through a local gRPC service) over a sweep
+of payload types and sizes, and write a json report. Reports of consecutive
+releases can be compared to spot regressions in throughput or tail latency.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.pipelines --output bench-2.1.0.json
+    $ python -m benchmarks.pipelines --baseline bench-2.0.0.json
+"""
+
+import argparse
+import json
+import sys
+
+from juturna.cli.commands import _bench_tools
+
+
+def run(
+    messages: int = 2000,
+    sizes: tuple = _bench_tools.SIZES,
+    baseline: dict | None = None,
+    tolerance: float = 0.1,
+) -> dict:
+    """
+    Run the regression benchmark.
+
+    Parameters
+    ----------
+    messages : int
+        Messages sent by the source in every run.
+    sizes : tuple
+        Payload sizes, in bytes.
+    baseline : dict | None
+        A previous report, to compare the results with.
+    tolerance : float
+        Relative change considered a regression.
+
+    Returns
+    -------
+    dict
+        The report, with the regressions found against the baseline, if any.
+
+    """
+    report = _bench_tools.sweep(
+        _bench_tools.available_topologies(),
+        _bench_tools.PAYLOADS,
+        sizes,
+        messages=messages,
+    )
+
+    if baseline is not None:
+        report['regressions'] = _bench_tools.compare(
+            report, baseline, tolerance
+        )
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', '-n', type=int, default=2000)
+    parser.add_argument(
+        '--sizes', '-s', type=int, nargs='+', default=_bench_tools.SIZES
+    )
+    parser.add_argument('--baseline', '-b')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    parser.add_argument('--output', '-o')
+
+    args = parser.parse_args()
+
+    baseline = None
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = run(args.messages, args.sizes, baseline, args.tolerance)
+    dumped = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(dumped)
+    else:
+        print(dumped)
+
+    sys.exit(1 if report.get('regressions') else 0)
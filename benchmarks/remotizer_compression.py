@@ -0,0 +1,171 @@
+"""
+Remotizer compression benchmark
+
+Measure the size on the wire of audio and image payloads, and the time spent
+encoding and decoding them, with the payload codecs available to warp nodes.
+Payloads are synthetic but structured (a mix of tones with some noise, and a
+smooth gradient with some noise), as incompressible random data would make
+any compression look useless.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.remotizer_compression
+    $ python -m benchmarks.remotizer_compression --seconds 10 --width 1920
+"""
+
+import argparse
+import importlib.util
+import json
+import time
+
+import numpy as np
+
+from juturna.components import Message
+from juturna.payloads import AudioPayload
+from juturna.payloads import ImagePayload
+from juturna.remotizer._codecs import Encoding
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+from juturna.remotizer.utils import create_envelope
+from juturna.remotizer.utils import deserialize_message
+
+
+_AUDIO_ENCODINGS = {
+    'raw': Encoding(),
+    'gzip': Encoding(compression='gzip'),
+    'zstd': Encoding(compression='zstd'),
+    'lz4': Encoding(compression='lz4'),
+    'int16': Encoding(audio='int16'),
+    'int16+zstd': Encoding(compression='zstd', audio='int16'),
+}
+
+_IMAGE_ENCODINGS = {
+    'raw': Encoding(),
+    'zstd': Encoding(compression='zstd'),
+    'lz4': Encoding(compression='lz4'),
+    'png': Encoding(image='png'),
+    'jpeg_90': Encoding(image='jpeg', quality=90),
+    'jpeg_60': Encoding(image='jpeg', quality=60),
+}
+
+_PACKAGES = {'zstd': 'zstandard', 'lz4': 'lz4'}
+
+
+def _available(encoding: Encoding) -> bool:
+    package = _PACKAGES.get(encoding.compression)
+
+    return package is None or importlib.util.find_spec(package) is not None
+
+
+def _audio(seconds: float, rate: int = 16000) -> AudioPayload:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    tones = sum(
+        np.sin(2 * np.pi * f * t) / (i + 1)
+        for i, f in enumerate((220, 440, 660, 1320))
+    )
+    samples = 0.2 * tones + 0.01 * rng.standard_normal(len(t))
+
+    return AudioPayload(
+        audio=samples.astype(np.float32).reshape(-1, 1),
+        sampling_rate=rate,
+        channels=1,
+    )
+
+
+def _image(width: int, height: int) -> ImagePayload:
+    rng = np.random.default_rng(0)
+    x, y = np.linspace(0, 1, width), np.linspace(0, 1, height)
+    base = np.add.outer(y, x) * 127
+    image = np.stack([base, base[::-1], 255 - base], axis=-1)
+    image += rng.normal(0, 4, image.shape)
+
+    return ImagePayload(
+        image=np.clip(image, 0, 255).astype(np.uint8),
+        width=width,
+        height=height,
+        depth=3,
+    )
+
+
+def _measure(name: str, message: Message, encoding: Encoding) -> dict:
+    encoding = encoding if encoding != Encoding() else None
+    repeats = 10
+
+    started = time.perf_counter()
+
+    for _ in range(repeats):
+        data = create_envelope(
+            message, {}, {}, 'bench', id='bench', encoding=encoding
+        ).SerializeToString()
+
+    encoded = time.perf_counter()
+
+    for _ in range(repeats):
+        deserialize_message(ProtoEnvelope.FromString(data).message)
+
+    decoded = time.perf_counter()
+
+    return {
+        'encoding': name,
+        'wire_bytes': len(data),
+        'encode_ms': round((encoded - started) / repeats * 1000, 3),
+        'decode_ms': round((decoded - encoded) / repeats * 1000, 3),
+    }
+
+
+def run(seconds: float = 1.0, width: int = 1280, height: int = 720) -> dict:
+    """
+    Run the compression benchmark.
+
+    Parameters
+    ----------
+    seconds : float
+        Duration of the audio payload, in seconds (16 kHz, mono).
+    width : int
+        Width of the image payload, in pixels.
+    height : int
+        Height of the image payload, in pixels.
+
+    Returns
+    -------
+    dict
+        For audio and image payloads, the wire size, the ratio to the raw
+        size, and the encoding and decoding times (milliseconds) of every
+        available encoding.
+
+    """
+    report = dict()
+    payloads = {
+        'audio': (_audio(seconds), _AUDIO_ENCODINGS),
+        'image': (_image(width, height), _IMAGE_ENCODINGS),
+    }
+
+    for kind, (payload, encodings) in payloads.items():
+        message = Message(creator='bench', version=0, payload=payload)
+        results = [
+            _measure(name, message, encoding)
+            for name, encoding in encodings.items()
+            if _available(encoding)
+        ]
+
+        for result in results:
+            result['ratio'] = round(
+                result['wire_bytes'] / results[0]['wire_bytes'], 4
+            )
+
+        report[kind] = results
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=1.0)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.seconds, args.width, args.height), indent=2))
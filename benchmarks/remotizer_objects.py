@@ -0,0 +1,137 @@
+"""
+Remotizer object benchmark
+
+Measure the time spent serialising a message with an object payload into a
+request, and parsing it back, with object payloads and metadata converted to
+protobuf structs, or packed with the binary object formats available to warp
+nodes. The payload mimics a transcription, with a dictionary for every word.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.remotizer_objects
+    $ python -m benchmarks.remotizer_objects --words 100 1000 10000
+"""
+
+import argparse
+import importlib.util
+import json
+import time
+
+import numpy as np
+
+from juturna.components import Message
+from juturna.payloads import ObjectPayload
+from juturna.remotizer._codecs import Encoding
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+from juturna.remotizer.utils import create_envelope
+from juturna.remotizer.utils import deserialize_message
+
+
+_FORMATS = {'struct': '', 'msgpack': 'msgpack', 'cbor': 'cbor'}
+_PACKAGES = {'msgpack': 'msgpack', 'cbor': 'cbor2'}
+
+WORDS = (10, 100, 1000)
+
+
+def _transcript(words: int) -> Message:
+    rng = np.random.default_rng(0)
+    starts = np.cumsum(rng.uniform(0.1, 0.6, words))
+    message = Message(
+        creator='bench',
+        version=0,
+        payload=ObjectPayload(
+            text=' '.join(f'word{i}' for i in range(words)),
+            language='en',
+            segment=0,
+            words=[
+                {
+                    'word': f'word{i}',
+                    'start': float(start),
+                    'end': float(start + 0.1),
+                    'probability': rng.random(dtype=np.float32),
+                    'speaker': i % 2,
+                }
+                for i, start in enumerate(starts)
+            ],
+        ),
+    )
+    message.meta.update({'session': 'bench', 'chunk': 12, 'offset': 3.5})
+
+    return message
+
+
+def _time(function, *args, budget: float = 0.5) -> float:
+    """Mean duration of a function call, repeated for about a time budget"""
+    calls, started = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started) < budget or not calls:
+        function(*args)
+        calls += 1
+
+    return elapsed / calls
+
+
+def _serialize(message: Message, encoding: Encoding | None) -> bytes:
+    return create_envelope(
+        message, {}, {}, 'bench', id='bench', encoding=encoding
+    ).SerializeToString()
+
+
+def _deserialize(data: bytes) -> Message:
+    return deserialize_message(ProtoEnvelope.FromString(data).message)
+
+
+def run(words: tuple = WORDS) -> list[dict]:
+    """
+    Run the object benchmark.
+
+    Parameters
+    ----------
+    words : tuple
+        Numbers of words of the transcription payloads.
+
+    Returns
+    -------
+    list[dict]
+        For every payload and available format, the wire size, and the time
+        spent serialising and deserialising a message (microseconds).
+
+    """
+    results = list()
+
+    for count in words:
+        message = _transcript(count)
+
+        for name, objects in _FORMATS.items():
+            package = _PACKAGES.get(name)
+
+            if package and importlib.util.find_spec(package) is None:
+                continue
+
+            encoding = Encoding(objects=objects) if objects else None
+            data = _serialize(message, encoding)
+
+            results.append(
+                {
+                    'words': count,
+                    'format': name,
+                    'wire_bytes': len(data),
+                    'serialize_us': round(
+                        _time(_serialize, message, encoding) * 1e6, 2
+                    ),
+                    'deserialize_us': round(_time(_deserialize, data) * 1e6, 2),
+                }
+            )
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--words', '-w', type=int, nargs='+', default=WORDS)
+
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.words), indent=2))
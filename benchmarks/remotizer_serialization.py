@@ -0,0 +1,141 @@
+"""
+Remotizer serialisation benchmark
+
+Measure the time spent serialising a message into a request, and parsing it
+back, for a sweep of payload sizes, with the three serialisation paths of the
+remotizer:
+
+- ``copy``, the message converted to a protobuf message, then copied into the
+  envelope;
+- ``in_place``, the message converted directly into the envelope;
+- ``frames``, the message converted into the envelope, with large arrays sent
+  as raw frames next to it.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.remotizer_serialization --payload image
+    $ python -m benchmarks.remotizer_serialization --sizes 1024 24883200
+"""
+
+import argparse
+import json
+import time
+
+from juturna.cli.commands import _bench_tools
+from juturna.components import Message
+from juturna.remotizer import _framing
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+from juturna.remotizer.utils import create_envelope
+from juturna.remotizer.utils import deserialize_message
+from juturna.remotizer.utils import message_to_proto
+
+
+MODES = ('copy', 'in_place', 'frames')
+
+# a 4k rgb frame is about 24 MiB
+SIZES = (1024, 65536, 1048576, 8388608, 24883200)
+
+
+def _envelope(message: Message, mode: str, frames: list | None = None):
+    return create_envelope(
+        message=message_to_proto(message) if mode == 'copy' else message,
+        configuration={},
+        metadata={},
+        creator='bench',
+        id='bench',
+        frames=frames,
+    )
+
+
+def _serialize(message: Message, mode: str) -> bytes:
+    if mode == 'frames':
+        frames = list()
+        envelope = _envelope(message, mode, frames)
+
+        return _framing.encode((envelope, frames))
+
+    return _envelope(message, mode).SerializeToString()
+
+
+def _deserialize(data: bytes, mode: str) -> Message:
+    if mode == 'frames':
+        envelope, frames = _framing.decode(data)
+
+        return deserialize_message(envelope.message, frames)
+
+    return deserialize_message(ProtoEnvelope.FromString(data).message)
+
+
+def _time(function, *args, budget: float = 0.5) -> float:
+    """Mean duration of a function call, repeated for about a time budget"""
+    calls, started = 0, time.perf_counter()
+
+    while (elapsed := time.perf_counter() - started) < budget or not calls:
+        function(*args)
+        calls += 1
+
+    return elapsed / calls
+
+
+def run(payload: str = 'image', sizes: tuple = SIZES) -> list[dict]:
+    """
+    Run the serialisation benchmark.
+
+    Parameters
+    ----------
+    payload : str
+        Payload type, one of ``audio`` or ``image``.
+    sizes : tuple
+        Approximate payload sizes, in bytes.
+
+    Returns
+    -------
+    list[dict]
+        For every size and serialisation path, the time spent serialising and
+        deserialising a message (microseconds), and the resulting throughput
+        (MiB per second).
+
+    """
+    results = list()
+
+    for size in sizes:
+        message = Message(
+            creator='bench',
+            version=0,
+            payload=_bench_tools.make_payload(payload, size),
+        )
+
+        for mode in MODES:
+            data = _serialize(message, mode)
+            serialize = _time(_serialize, message, mode)
+            deserialize = _time(_deserialize, data, mode)
+
+            results.append(
+                {
+                    'payload': payload,
+                    'size': size,
+                    'mode': mode,
+                    'wire_bytes': len(data),
+                    'serialize_us': round(serialize * 1e6, 2),
+                    'deserialize_us': round(deserialize * 1e6, 2),
+                    'mib_per_s': round(
+                        len(data) / (serialize + deserialize) / 2**20, 1
+                    ),
+                }
+            )
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--payload', '-p', choices=('audio', 'image'), default='image'
+    )
+    parser.add_argument('--sizes', '-s', type=int, nargs='+', default=SIZES)
+
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.payload, args.sizes), indent=2))
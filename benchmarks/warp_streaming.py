@@ -0,0 +1,213 @@
+"""
+Warp streaming benchmark
+
+Serve a relay node through the remote service, in a separate process on
+localhost, and send messages to it through warp nodes keeping a different
+number of requests in flight. With a single request in flight, warp nodes use
+unary calls, and their throughput is bounded by the round-trip time; with more
+requests in flight, messages are pipelined over a single streaming call. Large
+arrays can optionally be exchanged as raw frames.
+
+Usage:
+
+.. code-block:: console
+
+    $ python -m benchmarks.warp_streaming --in-flight 1 4 16 64 --size 65536
+    $ python -m benchmarks.warp_streaming --size 8294400 --raw-frames
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from juturna.cli.commands import _bench_tools
+from juturna.components import Message
+from juturna.components import Node
+
+
+def _serve(ports, stop):
+    from concurrent import futures
+
+    import grpc
+
+    from juturna.cli.commands._juturna_remote_service import (
+        MessagingServiceImpl,
+    )
+    from juturna.remotizer import _framing
+    from juturna.remotizer.c_protos import messaging_service_pb2_grpc
+
+    logging.getLogger('remote_service').setLevel(logging.WARNING)
+    logging.getLogger('jt').setLevel(logging.WARNING)
+
+    relay = _bench_tools._Relay(node_name='remote_relay', pipe_name='bench')
+    relay.start()
+
+    service = MessagingServiceImpl(relay, remote_name='bench')
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=16),
+        options=[
+            ('grpc.max_send_message_length', 100 * 1024 * 1024),
+            ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+        ],
+    )
+    messaging_service_pb2_grpc.add_MessagingServiceServicer_to_server(
+        service, server
+    )
+    _framing.add_framed_methods(service, server)
+    ports.put(server.add_insecure_port('localhost:0'))
+    server.start()
+
+    stop.wait()
+
+    server.stop(grace=1.0)
+    service.shutdown()
+    relay.stop()
+
+
+def run(
+    in_flight: list[int],
+    size: int,
+    messages: int,
+    payload: str = 'audio',
+    window: int = 128,
+    raw_frames: bool = False,
+) -> list[dict]:
+    """
+    Run the warp streaming benchmark.
+
+    Parameters
+    ----------
+    in_flight : list[int]
+        Numbers of requests in flight to measure.
+    size : int
+        Approximate payload size, in bytes.
+    messages : int
+        Number of messages sent for every measure.
+    payload : str
+        Payload type, one of ``bytes``, ``audio``, ``image`` or ``object``.
+    window : int
+        Maximum number of messages sent and not yet received back.
+    raw_frames : bool
+        Exchange large arrays as raw frames.
+
+    Returns
+    -------
+    list[dict]
+        Throughput and latency percentiles (milliseconds) for every number of
+        requests in flight.
+
+    """
+    from juturna.nodes.proc import Warp
+
+    logging.getLogger('jt').setLevel(logging.WARNING)
+
+    context = multiprocessing.get_context('spawn')
+    ports, stop = context.Queue(), context.Event()
+    server = context.Process(target=_serve, args=(ports, stop))
+    server.start()
+
+    port = ports.get(timeout=30)
+    data = _bench_tools.make_payload(payload, size)
+    results = list()
+
+    try:
+        for max_in_flight in in_flight:
+            collector = _bench_tools._Collector()
+            source = Node(node_name='source', pipe_name='bench')
+            warp = Warp(
+                grpc_host='localhost',
+                grpc_port=port,
+                timeout=30,
+                remote_config={},
+                max_in_flight=max_in_flight,
+                raw_frames=raw_frames,
+                node_name='warp',
+                pipe_name='bench',
+            )
+            sink = _bench_tools._Sink(
+                collector, node_name='sink', pipe_name='bench'
+            )
+
+            source.add_destination('warp', warp)
+            warp.add_destination('sink', sink)
+            warp.warmup()
+            sink.start()
+            warp.start()
+
+            started = time.perf_counter()
+
+            for version in range(messages):
+                with collector.cond:
+                    collector.cond.wait_for(
+                        lambda c=collector, v=version: v - c.delivered < window
+                    )
+
+                source.transmit(
+                    Message(creator='source', version=version, payload=data)
+                )
+
+            with collector.cond:
+                collector.cond.wait_for(
+                    lambda c=collector: c.delivered == messages, timeout=60
+                )
+
+            elapsed = time.perf_counter() - started
+
+            warp.stop()
+            sink.stop()
+            warp.destroy()
+
+            latencies = np.array(collector.latencies) * 1000
+
+            results.append(
+                {
+                    'max_in_flight': max_in_flight,
+                    'raw_frames': raw_frames,
+                    'size': size,
+                    'messages': messages,
+                    'delivered': collector.delivered,
+                    'throughput': round(collector.delivered / elapsed, 2),
+                    'latency_ms': dict(
+                        zip(
+                            ('p50', 'p95', 'p99'),
+                            np.percentile(latencies, (50, 95, 99)).tolist(),
+                            strict=True,
+                        )
+                    ),
+                }
+            )
+    finally:
+        stop.set()
+        server.join()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--in-flight', '-i', type=int, nargs='+', default=[1, 4, 16, 64]
+    )
+    parser.add_argument('--size', '-s', type=int, default=65536)
+    parser.add_argument('--messages', '-n', type=int, default=2000)
+    parser.add_argument(
+        '--payload', '-p', choices=_bench_tools.PAYLOADS, default='audio'
+    )
+    parser.add_argument('--window', '-w', type=int, default=128)
+    parser.add_argument('--raw-frames', action='store_true')
+
+    args = parser.parse_args()
+    results = run(
+        args.in_flight,
+        args.size,
+        args.messages,
+        args.payload,
+        args.window,
+        args.raw_frames,
+    )
+
+    print(json.dumps(results, indent=2))
@@ -19,6 +19,8 @@ _MODULES = {
         'stub',
         'remotize',
         'require',
+        'telemetry',
+        'bench',
     ]
 }
 
@@ -0,0 +1,482 @@
+"""
+Pipeline benchmark harness
+
+Standard topologies are assembled from synthetic nodes, and driven from the
+calling thread with a bounded number of messages in flight:
+
+- ``chain``, a source followed by a chain of relay nodes and a sink;
+- ``fanout``, a source sending every message to a number of sinks;
+- ``fanin``, a source sending every message to a number of relays, whose
+  outputs are joined back in a sink by a ``latest_zip`` synchroniser;
+- ``warp``, a relay reached through a warp node and a local gRPC service;
+- ``warp_stream``, the same as ``warp``, with a number of requests kept in
+  flight over a streaming call.
+
+Relay nodes transmit new messages sharing the received payload, so that the
+benchmarks measure the framework overhead rather than any processing cost.
+Latency is measured in the sinks, from the source span of the message trace.
+"""
+
+import importlib.util
+import logging
+import os
+import platform
+import resource
+import threading
+import time
+
+import numpy as np
+
+import juturna as jt
+
+from juturna.components import Message
+from juturna.components import Node
+from juturna.components._synchronisers import LatestZip
+from juturna.payloads import AudioPayload
+from juturna.payloads import Batch
+from juturna.payloads import BytesPayload
+from juturna.payloads import ImagePayload
+from juturna.payloads import ObjectPayload
+
+
+TOPOLOGIES = ('chain', 'fanout', 'fanin', 'warp', 'warp_stream')
+PAYLOADS = ('bytes', 'audio', 'image', 'object')
+SIZES = (1024, 65536, 1048576)
+
+# nodes along the chain, and branches of the fan-out and fan-in topologies
+_DEPTH = 3
+_WIDTH = 4
+
+# time with no delivery after which a run is considered drained
+_IDLE_TIMEOUT = 2.0
+
+
+def available_topologies() -> list[str]:
+    """Topologies that can run, warp ones require grpc to be installed"""
+    has_grpc = importlib.util.find_spec('grpc') is not None
+
+    return [t for t in TOPOLOGIES if has_grpc or not t.startswith('warp')]
+
+
+def make_payload(kind: str, size: int):
+    """
+    Build a payload of the given kind, of about ``size`` bytes.
+
+    Parameters
+    ----------
+    kind : str
+        One of ``bytes``, ``audio``, ``image`` or ``object``.
+    size : int
+        Approximate payload size, in bytes.
+
+    Returns
+    -------
+    BasePayload
+        The payload.
+
+    """
+    match kind:
+        case 'bytes':
+            return BytesPayload(cnt=bytes(size))
+        case 'audio':
+            samples = np.zeros((max(size // 4, 1), 1), dtype=np.float32)
+
+            return AudioPayload(audio=samples, sampling_rate=16000, channels=1)
+        case 'image':
+            side = max(int((size / 3) ** 0.5), 1)
+            image = np.zeros((side, side, 3), dtype=np.uint8)
+
+            return ImagePayload(image=image, width=side, height=side, depth=3)
+        case 'object':
+            return ObjectPayload(text='x' * size)
+
+    raise ValueError(f'unknown payload type: {kind}')
+
+
+class _Collector:
+    """Latencies recorded by the sinks, with a condition to wait on them"""
+
+    def __init__(self):
+        self.latencies: list[float] = list()
+        self.last = (time.perf_counter(), time.process_time())
+        self.cond = threading.Condition()
+
+    def record(self, latency: float):
+        with self.cond:
+            self.latencies.append(latency)
+            self.last = (time.perf_counter(), time.process_time())
+            self.cond.notify_all()
+
+    @property
+    def delivered(self) -> int:
+        return len(self.latencies)
+
+
+class _Relay(Node):
+    def update(self, message: Message):
+        self.transmit(
+            Message(
+                creator=self.name,
+                version=message.version,
+                payload=message.payload,
+            )
+        )
+
+
+class _Sink(Node):
+    def __init__(self, collector: _Collector, **kwargs):
+        super().__init__(**kwargs)
+
+        self._collector = collector
+
+    def update(self, message: Message):
+        now = time.time()
+        messages = (
+            message.payload.messages
+            if isinstance(message.payload, Batch)
+            else (message,)
+        )
+
+        self._collector.record(
+            now - min(m.trace.spans[0].end_ts for m in messages)
+        )
+
+
+def _link(origin: Node, destination: Node):
+    origin.add_destination(destination.name, destination)
+    destination.origins.append(origin.name)
+
+
+def _build(topology: str, collector: _Collector, max_in_flight: int) -> tuple:
+    """Build a topology, returning its source, nodes, expected fan factor"""
+    logging.getLogger('jt.bench').setLevel(logging.WARNING)
+
+    source = Node(node_name='source', pipe_name='bench')
+    nodes, stoppers = list(), list()
+
+    def _node(cls, name, **kwargs):
+        node = cls(node_name=name, pipe_name='bench', **kwargs)
+        nodes.append(node)
+
+        return node
+
+    match topology:
+        case 'chain':
+            previous = source
+
+            for i in range(_DEPTH):
+                relay = _node(_Relay, f'relay_{i}')
+                _link(previous, relay)
+                previous = relay
+
+            _link(previous, _node(_Sink, 'sink', collector=collector))
+            fan = 1
+        case 'fanout':
+            for i in range(_WIDTH):
+                _link(source, _node(_Sink, f'sink_{i}', collector=collector))
+
+            fan = _WIDTH
+        case 'fanin':
+            sink = _node(
+                _Sink, 'sink', collector=collector, synchroniser=LatestZip()
+            )
+
+            for i in range(_WIDTH):
+                relay = _node(_Relay, f'relay_{i}')
+                _link(source, relay)
+                _link(relay, sink)
+
+            fan = 1
+        case 'warp' | 'warp_stream':
+            in_flight = max_in_flight if topology == 'warp_stream' else 1
+            warp, stop_service = _warp(_node, in_flight)
+            _link(source, warp)
+            _link(warp, _node(_Sink, 'sink', collector=collector))
+            stoppers.append(stop_service)
+            fan = 1
+        case _:
+            raise ValueError(f'unknown topology: {topology}')
+
+    return source, nodes, fan, stoppers
+
+
+def _warp(make_node, max_in_flight: int) -> tuple:
+    """Serve a relay node on a local gRPC service, and build a warp node"""
+    from concurrent import futures
+
+    import grpc
+
+    from juturna.cli.commands._juturna_remote_service import (
+        MessagingServiceImpl,
+    )
+    from juturna.nodes.proc import Warp
+    from juturna.remotizer import _framing
+    from juturna.remotizer.c_protos import messaging_service_pb2_grpc
+
+    logging.getLogger('remote_service').setLevel(logging.WARNING)
+
+    remote = _Relay(node_name='remote_relay', pipe_name='bench')
+    remote.start()
+
+    service = MessagingServiceImpl(remote, remote_name='bench')
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+    messaging_service_pb2_grpc.add_MessagingServiceServicer_to_server(
+        service, server
+    )
+    _framing.add_framed_methods(service, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+
+    warp = make_node(
+        Warp,
+        'warp',
+        grpc_host='localhost',
+        grpc_port=port,
+        timeout=30,
+        remote_config={},
+        max_in_flight=max_in_flight,
+    )
+    warp.warmup()
+
+    def _stop():
+        warp.destroy()
+        server.stop(grace=1.0)
+        service.shutdown()
+        remote.stop()
+
+    return warp, _stop
+
+
+def _rss() -> float:
+    """Current resident set size, in MiB (0 where not available)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return 0.0
+
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def run(
+    topology: str,
+    payload: str,
+    size: int,
+    messages: int = 2000,
+    window: int = 64,
+    max_in_flight: int = 16,
+) -> dict:
+    """
+    Run a benchmark of a topology, with a given payload.
+
+    Parameters
+    ----------
+    topology : str
+        One of ``chain``, ``fanout``, ``fanin``, ``warp`` or ``warp_stream``.
+    payload : str
+        One of ``bytes``, ``audio``, ``image`` or ``object``.
+    size : int
+        Approximate payload size, in bytes.
+    messages : int
+        Number of messages sent by the source.
+    window : int
+        Maximum number of messages in flight.
+    max_in_flight : int
+        Maximum number of requests in flight in the ``warp_stream`` topology.
+
+    Returns
+    -------
+    dict
+        Throughput (messages delivered to the sinks per second), latency
+        percentiles (milliseconds), CPU usage and resident memory (MiB).
+
+    """
+    collector = _Collector()
+    source, nodes, fan, stoppers = _build(topology, collector, max_in_flight)
+    data = make_payload(payload, size)
+
+    for node in nodes:
+        node.start()
+
+    cpu_start = time.process_time()
+    started = time.perf_counter()
+
+    try:
+        for version in range(messages):
+            # keep at most a window of messages in flight
+            with collector.cond:
+                collector.cond.wait_for(
+                    lambda sent=version: (
+                        sent * fan - collector.delivered < window * fan
+                    ),
+                    timeout=_IDLE_TIMEOUT,
+                )
+
+            source.transmit(
+                Message(creator='source', version=version, payload=data)
+            )
+
+        # synchronisers may discard messages, so the run ends once the
+        # sinks stop receiving, and lasts until the last delivery
+        with collector.cond:
+            while collector.delivered < messages * fan:
+                delivered = collector.delivered
+
+                collector.cond.wait(_IDLE_TIMEOUT)
+
+                if collector.delivered == delivered:
+                    break
+
+            elapsed = max(collector.last[0] - started, 1e-9)
+            cpu = max(collector.last[1] - cpu_start, 0.0)
+
+        rss = _rss()
+    finally:
+        for node in nodes:
+            node.stop()
+
+        for stop in stoppers:
+            stop()
+
+    latencies = np.array(collector.latencies) * 1000
+    percentiles = (
+        np.percentile(latencies, (50, 95, 99)).tolist()
+        if len(latencies)
+        else [None] * 3
+    )
+
+    return {
+        'topology': topology,
+        'payload': payload,
+        'size': size,
+        'messages': messages,
+        'delivered': collector.delivered,
+        'seconds': round(elapsed, 4),
+        'throughput': round(collector.delivered / elapsed, 2),
+        'latency_ms': {
+            'p50': percentiles[0],
+            'p95': percentiles[1],
+            'p99': percentiles[2],
+            'max': float(latencies.max()) if len(latencies) else None,
+        },
+        'cpu_seconds': round(cpu, 4),
+        'cpu_percent': round(cpu / elapsed * 100, 1),
+        'rss_mib': round(rss, 2),
+        # kibibytes on linux
+        'peak_rss_mib': round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10, 2
+        ),
+    }
+
+
+def sweep(
+    topologies: list[str],
+    payloads: list[str],
+    sizes: list[int],
+    messages: int = 2000,
+    window: int = 64,
+    progress=None,
+) -> dict:
+    """
+    Run all the combinations of topologies, payloads and sizes.
+
+    Parameters
+    ----------
+    topologies : list[str]
+        Topologies to run.
+    payloads : list[str]
+        Payload types to send.
+    sizes : list[int]
+        Payload sizes, in bytes.
+    messages : int
+        Number of messages sent by the source in every run.
+    window : int
+        Maximum number of messages in flight.
+    progress : callable, optional
+        Invoked with the result of every run.
+
+    Returns
+    -------
+    dict
+        The environment the benchmarks ran in, and the results of all runs.
+
+    """
+    results = list()
+
+    for topology in topologies:
+        for payload in payloads:
+            for size in sizes:
+                result = run(topology, payload, size, messages, window)
+                results.append(result)
+
+                if progress is not None:
+                    progress(result)
+
+    return {
+        'juturna': jt.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'created_at': time.time(),
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.1) -> list:
+    """
+    Compare a benchmark report with a baseline report.
+
+    Parameters
+    ----------
+    report : dict
+        The report to check.
+    baseline : dict
+        The reference report, such as the one of the previous release.
+    tolerance : float
+        Relative change beyond which a run is considered a regression.
+
+    Returns
+    -------
+    list
+        The regressions, as dictionaries with the run, the metric, and its
+        baseline and current values.
+
+    """
+
+    def _key(result):
+        return result['topology'], result['payload'], result['size']
+
+    reference = {_key(r): r for r in baseline['results']}
+    regressions = list()
+
+    for result in report['results']:
+        if (before := reference.get(_key(result))) is None:
+            continue
+
+        checks = [
+            ('throughput', before['throughput'], result['throughput'], -1),
+            (
+                'p99_ms',
+                before['latency_ms']['p99'],
+                result['latency_ms']['p99'],
+                1,
+            ),
+        ]
+
+        for metric, old, new, sign in checks:
+            if not old or new is None:
+                continue
+
+            if sign * (new - old) / old > tolerance:
+                regressions.append(
+                    {
+                        'topology': result['topology'],
+                        'payload': result['payload'],
+                        'size': result['size'],
+                        'metric': metric,
+                        'baseline': old,
+                        'current': new,
+                    }
+                )
+
+    return regressions
@@ -4,6 +4,7 @@ import queue
 import threading
 import time
 import itertools
+import uuid
 
 from concurrent import futures
 
@@ -12,14 +13,16 @@ import grpc
 from juturna.components import Message, Node
 from juturna.remotizer._remote_context import RequestContext
 from juturna.remotizer._remote_builder import _standalone_builder
+from juturna.remotizer import _framing
+from juturna.remotizer._codecs import Encoding
 
 from juturna.remotizer.utils import (
     deserialize_envelope,
     create_envelope,
-    message_to_proto,
 )
 
 from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoMessage
 from juturna.remotizer.c_protos import messaging_service_pb2_grpc
 
 
@@ -135,45 +138,113 @@ class MessagingServiceImpl(messaging_service_pb2_grpc.MessagingServiceServicer):
 
         logger.info('Dispatcher loop shutting down')
 
-    def SendAndReceive(self, request: ProtoEnvelope, context):
-        """Handle request-response pattern asynchronously"""
-        try:
-            self._increment_stat('total_requests')
+    def _submit(
+        self, request: ProtoEnvelope, frames: list | None = None
+    ) -> tuple[int, RequestContext]:
+        """Register a request, and put its message into the node"""
+        envelope_dict = deserialize_envelope(request, frames)
+        request_message = envelope_dict['message']
+        tracking_id = next(self._tracking_id_counter)
+        sender = envelope_dict.get('sender')
+        envelope_id = envelope_dict.get('id')
+
+        if not sender:
+            raise ValueError('Missing sender in request envelope')
+
+        timeout = request.ttl if request.ttl > 0 else self.DEFAULT_TIMEOUT
+        timeout = min(timeout, self.MAX_TIMEOUT)
+
+        # responses are encoded as the requests are
+        encoding = request.metadata.fields.get('encoding')
+        encoding = Encoding.from_dict(
+            dict(encoding.struct_value) if encoding is not None else None
+        )
 
-            envelope_dict = deserialize_envelope(request)
-            request_message = envelope_dict['message']
-            tracking_id = next(self._tracking_id_counter)
-            sender = envelope_dict.get('sender')
-            envelope_id = envelope_dict.get('id')
+        request_context = RequestContext(
+            message_id=request_message.id,
+            timeout=timeout,
+            sender=sender,
+            envelope_id=envelope_id,
+            response_type=envelope_dict.get('response_type', None),
+            encoding=encoding,
+        )
 
-            if not sender:
-                raise ValueError('Missing sender in request envelope')
+        with self.requests_lock:
+            if tracking_id in self.pending_requests:
+                raise ValueError(f'Duplicate tracking_id: {tracking_id}')
+            self.pending_requests[tracking_id] = request_context
 
-            timeout = request.ttl if request.ttl > 0 else self.DEFAULT_TIMEOUT
-            timeout = min(timeout, self.MAX_TIMEOUT)
+        request_message.id = tracking_id
 
-            request_context = RequestContext(
-                message_id=request_message.id,
-                timeout=timeout,
-                sender=sender,
-                envelope_id=envelope_id,
-                response_type=envelope_dict.get('response_type', None),
+        if envelope_dict.get('configuration'):
+            _configuration_to_be_applied = envelope_dict.get(
+                'configuration', {}
             )
 
-            with self.requests_lock:
-                if tracking_id in self.pending_requests:
-                    raise ValueError(f'Duplicate tracking_id: {tracking_id}')
-                self.pending_requests[tracking_id] = request_context
+        request_message._freeze()
+        self.node.put(request_message)
+
+        return tracking_id, request_context
+
+    def _respond(
+        self,
+        response_message: Message,
+        request_context: RequestContext,
+        frames: list | None = None,
+    ) -> ProtoEnvelope:
+        """Wrap the response to a request into an envelope"""
+        response_envelope = create_envelope(
+            message=response_message,
+            creator=self.remote_name,
+            configuration={},
+            metadata={
+                'processing_time': time.time() - request_context.created_at
+            },
+            id=str(uuid.uuid4()),
+            request_type=type(response_message.payload).__name__,
+            priority=0,
+            response_to=request_context.envelope_id,
+            timeout=request_context.timeout,
+            frames=frames,
+            encoding=request_context.encoding,
+        )
 
-            request_message.id = tracking_id
+        self._increment_stat('successful_requests')
 
-            if envelope_dict.get('configuration'):
-                _configuration_to_be_applied = envelope_dict.get(
-                    'configuration', {}
-                )
+        return response_envelope
+
+    def SendAndReceive(self, request: ProtoEnvelope, context):
+        """Handle request-response pattern asynchronously"""
+        return self._send_and_receive(request, context)
+
+    def SendAndReceiveFramed(self, request: tuple, context):
+        """
+        Same as ``SendAndReceive``, with large arrays exchanged as raw frames
+        next to the envelopes (see ``juturna.remotizer._framing``)
+        """
+        envelope, frames = request
+        response_frames = list()
+
+        response = self._send_and_receive(
+            envelope, context, frames, response_frames
+        )
+
+        return response, response_frames
+
+    def _send_and_receive(
+        self,
+        request: ProtoEnvelope,
+        context,
+        frames: list | None = None,
+        response_frames: list | None = None,
+    ) -> ProtoEnvelope:
+        tracking_id = None
+
+        try:
+            self._increment_stat('total_requests')
 
-            request_message._freeze()
-            self.node.put(request_message)
+            tracking_id, request_context = self._submit(request, frames)
+            timeout = request_context.timeout
 
             try:
                 response_message = request_context.future.result(timeout)
@@ -187,25 +258,10 @@ class MessagingServiceImpl(messaging_service_pb2_grpc.MessagingServiceServicer):
                 with self.requests_lock:
                     self.pending_requests.pop(tracking_id, None)
 
-            proto_response = message_to_proto(response_message)
-
-            response_envelope = create_envelope(
-                message=proto_response,
-                creator=self.remote_name,
-                configuration={},
-                metadata={
-                    'processing_time': time.time() - request_context.created_at
-                },
-                request_type=type(response_message.payload).__name__,
-                priority=0,
-                response_to=envelope_id,
-                timeout=timeout,
+            return self._respond(
+                response_message, request_context, response_frames
             )
 
-            self._increment_stat('successful_requests')
-
-            return response_envelope
-
         except TimeoutError as e:
             self._increment_stat('timeout_requests')
             logger.error(f'Timeout for {tracking_id}: {e}')
@@ -222,6 +278,116 @@ class MessagingServiceImpl(messaging_service_pb2_grpc.MessagingServiceServicer):
             context.abort(grpc.StatusCode.INTERNAL, str(e))
             return ProtoEnvelope()
 
+    def SendAndReceiveStream(self, request_iterator, context):
+        """
+        Handle many requests over a single stream. Requests are read in a
+        separate thread, so that new requests can be submitted while earlier
+        ones are still being processed, and responses are streamed back as
+        soon as they are available. Requests that fail get a response with
+        no message, and the error in the envelope metadata.
+        """
+        return self._stream(request_iterator, context, framed=False)
+
+    def SendAndReceiveStreamFramed(self, request_iterator, context):
+        """
+        Same as ``SendAndReceiveStream``, with large arrays exchanged as raw
+        frames next to the envelopes (see ``juturna.remotizer._framing``)
+        """
+        return self._stream(request_iterator, context, framed=True)
+
+    def _stream(self, request_iterator, context, framed: bool):
+        # completed requests, as request contexts or envelopes
+        responses = queue.Queue()
+        in_flight = [0]
+        in_flight_lock = threading.Lock()
+        done_reading = threading.Event()
+
+        def _reader():
+            try:
+                for request in request_iterator:
+                    request, frames = request if framed else (request, None)
+                    self._increment_stat('total_requests')
+
+                    with in_flight_lock:
+                        in_flight[0] += 1
+
+                    try:
+                        _, request_context = self._submit(request, frames)
+                    except Exception as e:
+                        self._increment_stat('invalid_requests')
+                        logger.error(f'Invalid request: {e}')
+                        responses.put(self._error_envelope(request.id, e))
+
+                        continue
+
+                    request_context.future.add_done_callback(
+                        lambda _, ctx=request_context: responses.put(ctx)
+                    )
+            except grpc.RpcError:
+                # the client went away, pending responses are discarded
+                ...
+            finally:
+                done_reading.set()
+                responses.put(None)
+
+        threading.Thread(
+            target=_reader, name='RemoteServiceStreamReader', daemon=True
+        ).start()
+
+        while context.is_active() and not self._stop_event.is_set():
+            try:
+                completed = responses.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+            if completed is None:
+                # all requests read, wait for the ones still in flight
+                with in_flight_lock:
+                    if in_flight[0] == 0:
+                        return
+
+                continue
+
+            with in_flight_lock:
+                in_flight[0] -= 1
+                finished = done_reading.is_set() and in_flight[0] == 0
+
+            yield self._stream_response(completed, framed)
+
+            if finished:
+                return
+
+    def _stream_response(
+        self, completed: RequestContext | ProtoEnvelope, framed: bool
+    ) -> ProtoEnvelope | tuple:
+        frames = list() if framed else None
+
+        if isinstance(completed, ProtoEnvelope):
+            response = completed
+        else:
+            try:
+                response = self._respond(
+                    completed.future.result(), completed, frames
+                )
+            except Exception as e:
+                self._increment_stat('failed_requests')
+                logger.error(f'Request {completed.envelope_id} failed: {e}')
+
+                response = self._error_envelope(completed.envelope_id, e)
+                frames = list() if framed else None
+
+        return (response, frames) if framed else response
+
+    def _error_envelope(self, envelope_id: str, error: Exception):
+        return create_envelope(
+            message=ProtoMessage(),
+            creator=self.remote_name,
+            configuration={},
+            metadata={'error': f'{type(error).__name__}: {error}'},
+            id=str(uuid.uuid4()),
+            response_to=envelope_id,
+        )
+
     def shutdown(self):
         """Graceful shutdown"""
         logger.info('Initiating service shutdown...')
@@ -289,6 +455,7 @@ def serve(args):
         service_impl,
         server,
     )
+    _framing.add_framed_methods(service_impl, server)
 
     server.add_insecure_port(f'[::]:{args.port}')
 
@@ -6,6 +6,7 @@ import uvicorn
 import juturna as jt
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from juturna.components._pipeline_manager import PipelineManager
 from juturna.cli.commands.models.api import PipelineConfig
@@ -78,6 +79,32 @@ def pipeline_status(pipeline_id: str):
     return status
 
 
+@app.get('/pipelines/{pipeline_id}/metrics', response_class=PlainTextResponse)
+def pipeline_metrics(pipeline_id: str):
+    return PlainTextResponse(
+        PipelineManager().pipeline_metrics(pipeline_id),
+        media_type='text/plain; version=0.0.4',
+    )
+
+
+@app.post('/pipelines/{pipeline_id}/nodes/{node_name}/profile')
+def profile_node(
+    pipeline_id: str,
+    node_name: str,
+    seconds: float = 5.0,
+    memory: bool = False,
+    format: str = 'json',
+):
+    profile = PipelineManager().profile_node(
+        pipeline_id, node_name, seconds, memory
+    )
+
+    if format == 'collapsed':
+        return PlainTextResponse(profile['stacks'])
+
+    return profile
+
+
 def run(
     host: str,
     port: int,
@@ -0,0 +1,186 @@
+import collections
+
+import numpy as np
+
+from juturna.components._telemetry_sinks import TELEMETRY_FIELDS
+from juturna.components._telemetry_sinks import build_sink
+from juturna.components._telemetry_sinks import iter_telemetry
+
+
+_PERCENTILES = (50, 95, 99)
+_CHUNK = 65536
+
+# node codes are stored above message ids in the keys used to match events
+_NODE_SHIFT = 40
+
+
+def _latencies(
+    rx_keys: np.ndarray,
+    rx_ts: np.ndarray,
+    tx_keys: np.ndarray,
+    tx_ts: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Match every transmission with the reception it was produced from, on the
+    same node, and return the node codes and the time elapsed between the two.
+    Keys hold the node code in their upper bits, and the message id (for
+    receptions) or the data source id (for transmissions) in the lower ones.
+    """
+    if not len(rx_keys) or not len(tx_keys):
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    order = np.argsort(rx_keys, kind='stable')
+    rx_keys, rx_ts = rx_keys[order], rx_ts[order]
+
+    position = np.searchsorted(rx_keys, tx_keys).clip(max=len(rx_keys) - 1)
+    matched = rx_keys[position] == tx_keys
+
+    return (
+        tx_keys[matched] >> _NODE_SHIFT,
+        tx_ts[matched] - rx_ts[position[matched]],
+    )
+
+
+def summarise(files: list[str]) -> dict[str, dict]:
+    """
+    Summarise one or more telemetry files. Files are read in chunks, and only
+    the keys and timestamps needed to match receptions and transmissions are
+    kept, so that large files can be summarised in limited memory.
+
+    Parameters
+    ----------
+    files : list[str]
+        Telemetry files, in any of the supported formats.
+
+    Returns
+    -------
+    dict[str, dict]
+        Per node statistics: event counts, transmission rate, and processing
+        latency percentiles in milliseconds (time between the reception of a
+        message and the transmission of a message produced from it).
+
+    """
+    names: dict[str, int] = dict()
+    counts: dict[tuple[int, str], int] = collections.Counter()
+    first: dict[int, float] = dict()
+    last: dict[int, float] = dict()
+    latencies = list()
+
+    for file in files:
+        # message ids are only unique within a run, so files are matched one
+        # by one
+        rx_keys, rx_ts, tx_keys, tx_ts = list(), list(), list(), list()
+
+        for columns in iter_telemetry(file, _CHUNK):
+            node, inverse = np.unique(columns['node'], return_inverse=True)
+            codes = np.array(
+                [names.setdefault(str(n), len(names)) for n in node],
+                dtype=np.int64,
+            )[inverse]
+            ts, evt = columns['ts'], columns['evt']
+
+            for kind in np.unique(evt):
+                nodes, kind_counts = np.unique(
+                    codes[evt == kind], return_counts=True
+                )
+
+                for code, count in zip(nodes, kind_counts, strict=True):
+                    counts[int(code), str(kind)] += int(count)
+
+            for code in np.unique(codes).tolist():
+                node_ts = ts[codes == code]
+                first[code] = min(first.get(code, np.inf), node_ts.min())
+                last[code] = max(last.get(code, -np.inf), node_ts.max())
+
+            rx = evt == 'rx'
+            rx_keys.append(codes[rx] << _NODE_SHIFT | columns['msg_id'][rx])
+            rx_ts.append(ts[rx])
+
+            tx = (evt == 'tx') & (columns['src_id'] >= 0)
+            tx_keys.append(codes[tx] << _NODE_SHIFT | columns['src_id'][tx])
+            tx_ts.append(ts[tx])
+
+        if rx_keys:
+            latencies.append(
+                _latencies(
+                    np.concatenate(rx_keys),
+                    np.concatenate(rx_ts),
+                    np.concatenate(tx_keys),
+                    np.concatenate(tx_ts),
+                )
+            )
+
+    nodes = np.concatenate([n for n, _ in latencies] or [np.empty(0)])
+    elapsed = np.concatenate([e for _, e in latencies] or [np.empty(0)])
+
+    summary = dict()
+
+    for name in sorted(names):
+        code = names[name]
+        node_latency = elapsed[nodes == code] * 1000
+
+        stats = {
+            kind: count
+            for (c, kind), count in sorted(counts.items())
+            if c == code
+        }
+        span = last[code] - first[code]
+
+        stats['tx_rate'] = float(stats.get('tx', 0) / span) if span else 0.0
+
+        for p, value in zip(
+            _PERCENTILES,
+            np.percentile(node_latency, _PERCENTILES)
+            if len(node_latency)
+            else [None] * len(_PERCENTILES),
+            strict=True,
+        ):
+            stats[f'p{p}_ms'] = None if value is None else float(value)
+
+        summary[name] = stats
+
+    return summary
+
+
+def convert(
+    files: list[str],
+    output: str,
+    format: str | None = None,
+    **options,
+) -> list:
+    """
+    Convert one or more telemetry files into a different format.
+
+    Parameters
+    ----------
+    files : list[str]
+        Telemetry files, in any of the supported formats.
+    output : str
+        Destination file.
+    format : str | None
+        Destination format, guessed from the output suffix if not provided.
+    options : dict
+        Destination sink options.
+
+    Returns
+    -------
+    list
+        The files written.
+
+    """
+    sink = build_sink(output, format, **options)
+
+    try:
+        for file in files:
+            for columns in iter_telemetry(file, _CHUNK):
+                chunk = [columns[field].tolist() for field in TELEMETRY_FIELDS]
+
+                # missing ids are stored as -1 by the binary format only
+                for index in (4, 5):
+                    chunk[index] = [None if v < 0 else v for v in chunk[index]]
+
+                sink.write(list(zip(*chunk, strict=True)))
+    finally:
+        sink.close()
+
+    return sink.segments
@@ -0,0 +1,130 @@
+"""
+Pipeline benchmarks
+
+Run the standard benchmark topologies over a sweep of payload types and
+sizes, and report throughput, latency percentiles, CPU and memory usage as
+json. When a baseline report is provided, the command exits with an error if
+any run regressed beyond the given tolerance.
+"""
+
+import json
+import sys
+
+from juturna.cli import _cli_utils
+from juturna.cli.commands import _bench_tools
+
+
+def setup_parser(subparsers):  # noqa: D103
+    parser = subparsers.add_parser(
+        'bench',
+        help='benchmark standard pipeline topologies',
+    )
+
+    parser.add_argument(
+        '--topology',
+        '-t',
+        nargs='+',
+        choices=_bench_tools.TOPOLOGIES,
+        default=_bench_tools.available_topologies(),
+        help='topologies to run (default: all the available ones)',
+    )
+
+    parser.add_argument(
+        '--payload',
+        '-p',
+        nargs='+',
+        choices=_bench_tools.PAYLOADS,
+        default=list(_bench_tools.PAYLOADS),
+        help='payload types to send (default: all)',
+    )
+
+    parser.add_argument(
+        '--size',
+        '-s',
+        nargs='+',
+        type=int,
+        default=list(_bench_tools.SIZES),
+        help='payload sizes, in bytes (default: 1 KiB, 64 KiB, 1 MiB)',
+    )
+
+    parser.add_argument(
+        '--messages',
+        '-n',
+        type=int,
+        default=2000,
+        help='messages sent by the source in every run (default: 2000)',
+    )
+
+    parser.add_argument(
+        '--window',
+        '-w',
+        type=int,
+        default=64,
+        help='maximum number of messages in flight (default: 64)',
+    )
+
+    parser.add_argument(
+        '--output',
+        '-o',
+        metavar='FILE',
+        help='write the report into this file, rather than printing it',
+    )
+
+    parser.add_argument(
+        '--baseline',
+        '-b',
+        metavar='FILE',
+        type=_cli_utils._is_file_ok,
+        help='baseline report to compare the results with',
+    )
+
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='relative change considered a regression (default: 0.1)',
+    )
+
+
+def _progress(result: dict):
+    print(
+        f'{result["topology"]:<8} {result["payload"]:<8} '
+        f'{result["size"]:>9} B  {result["throughput"]:>10.1f} msg/s  '
+        f'p99 {result["latency_ms"]["p99"] or 0:>8.2f} ms',
+        file=sys.stderr,
+    )
+
+
+def _execute(args):
+    report = _bench_tools.sweep(
+        args.topology,
+        args.payload,
+        args.size,
+        messages=args.messages,
+        window=args.window,
+        progress=_progress,
+    )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        report['regressions'] = _bench_tools.compare(
+            report, baseline, args.tolerance
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if report.get('regressions'):
+        for r in report['regressions']:
+            print(
+                f'regression: {r["topology"]} {r["payload"]} {r["size"]} '
+                f'{r["metric"]} {r["baseline"]} -> {r["current"]}',
+                file=sys.stderr,
+            )
+
+        return 1
@@ -5,6 +5,7 @@ from ._pipeline_exceptions import (
     NotReadyException,
     AlreadyRunningException,
     NotRunningException,
+    InvalidNodeNameException,
 )
 
 from ._handlers_provider import (
@@ -18,6 +19,7 @@ __all__ = [
     'NotReadyException',
     'AlreadyRunningException',
     'NotRunningException',
+    'InvalidNodeNameException',
     'register_pipeline_exception_handlers',
     'register_generic_exception_handler',
 ]
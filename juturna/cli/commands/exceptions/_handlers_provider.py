@@ -8,6 +8,7 @@ from juturna.cli.commands.exceptions import (
     AlreadyRunningException,
     NotReadyException,
     NotRunningException,
+    InvalidNodeNameException,
 )
 
 
@@ -63,6 +64,18 @@ def _not_running_handler(
     )
 
 
+def _invalid_node_name_handler(
+    request: Request, exception: InvalidNodeNameException
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={
+            'message': f'no node {exception.node_name} in pipeline '
+            f'{exception.pipeline_id}'
+        },
+    )
+
+
 def _make_generic_exception_handler(logger: Logger):
     def _generic_exception_handler(
         request: Request, exception: Exception
@@ -85,6 +98,7 @@ def register_pipeline_exception_handlers(app: FastAPI) -> None:
         - AlreadyRunningException
         - NotReadyException
         - NotRunningException
+        - InvalidNodeNameException
 
     Args:
         app (FastAPI): Fastapi instance to apply handlers to
@@ -103,6 +117,10 @@ def register_pipeline_exception_handlers(app: FastAPI) -> None:
 
     app.add_exception_handler(NotRunningException, _not_running_handler)
 
+    app.add_exception_handler(
+        InvalidNodeNameException, _invalid_node_name_handler
+    )
+
 
 def register_generic_exception_handler(app: FastAPI, logger: Logger) -> None:
     """
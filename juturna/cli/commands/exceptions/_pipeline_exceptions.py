@@ -32,3 +32,17 @@ class AlreadyRunningException(BasePipelineException):
 
 class NotRunningException(BasePipelineException):
     pass
+
+
+class InvalidNodeNameException(BasePipelineException):
+    def __init__(self, pipeline_id: str, node_name: str):
+        """
+        Raise an Exception for a node missing from a pipeline
+
+        Args:
+            pipeline_id (str): pipeline id
+            node_name (str): node name
+
+        """
+        super().__init__(pipeline_id)
+        self.node_name = node_name
@@ -0,0 +1,101 @@
+"""
+Telemetry analysis
+
+Summarise telemetry files from the CLI, printing per node event counts and
+processing latency percentiles, or convert them into a different format (for
+instance, binary telemetry into CSV or Parquet for further analysis).
+"""
+
+import json
+
+from juturna.cli import _cli_utils
+from juturna.cli.commands._telemetry_tools import convert
+from juturna.cli.commands._telemetry_tools import summarise
+
+
+def setup_parser(subparsers):  # noqa: D103
+    parser = subparsers.add_parser(
+        'telemetry',
+        help='summarise or convert pipeline telemetry files',
+    )
+
+    parser.add_argument(
+        'files',
+        nargs='+',
+        metavar='FILE',
+        type=_cli_utils._is_file_ok,
+        help='telemetry files (csv, binary, arrow or parquet)',
+    )
+
+    parser.add_argument(
+        '--output',
+        '-o',
+        metavar='FILE',
+        help='convert the files into this file, rather than summarising them',
+    )
+
+    parser.add_argument(
+        '--format',
+        '-f',
+        choices=['csv', 'binary', 'arrow'],
+        help='output format, guessed from the output suffix if not provided',
+    )
+
+    parser.add_argument(
+        '--compression',
+        '-z',
+        help='output compression (gzip, bz2, lzma, or zstd, lz4 for arrow)',
+    )
+
+    parser.add_argument(
+        '--json',
+        '-j',
+        action='store_true',
+        help='print the summary as json',
+    )
+
+
+def _execute(args):
+    if args.output:
+        written = convert(
+            args.files,
+            args.output,
+            args.format,
+            compression=args.compression,
+        )
+
+        for file in written:
+            print(file)
+
+        return
+
+    summary = summarise(args.files)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+
+        return
+
+    columns = ['rx', 'tx', 'drop', 'tx_rate', 'p50_ms', 'p95_ms', 'p99_ms']
+    width = max([len('node'), *map(len, summary)])
+
+    print(f'{"node":<{width}}', *(f'{c:>10}' for c in columns))
+
+    for node, stats in summary.items():
+        print(
+            f'{node:<{width}}',
+            *(
+                _cell(stats.get(c, 0 if c in ('rx', 'tx', 'drop') else None))
+                for c in columns
+            ),
+        )
+
+
+def _cell(value) -> str:
+    if value is None:
+        return f'{"-":>10}'
+
+    if isinstance(value, float):
+        return f'{value:>10.3f}'
+
+    return f'{value:>10}'
@@ -1,8 +1,19 @@
 # noqa: D104
 from juturna.components._message import Message
+from juturna.components._message import Span
+from juturna.components._message import Trace
 from juturna.components._node import Node
+from juturna.components._async_node import AsyncNode
 from juturna.components._pipeline import Pipeline
 from juturna.components._buffer import Buffer
 
 
-__all__ = ['Message', 'Node', 'Pipeline', 'Buffer']
+__all__ = [
+    'Message',
+    'Span',
+    'Trace',
+    'Node',
+    'AsyncNode',
+    'Pipeline',
+    'Buffer',
+]
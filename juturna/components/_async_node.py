@@ -0,0 +1,509 @@
+"""
+Async nodes
+
+Async nodes define their ``update()`` method as a coroutine, and run on an
+event loop shared by all the async nodes of a pipeline, rather than on threads
+of their own. While a node awaits I/O in its ``update()``, the loop keeps
+serving the other async nodes, and, if the node allows for it, further
+``update()`` calls of the same node, so that I/O-bound nodes can keep many
+requests in flight with no thread per message.
+
+Async nodes are linked to threaded nodes as usual: threaded nodes put
+messages in their inbound queue from their own threads, while async nodes
+transmit messages with the awaitable ``transmit()`` method.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+
+from concurrent.futures import Future
+
+from juturna.components import Message
+from juturna.components._inbound_queue import _is_data
+from juturna.components._node import Node
+from juturna.payloads import ControlPayload, ControlSignal
+from juturna.names import ComponentStatus
+from juturna.utils.log_utils import jt_logger
+
+
+class EventLoop:
+    """
+    An asyncio event loop running in a dedicated thread. A pipeline creates a
+    single event loop, shared by all its async nodes, while an async node used
+    outside of a pipeline creates its own.
+    """
+
+    def __init__(self, name: str = ''):
+        """
+        Parameters
+        ----------
+        name : str
+            Name of the loop, used to name its thread.
+
+        """
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._logger = jt_logger(f'{name}.loop')
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The underlying asyncio loop, started on first access"""
+        self.start()
+
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop(self) -> bool:
+        """Whether the caller runs on the loop thread"""
+        return threading.current_thread() is self._thread
+
+    def start(self):
+        """Start the loop thread, if not already running"""
+        with self._lock:
+            if self.running:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                name=f'_loop_{self._name}',
+                target=self._run,
+                daemon=True,
+            )
+            self._thread.start()
+
+        self._logger.info('event loop started')
+
+    def submit(self, coroutine) -> Future:
+        """
+        Schedule a coroutine on the loop, from any thread.
+
+        Parameters
+        ----------
+        coroutine : Coroutine
+            The coroutine to run.
+
+        Returns
+        -------
+        Future
+            A concurrent future holding the coroutine result.
+
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Schedule a callback on the loop, from any thread"""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def close(self):
+        """Stop the loop, and wait for its thread to terminate"""
+        with self._lock:
+            if not self.running:
+                return
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+        if not self.in_loop():
+            self._thread.join()
+
+        self._logger.info('event loop closed')
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+
+class AsyncNode(Node):
+    """
+    Base class for nodes whose ``update()`` method is a coroutine. The
+    ``concurrency`` parameter caps how many ``update()`` calls can be in
+    flight at once: with the default of 1, messages are processed one after
+    the other, in the order they were received, as in threaded nodes.
+    """
+
+    def __init__(self, concurrency: int = 1, **kwargs):
+        """
+        Parameters
+        ----------
+        concurrency : int
+            Maximum number of concurrent ``update()`` calls.
+        kwargs : dict
+            Supernode arguments.
+
+        """
+        if concurrency < 1:
+            raise ValueError(f'invalid concurrency: {concurrency}')
+
+        super().__init__(**kwargs)
+
+        self._concurrency = concurrency
+        self._event_loop: EventLoop | None = None
+        self._own_loop = False
+
+        self._run_future: Future | None = None
+        self._source_future: Future | None = None
+
+        # loop-side state, created when the node is started
+        self._has_work: asyncio.Event | None = None
+        self._has_room: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        # data source and trace context of the update running in the current
+        # task
+        self._data_source = contextvars.ContextVar(
+            f'_data_source_{self.name}', default=None
+        )
+        self._trace = contextvars.ContextVar(
+            f'_trace_{self.name}', default=(dict(), 0.0)
+        )
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def event_loop(self) -> EventLoop:
+        """Event loop the node runs on"""
+        if self._event_loop is None:
+            self._event_loop = EventLoop(f'{self.pipe_name}.{self.name}')
+            self._own_loop = True
+
+        return self._event_loop
+
+    @event_loop.setter
+    def event_loop(self, event_loop: EventLoop):
+        self._event_loop = event_loop
+        self._own_loop = False
+
+    @Node.scheduler.setter
+    def scheduler(self, scheduler):
+        # async nodes are always driven by their event loop
+        pass
+
+    @Node.micro_batch.setter
+    def micro_batch(self, policy: dict | None):
+        if policy is not None:
+            self._logger.warning('async nodes do not support micro-batching')
+
+    async def update(self, message: Message): ...
+
+    def put(self, message: Message, overflow: str | None = None):
+        """
+        Put a message in the node inbound queue. When invoked from the event
+        loop of the node, :meth:`aput` should be awaited instead, so that the
+        loop is not blocked on a full queue.
+        """
+        super().put(message, overflow)
+        self._notify()
+
+    async def aput(self, message: Message, overflow: str | None = None):
+        """
+        Put a message in the node inbound queue, from its event loop. If the
+        blocking overflow policy applies and the queue is full, wait for the
+        node to consume its queue.
+        """
+        policy = overflow or self._queue.policy
+        is_data = not isinstance(message.payload, ControlPayload)
+
+        while (
+            is_data
+            and policy == 'block'
+            and self._has_room is not None
+            and self._queue.full()
+        ):
+            self._has_room.clear()
+            await self._has_room.wait()
+
+        self.put(message, overflow)
+
+    async def transmit(
+        self,
+        message: Message | ControlSignal,
+        source: Message | None = None,
+    ):
+        """
+        Transmit a message to all the node destinations. Messages are frozen
+        before transmission, so that immutability is ensured.
+
+        Parameters
+        ----------
+        message : Message
+            The message to be transmitted.
+        source : Message, optional
+            The received message the transmitted one was produced from. If not
+            provided, the message being processed by the current ``update()``
+            call is used.
+
+        """
+        if source is None:
+            source = self._data_source.get()
+
+        object.__setattr__(
+            message,
+            '_data_source_id',
+            self._last_data_source_evt_id if source is None else source.id,
+        )
+        self._stamp_trace(message, self._trace.get())
+        _ = message._freeze() if isinstance(message, Message) else None
+
+        for node_name, destination in list(self._destinations.items()):
+            kwargs = (
+                {'overflow': self._link_overflow[node_name]}
+                if node_name in self._link_overflow
+                else {}
+            )
+
+            await self._deliver(destination, message, kwargs)
+
+        if isinstance(message, Message):
+            self._metrics.on_tx(message)
+            self._rec_telemetry(message, 'tx')
+
+        if self._auto_dump:
+            self.dump_json(message, f'auto_{message.id}.json')
+
+    def start(self):
+        """
+        Start the node. If you override this method in your custom node class,
+        make sure to call the parent method to ensure the node is started
+        correctly.
+        """
+        self._draining.clear()
+        self._stop_worker_event.clear()
+        self._stop_source_event.clear()
+        self._stop_update_event.clear()
+
+        self._status = ComponentStatus.RUNNING
+        self.event_loop.submit(self._prepare()).result()
+        self._run_future = self.event_loop.submit(self._run())
+
+        if self._source_f is None:
+            return
+
+        if inspect.iscoroutinefunction(self._source_f):
+            self._source_future = self.event_loop.submit(self._asource())
+
+            return
+
+        if self._source_thread is None:
+            self._source_thread = threading.Thread(
+                name=f'_source_{self.name}',
+                target=self._source,
+                args=(),
+                daemon=True,
+            )
+
+            self._source_thread.start()
+
+    def stop(self):
+        """
+        Stop the node. If you override this method in your custom node class,
+        make sure to call the parent method to ensure the node is stopped
+        correctly.
+        """
+        if self._status == ComponentStatus.STOPPED:
+            return
+
+        self._draining.set()
+        self._stop_worker_event.set()
+        self._stop_source_event.set()
+        self._stop_update_event.set()
+
+        if self._source_future is not None:
+            self._source_future.cancel()
+
+        self._notify()
+        self.join()
+
+        self._run_future = None
+        self._source_future = None
+        self._source_thread = None
+        self._status = ComponentStatus.STOPPED
+
+        if self._own_loop:
+            self._event_loop.close()
+            self._event_loop = None
+
+        self._logger.info('node stopped')
+
+    def join(self):
+        """Wait for the node to process its stop signal"""
+        if self._run_future is not None and not self.event_loop.in_loop():
+            self._run_future.result()
+
+        current_thread = threading.current_thread()
+
+        if (
+            self._source_thread is not None
+            and self._source_thread.is_alive()
+            and self._source_thread is not current_thread
+        ):
+            self._source_thread.join()
+
+    def _notify(self):
+        # wake up the node on its loop, if the node is running on one
+        if self._has_work is None or self._event_loop is None:
+            return
+
+        if self._event_loop.running:
+            self._event_loop.call_soon(self._has_work.set)
+
+    async def _prepare(self):
+        self._has_work = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._slots = asyncio.Semaphore(self._concurrency)
+
+        if not self._queue.empty():
+            self._has_work.set()
+
+    async def _run(self):
+        while not self._stop_update_event.is_set():
+            await self._has_work.wait()
+            self._has_work.clear()
+
+            while not self._queue.empty():
+                message = self._queue.get_nowait()
+                self._has_room.set()
+
+                if self._suspended and not isinstance(
+                    message.payload, ControlPayload
+                ):
+                    await self.transmit(message)
+
+                    continue
+
+                self._enqueue(message)
+
+                while not self._buffer.empty():
+                    if not await self._aprocess(self._buffer.get(block=False)):
+                        self._stop_update_event.set()
+
+                        return
+
+                # let other nodes run between messages
+                await asyncio.sleep(0)
+
+        await self._drain()
+
+    async def _aprocess(self, batch: Message) -> bool:
+        """
+        Process a batch released by the buffer. Returns ``False`` when the
+        batch carried a stop signal, so the node should stop processing.
+        """
+        if isinstance(batch.payload, ControlPayload):
+            # control signals apply once all the previous batches are done
+            await self._drain()
+
+            if batch.payload.signal == ControlSignal.STOP_PROPAGATE:
+                await self.transmit(batch)
+
+            self._handle_control(batch)
+
+            return batch.payload.signal >= 0
+
+        await self._slots.acquire()
+
+        task = asyncio.get_running_loop().create_task(self._invoke(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+        return True
+
+    async def _invoke(self, batch: Message):
+        self._last_data_source_evt_id = batch.id
+        self._data_source.set(batch)
+        self._trace.set(self._begin_trace((batch,)))
+        started = time.perf_counter()
+
+        try:
+            await self.update(batch)
+        except Exception as e:
+            self._logger.error(f'update failed: {e}', exc_info=True)
+        finally:
+            self._metrics.on_update(time.perf_counter() - started)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        self._slots.release()
+
+    async def _drain(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _asource(self):
+        while not self._stop_source_event.is_set():
+            if self._source_mode == 'pre':
+                await asyncio.sleep(self._source_sleep)
+
+            message = await self._source_f()
+
+            if (
+                isinstance(message.payload, ControlPayload)
+                and message.payload.signal < 0
+            ):
+                self._stop_source_event.set()
+                await self.aput(message)
+
+                return
+
+            if self._stop_source_event.is_set():
+                return
+
+            if self._source_mode == 'post':
+                await asyncio.sleep(self._source_sleep)
+
+            await self.aput(message)
+
+    def _control(self, message: Message):
+        # stop propagation is transmitted from the loop
+        if message.payload.signal == ControlSignal.STOP_PROPAGATE:
+            self._logger.warning(
+                'the stop propagate signal is deprecated, use STOP instead'
+            )
+            self.stop()
+
+            return
+
+        super()._control(message)
+
+    async def _deliver(self, destination, message: Message, kwargs: dict):
+        if isinstance(destination, AsyncNode) and (
+            destination.event_loop is self.event_loop
+        ):
+            await destination.aput(message, **kwargs)
+
+            return
+
+        # threaded destinations block on a full queue, and the queue can fill
+        # up between any check and the put, so whenever blocking is possible
+        # they are fed from the loop executor rather than from the loop itself
+        dest_queue = getattr(destination, '_queue', None)
+
+        if (
+            dest_queue is None
+            or dest_queue.maxsize <= 0
+            or (
+                _is_data(message)
+                and (kwargs.get('overflow') or dest_queue.policy) != 'block'
+            )
+        ):
+            destination.put(message, **kwargs)
+
+            return
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(destination.put, message, **kwargs)
+        )
@@ -1,51 +1,149 @@
 import typing
-import threading
 import queue
+import time
+import contextlib
 
+from collections import deque
 from collections.abc import Callable
 
 from juturna.components import Message
 from juturna.utils.log_utils import jt_logger
 
-from juturna.payloads import Batch
+from juturna.payloads import Batch, ControlPayload
 from juturna.meta import JUTURNA_MAX_QUEUE_SIZE
 
+from juturna.components._synchronisers import Synchroniser
+
+
+# sentinel used to wake up threads blocked on node queues with no timeout
+_WAKEUP = object()
+
 
 class Buffer:
-    def __init__(self, creator: str, synchroniser: Callable | None = None):
-        self._data: dict[str, list[Message]] = dict()
-        self._data_lock = threading.Lock()
-        self._synchroniser: Callable = synchroniser
+    def __init__(
+        self, creator: str, synchroniser: Synchroniser | Callable | None = None
+    ):
+        # a buffer is only written by the worker thread of its node (or by one
+        # scheduler step at a time), so its data needs no lock
+        self._data: dict[str, deque[Message]] = dict()
+        self._synchroniser = synchroniser
 
         # out queue can be built based on the synchronisation policy
         self._out_queue = queue.Queue(maxsize=JUTURNA_MAX_QUEUE_SIZE)
 
+        # batch taken out of the queue while grouping, and not yet consumed
+        self._held = None
+
         self._creator = creator
         self._logger = jt_logger(creator)
         self._logger.propagate = True
 
-    def get(self, timeout: float = None) -> typing.Any:
-        return self._out_queue.get(timeout=timeout)
+    @property
+    def synchroniser(self) -> Synchroniser | Callable | None:
+        return self._synchroniser
+
+    @synchroniser.setter
+    def synchroniser(self, synchroniser: Synchroniser | Callable):
+        self._synchroniser = synchroniser
+
+    def get(self, block: bool = True, timeout: float = None) -> typing.Any:
+        if self._held is not None:
+            held, self._held = self._held, None
+
+            return held
+
+        return self._out_queue.get(block=block, timeout=timeout)
+
+    def get_many(
+        self, max_size: int, max_wait: float = 0, block: bool = True
+    ) -> list:
+        """
+        Get a group of batches for micro-batching. The method waits for a
+        first batch, then keeps collecting batches until the group holds
+        ``max_size`` of them, or ``max_wait`` seconds passed since the first
+        one was collected. Control messages are never grouped: they are always
+        returned on their own, and stop the collection of the current group.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of batches in the group.
+        max_wait : float
+            Maximum time to wait for further batches after the first one.
+        block : bool
+            Whether to wait for batches at all. If false, only the batches
+            already available are collected.
+
+        Returns
+        -------
+        list
+            The collected batches, in release order.
+
+        """
+        group = [self.get(block=block)]
+
+        if Buffer._is_barrier(group[0]):
+            return group
+
+        deadline = time.monotonic() + max_wait
+
+        while len(group) < max_size:
+            timeout = deadline - time.monotonic()
+
+            try:
+                batch = (
+                    self._out_queue.get(timeout=timeout)
+                    if block and timeout > 0
+                    else self._out_queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+
+            if Buffer._is_barrier(batch):
+                self._held = batch
+
+                break
+
+            group.append(batch)
+
+        return group
+
+    def wake(self):
+        """
+        Wake up a consumer blocked on the outbound queue. If the queue is full
+        no consumer is waiting on it, so nothing needs to be done.
+        """
+        with contextlib.suppress(queue.Full):
+            self._out_queue.put_nowait(_WAKEUP)
+
+    def qsize(self) -> int:
+        """Number of batches ready to be consumed"""
+        return self._out_queue.qsize()
+
+    def empty(self) -> bool:
+        """Whether there are no batches ready to be consumed"""
+        return self._held is None and self._out_queue.empty()
 
     def put(self, message: Message | None):
-        if message.creator not in self._data:
-            self._data[message.creator] = list()
+        origin = message.creator
 
-        self._data[message.creator].append(message)
+        if (origin_data := self._data.get(origin)) is None:
+            origin_data = self._data[origin] = deque()
 
-        with self._data_lock:
-            next_batch = self._synchroniser(self._data)
+        origin_data.append(message)
 
-            self._consume(next_batch)
+        if isinstance(self._synchroniser, Synchroniser):
+            for group in self._synchroniser.arrived(origin, self._data):
+                self._release(group)
+        else:
+            self._consume(self._synchroniser(self._data))
 
     def _consume(self, marks: dict[str, list[int]]):
         """
         Consume sent data
 
-        Once a policy produces the data marks to send, consume then so that
-        local data will be updated accordingly. Depending on whether the next
-        batch is a single message or a list of messages, the method will write
-        in the queue a Message or a Batch object.
+        Once a legacy synchroniser produces the data marks to send, consume
+        them so that local data will be updated accordingly.
 
         Parameters
         ----------
@@ -56,9 +154,19 @@ class Buffer:
         to_send = list()
 
         for mark in marks:
+            origin_data = self._data[mark]
+
             for pop_idx in marks[mark][::-1]:
-                to_send.append(self._data[mark].pop(pop_idx))
+                to_send.append(Buffer._pop(origin_data, pop_idx))
 
+        self._release(to_send)
+
+    def _release(self, to_send: typing.Sequence[Message]):
+        """
+        Release messages for processing. Depending on whether the next batch
+        is a single message or a list of messages, the method will write in
+        the queue a Message or a Batch object.
+        """
         if len(to_send) == 0:
             return
 
@@ -73,15 +181,35 @@ class Buffer:
 
         self._out_queue.put(to_send)
 
+    @staticmethod
+    def _is_barrier(batch: typing.Any) -> bool:
+        return batch is _WAKEUP or isinstance(batch.payload, ControlPayload)
+
+    @staticmethod
+    def _pop(origin_data: deque, idx: int) -> Message:
+        if idx == 0:
+            return origin_data.popleft()
+
+        if idx in (-1, len(origin_data) - 1):
+            return origin_data.pop()
+
+        message = origin_data[idx]
+        del origin_data[idx]
+
+        return message
+
     def flush(self):
         """Flush the buffer content"""
-        with self._data_lock:
-            self._data = dict()
+        self._data = dict()
+        self._held = None
+
+        if isinstance(self._synchroniser, Synchroniser):
+            self._synchroniser.reset()
 
-            while not self._out_queue.empty():
-                try:
-                    self._out_queue.get_nowait()
-                except queue.Empty:
-                    break
+        while not self._out_queue.empty():
+            try:
+                self._out_queue.get_nowait()
+            except queue.Empty:
+                break
 
-            self._logger.debug('buffer flushed')
+        self._logger.debug('buffer flushed')
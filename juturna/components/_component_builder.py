@@ -6,7 +6,7 @@ import traceback
 from juturna.components import _mapper as mapper
 
 from juturna.utils.log_utils import jt_logger
-from juturna.components._synchronisers import _SYNCHRONISERS
+from juturna.components._synchronisers import build_synchroniser
 from juturna.utils.jt_utils._get_env_var import get_env_var
 from juturna.meta._constants import JUTURNA_ENV_VAR_PREFIX
 
@@ -60,7 +60,7 @@ def build_component(node: dict, plugin_dirs: list, pipe_name: str):
         }
     )
 
-    synchroniser = _SYNCHRONISERS.get(node_sync)
+    synchroniser = build_synchroniser(node_sync)
     concrete_node = _node_module(
         **operational_config,
         **{
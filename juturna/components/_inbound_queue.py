@@ -0,0 +1,144 @@
+"""
+Node inbound queue
+
+The inbound queue is a bounded FIFO queue that applies an overflow policy when
+messages are offered to it. Policies decide what happens to data messages when
+the queue is full:
+
+- ``block``: wait until there is room in the queue (default);
+- ``drop_oldest``: discard the oldest queued message to make room;
+- ``drop_newest``: discard the offered message;
+- ``coalesce_latest``: discard the queued messages from the same creator as
+  the offered one, so that only the newest message of each origin is kept, and
+  fall back to ``drop_oldest`` if the queue is still full.
+
+Control messages are never dropped nor coalesced, and are always enqueued with
+the ``block`` policy.
+"""
+
+import queue
+import collections
+
+from juturna.components import Message
+from juturna.payloads import ControlPayload
+
+
+_OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest', 'coalesce_latest')
+
+
+def _is_data(item) -> bool:
+    return isinstance(item, Message) and not isinstance(
+        item.payload, ControlPayload
+    )
+
+
+class InboundQueue(queue.Queue):
+    def __init__(self, maxsize: int = 0, policy: str = 'block'):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of queued messages. If 0, the queue is unbounded
+            and overflow policies never apply.
+        policy : str
+            Default overflow policy of the queue.
+
+        """
+        super().__init__(maxsize=maxsize)
+
+        self.policy = policy
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy: str):
+        if policy not in _OVERFLOW_POLICIES:
+            raise ValueError(f'unknown overflow policy: {policy}')
+
+        self._policy = policy
+
+    def offer(
+        self, item: Message, policy: str | None = None, block: bool = True
+    ) -> list:
+        """
+        Enqueue an item, applying an overflow policy.
+
+        Parameters
+        ----------
+        item : Message
+            The message to enqueue.
+        policy : str, optional
+            Overflow policy to apply to this item. If not provided, the queue
+            default policy will be used.
+        block : bool
+            Whether to wait for room when the ``block`` policy applies. If
+            false, the item is enqueued over the queue bound instead.
+
+        Returns
+        -------
+        list
+            Messages dropped to enqueue the item. With the ``drop_newest``
+            policy, this includes the offered item itself.
+
+        """
+        policy = policy or self._policy
+
+        if policy == 'block' or not _is_data(item):
+            if block:
+                self.put(item)
+
+                return list()
+
+            with self.not_full:
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+
+            return list()
+
+        dropped = list()
+
+        with self.not_full:
+            # like the other policies, coalescing only applies to a full queue,
+            # so the scan of the queued messages is never paid without pressure
+            if 0 < self.maxsize <= self._qsize():
+                if policy == 'drop_newest':
+                    return [item]
+
+                if policy == 'coalesce_latest':
+                    dropped = self._coalesce(item.creator)
+
+                if not dropped and (oldest := self._drop_oldest()) is not None:
+                    dropped.append(oldest)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+        return dropped
+
+    def _coalesce(self, creator: str) -> list:
+        kept, dropped = collections.deque(), list()
+
+        for queued in self.queue:
+            if _is_data(queued) and queued.creator == creator:
+                dropped.append(queued)
+            else:
+                kept.append(queued)
+
+        if dropped:
+            self.queue = kept
+
+        return dropped
+
+    def _drop_oldest(self) -> Message | None:
+        for idx, queued in enumerate(self.queue):
+            if _is_data(queued):
+                del self.queue[idx]
+
+                return queued
+
+        # only control messages are queued, let the queue overflow
+        return None
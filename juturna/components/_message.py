@@ -7,6 +7,48 @@ from contextlib import contextmanager
 from types import MappingProxyType
 
 from juturna.payloads import Draft
+from juturna.payloads._payloads import _seal
+
+
+class Span(typing.NamedTuple):
+    """Processing of a message by a node, as recorded in a trace"""
+
+    node: str
+    enqueue_ts: float
+    start_ts: float
+    end_ts: float
+
+    @property
+    def queued(self) -> float:
+        """Time spent in the node inbound queue and buffer"""
+        return self.start_ts - self.enqueue_ts
+
+    @property
+    def duration(self) -> float:
+        """Time between the start of the update and the transmission"""
+        return self.end_ts - self.start_ts
+
+
+class Trace(typing.NamedTuple):
+    """
+    Trace context of a message: the id of the source message it descends from,
+    and the spans of all the nodes along the way, in processing order.
+    """
+
+    root_id: int
+    spans: tuple[Span, ...] = ()
+
+    def extend(self, span: Span) -> 'Trace':
+        """Return a new trace, with the given span appended"""
+        return Trace(self.root_id, (*self.spans, span))
+
+    def span(self, node: str) -> Span | None:
+        """Return the last span recorded by the given node, if any"""
+        for span in reversed(self.spans):
+            if span.node == node:
+                return span
+
+        return None
 
 
 class Message[T_Input]:
@@ -22,6 +64,7 @@ class Message[T_Input]:
         'version',
         'meta',
         'timers',
+        'trace',
         '_payload',
         '_is_frozen',
         '_data_source_id',
@@ -62,6 +105,7 @@ class Message[T_Input]:
         )
 
         self.payload = payload
+        self.trace: Trace | None = None
         self._data_source_id: int | None = None
 
         object.__setattr__(self, '_is_frozen', False)
@@ -82,13 +126,19 @@ class Message[T_Input]:
         object.__delattr__(self, key)
 
     def _freeze(self):
-        """Freeze the message, making it immutable."""
+        """
+        Freeze the message, making it immutable. Arrays in the payload are
+        marked as read-only, so that all the destinations of the message can
+        share them with no copies.
+        """
         if self._is_frozen:
             return
 
         if isinstance(self.payload, Draft):
             self.payload = self.payload.compile()
 
+        _seal(self.payload)
+
         self.meta = MappingProxyType(self.meta)
         self.timers = MappingProxyType(self.timers)
 
@@ -0,0 +1,204 @@
+"""
+Message logs
+
+A message log is a compact, append-only recording of the messages carried by
+a link, that a ``replay`` source node can stream back into a pipeline. A log
+file starts with a header, followed by one record per message: a tag, the
+time the message was recorded, the length of the message state, and the state
+itself, pickled as it is when sent to process-isolated nodes. Every time a
+file is appended to, a new header is written.
+
+Logs are read through memory mapping, so replaying a log does not load it in
+memory, and records truncated by an interrupted recording are ignored. As any
+pickled data, logs should only be read when they come from a trusted source.
+"""
+
+import mmap
+import pathlib
+import pickle
+import struct
+import threading
+import time
+
+from collections.abc import Iterator
+
+from juturna.components import Message
+from juturna.components._serialization import dump_message
+from juturna.components._serialization import load_message
+from juturna.payloads import ControlPayload
+
+
+_FILE_HEADER = b'JTML\x01'
+_RECORD_HEADER = struct.Struct('<cdI')
+_RECORD_TAG = b'M'
+
+_WRITE_BUFFER = 1 << 20
+
+
+class MessageLogWriter:
+    """
+    Append the messages it receives to a message log. The writer can be added
+    as a destination of any node, and records all the messages the node
+    transmits, except control messages.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            The log file, created if it does not exist.
+
+        """
+        self._path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self._path, 'ab', buffering=_WRITE_BUFFER)  # noqa: SIM115
+        self._file.write(_FILE_HEADER)
+
+        self.records = 0
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    def put(self, message: Message, overflow: str | None = None):
+        """
+        Record a message. The signature matches the one of ``Node.put()``, so
+        that the writer can be used as a link destination.
+
+        Parameters
+        ----------
+        message : Message
+            The message to record.
+        overflow : str, optional
+            Ignored, recording never drops messages.
+
+        """
+        if isinstance(message.payload, ControlPayload):
+            return
+
+        state = pickle.dumps(
+            dump_message(message), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        header = _RECORD_HEADER.pack(_RECORD_TAG, time.time(), len(state))
+
+        with self._lock:
+            if self._file.closed:
+                return
+
+            self._file.write(header)
+            self._file.write(state)
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class MessageLog:
+    """
+    Read a message log. Records are indexed when the log is opened, but only
+    unpickled when accessed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            The log file.
+
+        """
+        self._path = pathlib.Path(path)
+
+        with open(self._path, 'rb') as f:
+            self._data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if self._path.stat().st_size
+                else b''
+            )
+
+        self._index = self._scan(memoryview(self._data))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[tuple[float, Message]]:
+        for position in range(len(self._index)):
+            yield self.read(position)
+
+    def __enter__(self) -> 'MessageLog':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def duration(self) -> float:
+        """Time elapsed between the first and the last recorded message"""
+        if not self._index:
+            return 0.0
+
+        return self._index[-1][0] - self._index[0][0]
+
+    def read(self, position: int) -> tuple[float, Message]:
+        """
+        Read a record of the log.
+
+        Parameters
+        ----------
+        position : int
+            Position of the record in the log.
+
+        Returns
+        -------
+        tuple[float, Message]
+            The time the message was recorded, and the message. The message
+            has the recorded content, but a new identifier.
+
+        """
+        timestamp, offset, length = self._index[position]
+
+        with memoryview(self._data) as view:
+            state = pickle.loads(view[offset : offset + length])
+
+        return timestamp, load_message(state, keep_id=False)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def _scan(self, view: memoryview) -> list[tuple[float, int, int]]:
+        index = list()
+        offset = 0
+
+        while offset < len(view):
+            if view[offset : offset + len(_FILE_HEADER)] == _FILE_HEADER:
+                offset += len(_FILE_HEADER)
+
+                continue
+
+            if offset + _RECORD_HEADER.size > len(view):
+                break
+
+            tag, timestamp, length = _RECORD_HEADER.unpack_from(view, offset)
+            offset += _RECORD_HEADER.size
+
+            if tag != _RECORD_TAG:
+                raise ValueError(f'invalid message log record at byte {offset}')
+
+            # the last record may be truncated if recording was interrupted
+            if offset + length > len(view):
+                break
+
+            index.append((timestamp, offset, length))
+            offset += length
+
+        view.release()
+
+        return index
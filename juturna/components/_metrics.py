@@ -0,0 +1,402 @@
+"""
+Node metrics
+
+Every node keeps a set of in-process metrics, cheap enough to be always on:
+reception and transmission counters and rates, dropped messages, the duration
+of its ``update()`` calls, and the end-to-end latency of the messages it
+receives, that is the time elapsed since the source message they were produced
+from was created. Durations are recorded in log-linear histograms, in the
+spirit of HDR histograms, with a relative error of about 3%.
+
+Counters and histograms are kept both in total (as Prometheus expects them)
+and over a rolling window, so that the node status reflects what the node is
+doing now, rather than since it was started. Updates are not synchronised, so
+concurrent updates from different threads may occasionally be lost.
+"""
+
+import threading
+import time
+
+from juturna.components import Message
+from juturna.payloads import ControlPayload
+
+
+# sub-buckets per power of two, the relative error is 1 / _SUB_BUCKETS
+_SUB_BUCKETS = 32
+_SUB_BITS = 5
+_BUCKETS = 1024
+
+# bucket upper bounds (seconds) of the histograms exported to prometheus
+_PROMETHEUS_BOUNDS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _bucket(micros: int) -> int:
+    if micros < 2 * _SUB_BUCKETS:
+        return max(micros, 0)
+
+    shift = micros.bit_length() - _SUB_BITS - 1
+
+    return min((shift << _SUB_BITS) + (micros >> shift), _BUCKETS - 1)
+
+
+def _upper_bound(bucket: int) -> int:
+    if bucket < 2 * _SUB_BUCKETS:
+        return bucket + 1
+
+    shift = bucket // _SUB_BUCKETS - 1
+
+    return (bucket - (shift << _SUB_BITS) + 1) << shift
+
+
+class Histogram:
+    """Log-linear histogram of durations, recorded with microsecond units"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[_bucket(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: 'Histogram'):
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> float:
+        """Upper bound of the given percentile, in seconds"""
+        if not self.count:
+            return 0.0
+
+        rank = percentile / 100 * self.count
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+
+            if count and seen >= rank:
+                return min(_upper_bound(index) / 1_000_000, self.max)
+
+        return self.max
+
+    def cumulative(self, bounds: tuple) -> list[int]:
+        """Number of values not greater than each of the given bounds"""
+        cumulative = list()
+        seen = 0
+        index = 0
+
+        for bound in bounds:
+            limit = bound * 1_000_000
+
+            while index < _BUCKETS and _upper_bound(index) <= limit:
+                seen += self.counts[index]
+                index += 1
+
+            cumulative.append(seen)
+
+        return cumulative
+
+
+class _Rolling:
+    """
+    Value tracked both in total and over a rolling window, split in slots
+    that are reset as the window moves forward.
+    """
+
+    def __init__(self, factory, window: float, slots: int):
+        self._factory = factory
+        self._slot_length = window / slots
+        self._epochs = [-1] * slots
+        self._slots = [factory() for _ in range(slots)]
+
+    def current(self):
+        epoch = int(time.monotonic() / self._slot_length)
+        index = epoch % len(self._slots)
+
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._slots[index] = self._factory()
+
+        return self._slots[index]
+
+    def window(self) -> list:
+        """Slots within the window, and the time they cover"""
+        epoch = int(time.monotonic() / self._slot_length)
+
+        return [
+            slot
+            for slot, slot_epoch in zip(self._slots, self._epochs, strict=True)
+            if epoch - slot_epoch < len(self._slots)
+        ]
+
+    @property
+    def length(self) -> float:
+        return self._slot_length * len(self._slots)
+
+
+class _Counter:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+
+class LatencyTracker:
+    """
+    Track the creation time of the source message each message descends from,
+    following the data source ids messages are transmitted with. A pipeline
+    shares a single tracker among its nodes.
+    """
+
+    def __init__(self, max_size: int = 65536):
+        self._origins: dict[int, float] = dict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def received(self, message: Message) -> float:
+        """Record a received message, and return its end-to-end latency"""
+        with self._lock:
+            origin = self._origins.get(message.id)
+
+            if origin is None:
+                # messages with no tracked ancestor are source messages
+                origin = self._add(message.id, message.created_at)
+
+        return time.time() - origin
+
+    def transmitted(self, message: Message):
+        """Record a transmitted message, inheriting its source creation time"""
+        with self._lock:
+            origin = self._origins.get(
+                message._data_source_id, message.created_at
+            )
+            self._add(message.id, origin)
+
+    def _add(self, message_id: int, origin: float) -> float:
+        self._origins[message_id] = origin
+
+        if len(self._origins) > self._max_size:
+            del self._origins[next(iter(self._origins))]
+
+        return origin
+
+
+class NodeMetrics:
+    def __init__(self, window: float = 60.0, slots: int = 6):
+        """
+        Parameters
+        ----------
+        window : float
+            Length of the rolling window, in seconds.
+        slots : int
+            Number of slots the window is split into: the window moves forward
+            by one slot at a time.
+
+        """
+        self.tracker: LatencyTracker | None = None
+
+        self.rx = 0
+        self.tx = 0
+        self.dropped = 0
+        self.update_time = Histogram()
+        self.latency = Histogram()
+
+        self._rx = _Rolling(_Counter, window, slots)
+        self._tx = _Rolling(_Counter, window, slots)
+        self._update_time = _Rolling(Histogram, window, slots)
+        self._latency = _Rolling(Histogram, window, slots)
+        self._started = time.monotonic()
+
+    def on_rx(self, message: Message):
+        if isinstance(message.payload, ControlPayload):
+            return
+
+        self.rx += 1
+        self._rx.current().value += 1
+
+        if self.tracker is not None:
+            latency = self.tracker.received(message)
+            self.latency.record(latency)
+            self._latency.current().record(latency)
+
+    def on_tx(self, message: Message):
+        if isinstance(message.payload, ControlPayload):
+            return
+
+        self.tx += 1
+        self._tx.current().value += 1
+
+        if self.tracker is not None:
+            self.tracker.transmitted(message)
+
+    def on_drop(self):
+        self.dropped += 1
+
+    def on_update(self, seconds: float):
+        self.update_time.record(seconds)
+        self._update_time.current().record(seconds)
+
+    def snapshot(self) -> dict:
+        """Counters, and rates and durations over the rolling window"""
+        # the window is shorter than its length until enough time has passed
+        span = min(self._rx.length, time.monotonic() - self._started) or 1.0
+
+        return {
+            'rx': self.rx,
+            'tx': self.tx,
+            'dropped': self.dropped,
+            'rx_rate': sum(c.value for c in self._rx.window()) / span,
+            'tx_rate': sum(c.value for c in self._tx.window()) / span,
+            'update_ms': self._summary(self._update_time),
+            'latency_ms': self._summary(self._latency),
+        }
+
+    @staticmethod
+    def _summary(rolling: _Rolling) -> dict:
+        histogram = Histogram()
+
+        for slot in rolling.window():
+            histogram.merge(slot)
+
+        return {
+            'count': histogram.count,
+            'mean': (
+                histogram.total / histogram.count * 1000
+                if histogram.count
+                else 0.0
+            ),
+            'p50': histogram.percentile(50) * 1000,
+            'p95': histogram.percentile(95) * 1000,
+            'p99': histogram.percentile(99) * 1000,
+            'max': histogram.max * 1000,
+        }
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def prometheus_text(pipeline: str, nodes: dict) -> str:
+    """
+    Render the metrics of the nodes of a pipeline in the Prometheus text
+    exposition format.
+
+    Parameters
+    ----------
+    pipeline : str
+        Pipeline identifier, used as label.
+    nodes : dict
+        The pipeline nodes, by name.
+
+    Returns
+    -------
+    str
+        The metrics, in Prometheus text format.
+
+    """
+    lines = list()
+
+    def _family(name: str, kind: str, help: str):
+        lines.append(f'# HELP juturna_node_{name} {help}')
+        lines.append(f'# TYPE juturna_node_{name} {kind}')
+
+    scalars = [
+        ('rx_total', 'counter', 'messages received', lambda m, n: m.rx),
+        ('tx_total', 'counter', 'messages transmitted', lambda m, n: m.tx),
+        (
+            'dropped_total',
+            'counter',
+            'messages dropped by the inbound queue',
+            lambda m, n: m.dropped,
+        ),
+        (
+            'inbound_depth',
+            'gauge',
+            'messages waiting in the inbound queue',
+            lambda m, n: n.queue_depth,
+        ),
+        (
+            'buffer_depth',
+            'gauge',
+            'batches waiting to be processed',
+            lambda m, n: n.buffer_depth,
+        ),
+    ]
+
+    for name, kind, help, value in scalars:
+        _family(name, kind, help)
+
+        for node_name, node in nodes.items():
+            labels = _labels(pipeline=pipeline, node=node_name)
+            value_of = value(node._metrics, node)
+            lines.append(f'juturna_node_{name}{{{labels}}} {value_of}')
+
+    histograms = [
+        (
+            'update_seconds',
+            'duration of the update calls',
+            lambda m: m.update_time,
+        ),
+        (
+            'latency_seconds',
+            'time since the source message was created, on reception',
+            lambda m: m.latency,
+        ),
+    ]
+
+    for name, help, histogram_of in histograms:
+        _family(name, 'histogram', help)
+
+        for node_name, node in nodes.items():
+            histogram = histogram_of(node._metrics)
+            labels = _labels(pipeline=pipeline, node=node_name)
+            bounds = _PROMETHEUS_BOUNDS
+
+            for bound, count in zip(
+                bounds, histogram.cumulative(bounds), strict=True
+            ):
+                lines.append(
+                    f'juturna_node_{name}_bucket{{{labels},le="{bound}"}} '
+                    f'{count}'
+                )
+
+            lines.append(
+                f'juturna_node_{name}_bucket{{{labels},le="+Inf"}} '
+                f'{histogram.count}'
+            )
+            lines.append(
+                f'juturna_node_{name}_sum{{{labels}}} {histogram.total}'
+            )
+            lines.append(
+                f'juturna_node_{name}_count{{{labels}}} {histogram.count}'
+            )
+
+    return '\n'.join(lines) + '\n'
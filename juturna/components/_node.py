@@ -5,12 +5,16 @@ import logging
 import threading
 import queue
 import time
+import contextlib
 
 from collections.abc import Callable
 
 from typing import Any
 
 from juturna.components import Message
+from juturna.components._message import Span
+from juturna.components._message import Trace
+from juturna.payloads import Batch
 from juturna.payloads import ControlPayload
 from juturna.payloads import ControlSignal
 
@@ -22,8 +26,19 @@ from juturna.meta import JUTURNA_MAX_QUEUE_SIZE
 from juturna.meta import JUTURNA_TELEMETRY_BATCH_SIZE
 
 from juturna.components._buffer import Buffer
+from juturna.components._inbound_queue import InboundQueue
+from juturna.components._inbound_queue import _is_data
+from juturna.components._buffer import _WAKEUP
 from juturna.components._telemetry_manager import TelemetryManager
+from juturna.components._metrics import LatencyTracker
+from juturna.components._metrics import NodeMetrics
 from juturna.components._synchronisers import _SYNCHRONISERS
+from juturna.components._synchronisers import Synchroniser
+
+
+# inbound timestamps kept for messages that are never processed (such as those
+# discarded by a synchroniser) are evicted past this size
+_MAX_ENQUEUED = 65536
 
 
 class Node[T_Input, T_Output]:
@@ -62,7 +77,8 @@ class Node[T_Input, T_Output]:
         self._logger = jt_logger(_logger_name)
         self._logger.propagate = True
 
-        self._queue = queue.Queue(maxsize=JUTURNA_MAX_QUEUE_SIZE)
+        self._queue = InboundQueue(maxsize=JUTURNA_MAX_QUEUE_SIZE)
+        self._dropped = 0
         self._worker_thread: threading.Thread | None = None
         self._source_thread: threading.Thread | None = None
         self._update_thread: threading.Thread | None = None
@@ -71,6 +87,17 @@ class Node[T_Input, T_Output]:
         self._stop_source_event = threading.Event()
         self._stop_update_event = threading.Event()
 
+        # when a scheduler is set, worker and update threads are replaced by
+        # steps executed on the scheduler pool
+        self._scheduler = None
+        self._step_lock = threading.Lock()
+        self._step_scheduled = False
+
+        # pooled producers waiting for room in the inbound queue
+        self._throttled = False
+        self._producers: set[Node] = set()
+        self._producers_lock = threading.Lock()
+
         self._draining = threading.Event()
 
         self._pending_updates = 0
@@ -79,12 +106,15 @@ class Node[T_Input, T_Output]:
         self._suspended = False
         self._auto_dump = False
 
+        # (max_size, max_wait) of batch groups passed to update_batch
+        self._micro_batch: tuple[int, float] | None = None
+
         # buffer stores messages, policy manages them
         # if the synchroniser is not provided, get local one or default
         self._synchroniser = synchroniser or (
             self.next_batch
             if hasattr(self, 'next_batch')
-            else _SYNCHRONISERS['passthrough']
+            else _SYNCHRONISERS['passthrough']()
         )
 
         self._buffer = Buffer(_logger_name, self._synchroniser)
@@ -94,11 +124,24 @@ class Node[T_Input, T_Output]:
         self._source_mode = ''
 
         self._destinations: dict[str, Node] = dict()
+        self._link_overflow: dict[str, str] = dict()
         self._origins: list = list()
+        self._bind_origins(self._synchroniser)
         self._last_data_source_evt_id: int | None = None
 
+        # inbound timestamps of the queued messages, and trace context of the
+        # batches being processed, as (contexts by batch id, start time)
+        self._enqueued: dict[int, float] = dict()
+        self._trace_lock = threading.Lock()
+        self._trace_context: tuple[dict, float] = (dict(), 0.0)
+
         self._telemetry_buffer = list()
+        self._telemetry_lock = threading.Lock()
         self._telemetry_manager: TelemetryManager | None = None
+        self._metrics = NodeMetrics()
+
+        # resources shared among the replicas of the node, if any
+        self._shared: dict = dict()
 
     def __del__(self): ...
 
@@ -172,6 +215,101 @@ class Node[T_Input, T_Output]:
     @synchroniser.setter
     def synchroniser(self, synchroniser: Callable):
         self._synchroniser = synchroniser
+        self._buffer.synchroniser = synchroniser
+        self._bind_origins(synchroniser)
+
+    def _bind_origins(self, synchroniser: Callable):
+        # synchronisers with no explicit origins expect the node upstreams
+        if (
+            isinstance(synchroniser, Synchroniser)
+            and synchroniser.origins is None
+        ):
+            synchroniser.origins = self._origins
+
+    @property
+    def scheduler(self):
+        """
+        The scheduler driving the node. If ``None``, the node runs its own
+        worker and update threads.
+        """
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler):
+        self._scheduler = scheduler
+
+    @property
+    def overflow(self) -> str:
+        """
+        Overflow policy of the node inbound queue, applied to every received
+        message unless the link it travelled on defines its own policy.
+        """
+        return self._queue.policy
+
+    @overflow.setter
+    def overflow(self, policy: str):
+        self._queue.policy = policy
+
+    @property
+    def micro_batch(self) -> dict | None:
+        """
+        Micro-batching policy of the node. Nodes implementing the
+        ``update_batch()`` method receive groups of up to ``max_size`` batches,
+        waiting at most ``max_wait_ms`` milliseconds for a group to fill up.
+        """
+        if self._micro_batch is None:
+            return None
+
+        max_size, max_wait = self._micro_batch
+
+        return {'max_size': max_size, 'max_wait_ms': max_wait * 1000}
+
+    @micro_batch.setter
+    def micro_batch(self, policy: dict | None):
+        if policy is None:
+            self._micro_batch = None
+
+            return
+
+        if not hasattr(self, 'update_batch'):
+            self._logger.warning('node has no update_batch, ignoring policy')
+
+            return
+
+        max_size = policy.get('max_size', 8)
+        max_wait = policy.get('max_wait_ms', 0)
+
+        if max_size < 1 or max_wait < 0:
+            raise ValueError(f'invalid micro-batching policy: {policy}')
+
+        self._micro_batch = (max_size, max_wait / 1000)
+
+    @property
+    def dropped(self) -> int:
+        """Number of messages dropped by the inbound queue overflow policy"""
+        return self._dropped
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of messages waiting in the inbound queue"""
+        return self._queue.qsize()
+
+    @property
+    def buffer_depth(self) -> int:
+        """Number of batches released by the buffer, waiting to be processed"""
+        return self._buffer.qsize()
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Rolling metrics of the node: message counters and rates, queue depths,
+        and ``update()`` duration and end-to-end latency percentiles, in
+        milliseconds, over the last minute.
+        """
+        return self._metrics.snapshot() | {
+            'queue_depth': self.queue_depth,
+            'buffer_depth': self.buffer_depth,
+        }
 
     @property
     def origins(self) -> list:
@@ -184,11 +322,76 @@ class Node[T_Input, T_Output]:
     def link_telemetry(self, manager: TelemetryManager):
         self._telemetry_manager = manager
 
-    def put(self, message: Message | ControlSignal):
+    def link_metrics(self, tracker: LatencyTracker):
+        """Share the end-to-end latency tracker of the pipeline"""
+        self._metrics.tracker = tracker
+
+    def flush_telemetry(self):
+        """Send the telemetry entries recorded so far to the manager"""
+        if self._telemetry_manager is None:
+            return
+
+        with self._telemetry_lock:
+            batch, self._telemetry_buffer = self._telemetry_buffer, list()
+
+        if batch:
+            self._telemetry_manager.record_telemetry(batch)
+
+    def put(
+        self, message: Message | ControlSignal, overflow: str | None = None
+    ):
+        """
+        Put a message in the node inbound queue.
+
+        Parameters
+        ----------
+        message : Message | ControlSignal
+            The message to enqueue.
+        overflow : str, optional
+            Overflow policy to apply if the inbound queue is full. If not
+            provided, the node policy will be used. When both the caller and
+            the node run on the pool scheduler, the caller does not wait for
+            room in the queue, but is throttled until the node drains it.
+
+        """
         if self._draining.is_set():
             self._logger.debug('message received while draining, discarding...')
             return
-        self._queue.put(message)
+
+        if isinstance(message, Message) and not isinstance(
+            message.payload, ControlPayload
+        ):
+            self._mark_enqueued(message)
+
+        producer = (
+            self._scheduler.current() if self._scheduler is not None else None
+        )
+
+        for dropped in self._queue.offer(
+            message, overflow, block=producer is None
+        ):
+            with self._trace_lock:
+                self._enqueued.pop(dropped.id, None)
+
+            self._dropped += 1
+            self._metrics.on_drop()
+            self._rec_telemetry(dropped, 'drop')
+
+        # only messages that would have waited for room throttle the producer
+        if (
+            producer is not None
+            and producer is not self
+            and (
+                not _is_data(message)
+                or (overflow or self._queue.policy) == 'block'
+            )
+        ):
+            self._throttle(producer)
+
+        if self._scheduler is not None and self._status == (
+            ComponentStatus.RUNNING
+        ):
+            self._scheduler.schedule(self)
 
     def compile_template(self, template_name: str, arguments: dict) -> str:
         """
@@ -272,6 +475,31 @@ class Node[T_Input, T_Output]:
 
         return str(dump_path)
 
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a resource shared among all the replicas of the node, such as a
+        set of model weights, creating it the first time it is requested.
+        Replicas are warmed up one after the other, so the resource is only
+        created once. A node that is not replicated owns all its resources.
+
+        Parameters
+        ----------
+        key : str
+            Name of the resource.
+        factory : Callable
+            Function creating the resource, invoked with no arguments.
+
+        Returns
+        -------
+        Any
+            The shared resource.
+
+        """
+        if key not in self._shared:
+            self._shared[key] = factory()
+
+        return self._shared[key]
+
     def set_source(self, source: Callable, by: int = 0, mode: str = 'post'):
         """
         Set the node source (to be used for ``source`` nodes). The source can be
@@ -299,21 +527,46 @@ class Node[T_Input, T_Output]:
         self._source_sleep = by
         self._source_mode = mode
 
-    def add_destination(self, name: str, destination: 'Node'):
+    def add_destination(
+        self, name: str, destination: 'Node', overflow: str | None = None
+    ):
+        """
+        Add a destination to the node.
+
+        Parameters
+        ----------
+        name : str
+            Name of the destination.
+        destination : Node
+            The destination node.
+        overflow : str, optional
+            Overflow policy to apply to the messages transmitted over this
+            link. If not provided, the destination node policy will be used.
+
+        """
         self._destinations[name] = destination
 
+        if overflow is not None:
+            self._link_overflow[name] = overflow
+
     def clear_source(self): ...
 
     def clear_destination(self, name: str):
         del self._destinations[name]
+        self._link_overflow.pop(name, None)
 
     def clear_destinations(self):
         self._destinations = dict()
+        self._link_overflow = dict()
 
     def clear_buffer(self):
         self._buffer.flush()
 
-    def transmit(self, message: Message[T_Output] | ControlSignal):
+    def transmit(
+        self,
+        message: Message[T_Output] | ControlSignal,
+        source: Message | None = None,
+    ):
         """
         Transmit a message. This method is used to send data from the node to
         its destinations. Messages are frozen before transmission, so that
@@ -323,17 +576,37 @@ class Node[T_Input, T_Output]:
         ----------
         message : Message | None
             The message to be transmitted.
+        source : Message, optional
+            The received message the transmitted one was produced from. Nodes
+            processing groups of messages in ``update_batch()`` should provide
+            it, so that telemetry can trace every message to its data source.
+            If not provided, the last processed message is used.
 
         """
-        object.__setattr__(
-            message, '_data_source_id', self._last_data_source_evt_id
+        self._transmit(
+            message,
+            self._last_data_source_evt_id if source is None else source.id,
         )
+
+    def _transmit(
+        self, message: Message[T_Output] | ControlSignal, source_id: int | None
+    ):
+        # transmit a message traced to an explicit data source, so that nodes
+        # relaying messages from other threads leave the node state untouched
+        object.__setattr__(message, '_data_source_id', source_id)
+        self._stamp_trace(message, self._trace_context)
         _ = message._freeze() if isinstance(message, Message) else None
 
         for node_name in self._destinations:
-            self._destinations[node_name].put(message)
+            if node_name in self._link_overflow:
+                self._destinations[node_name].put(
+                    message, overflow=self._link_overflow[node_name]
+                )
+            else:
+                self._destinations[node_name].put(message)
 
         if isinstance(message, Message):
+            self._metrics.on_tx(message)
             self._rec_telemetry(message, 'tx')
 
         if self._auto_dump:
@@ -347,26 +620,15 @@ class Node[T_Input, T_Output]:
         the node is started correctly.
         """
         self._draining.clear()
-        if self._worker_thread is None:
-            self._worker_thread = threading.Thread(
-                name=f'_worker_{self.name}',
-                target=self._worker,
-                args=(),
-                daemon=True,
-            )
+        self._stop_worker_event.clear()
+        self._stop_source_event.clear()
+        self._stop_update_event.clear()
 
-            self._worker_thread.start()
+        if self._scheduler is not None:
             self._status = ComponentStatus.RUNNING
-
-        if self._update_thread is None:
-            self._update_thread = threading.Thread(
-                name=f'_update_{self.name}',
-                target=self._update,
-                args=(),
-                daemon=True,
-            )
-
-            self._update_thread.start()
+            self._scheduler.schedule(self)
+        else:
+            self._start_threads()
 
         if self._source_f is None:
             return
@@ -396,6 +658,8 @@ class Node[T_Input, T_Output]:
         self._stop_source_event.set()
         self._stop_update_event.set()
 
+        self._release_producers()
+        self._wake()
         self.join()
 
         self._worker_thread = None
@@ -409,8 +673,13 @@ class Node[T_Input, T_Output]:
         """
         Wait for all internal threads to terminate.
         This method should be called after stop() to ensure the node has
-        fully shut down before its resources are released.
+        fully shut down before its resources are released. Nodes driven by a
+        scheduler have no internal threads, so the method waits for the node
+        to process its stop signal instead.
         """
+        if self._scheduler is not None:
+            self._stop_update_event.wait()
+
         with self._pending_condition:
             self._pending_condition.wait_for(lambda: self._pending_updates == 0)
 
@@ -439,54 +708,189 @@ class Node[T_Input, T_Output]:
         )
         _control_thread.start()
 
+    def _start_threads(self):
+        if self._worker_thread is None:
+            self._worker_thread = threading.Thread(
+                name=f'_worker_{self.name}',
+                target=self._worker,
+                args=(),
+                daemon=True,
+            )
+
+            self._worker_thread.start()
+            self._status = ComponentStatus.RUNNING
+
+        if self._update_thread is None:
+            self._update_thread = threading.Thread(
+                name=f'_update_{self.name}',
+                target=self._update,
+                args=(),
+                daemon=True,
+            )
+
+            self._update_thread.start()
+
+    def _wake(self):
+        # worker and update threads block on their queues with no timeout, so
+        # they need a sentinel to notice the stop events
+        if self._scheduler is not None:
+            return
+
+        with contextlib.suppress(queue.Full):
+            self._queue.put_nowait(_WAKEUP)
+
+        self._buffer.wake()
+
     def _worker(self):
         while not self._stop_worker_event.is_set():
-            try:
-                message = self._queue.get(timeout=JUTURNA_THREAD_JOIN_TIMEOUT)
-            except queue.Empty:
-                continue
+            message = self._queue.get()
 
-            if self._suspended and not isinstance(
-                message.payload, ControlPayload
-            ):
-                self.transmit(message)
+            if message is _WAKEUP:
                 continue
 
-            self._buffer.put(message)
-
-            if isinstance(message, Message):
-                self._rec_telemetry(message, 'rx')
+            self._enqueue(message)
 
     def _update(self):
         while not self._stop_update_event.is_set():
-            try:
-                batch = self._buffer.get(timeout=JUTURNA_THREAD_JOIN_TIMEOUT)
-            except queue.Empty:
-                continue
+            if not self._consume_next():
+                break
 
-            if isinstance(batch, Message) and isinstance(
-                batch.payload, ControlPayload
+    def _step(self, budget: int):
+        """
+        Run a scheduled step: move messages from the inbound queue into the
+        buffer, and process the batches it releases, for at most ``budget``
+        inbound messages.
+        """
+        try:
+            for _ in range(budget):
+                if self._stop_update_event.is_set() or self._throttled:
+                    return
+
+                # steps never overlap, so the queue has a single consumer here
+                if not self._queue.empty():
+                    self._enqueue(self._queue.get_nowait())
+                    self._release_producers()
+
+                while not self._buffer.empty() and not self._throttled:
+                    if not self._consume_next(block=False):
+                        self._stop_update_event.set()
+
+                        return
+
+                if self._queue.empty():
+                    return
+        finally:
+            self._release_producers()
+
+    def _throttle(self, producer: 'Node'):
+        # a pooled producer that filled the queue is not scheduled again until
+        # the queue drains, or the node stops
+        with self._producers_lock:
+            if self._queue.full() and not self._stop_update_event.is_set():
+                producer._throttled = True
+                self._producers.add(producer)
+
+    def _release_producers(self):
+        with self._producers_lock:
+            if not self._producers or (
+                self._queue.full() and not self._stop_update_event.is_set()
             ):
-                self._handle_control(batch)
-                if batch.payload.signal < 0:
-                    break
-                continue
+                return
 
-            self._last_data_source_evt_id = batch.id
+            producers, self._producers = self._producers, set()
+
+        for producer in producers:
+            producer._throttled = False
+            producer._scheduler.schedule(producer)
+
+    def _has_work(self) -> bool:
+        return not self._stop_update_event.is_set() and not (
+            self._queue.empty() and self._buffer.empty()
+        )
+
+    def _enqueue(self, message: Message):
+        if self._suspended and not isinstance(message.payload, ControlPayload):
+            self.transmit(message)
+
+            return
+
+        self._buffer.put(message)
+
+        if isinstance(message, Message):
+            self._metrics.on_rx(message)
+            self._rec_telemetry(message, 'rx')
+
+    def _consume_next(self, block: bool = True) -> bool:
+        """
+        Consume the next batch released by the buffer, or the next group of
+        batches if the node is micro-batching. Returns ``False`` when the node
+        should stop processing.
+        """
+        if self._micro_batch is None:
+            batch = self._buffer.get(block=block)
+
+            return batch is _WAKEUP or self._process(batch)
+
+        max_size, max_wait = self._micro_batch
+        group = self._buffer.get_many(max_size, max_wait, block=block)
+
+        if group[0] is _WAKEUP:
+            return True
+
+        # control messages are never grouped with data
+        if isinstance(group[0].payload, ControlPayload):
+            return self._process(group[0])
+
+        self._last_data_source_evt_id = group[-1].id
+        self._trace_context = self._begin_trace(group)
+        with self._pending_condition:
+            self._pending_updates += 1
+        started = time.perf_counter()
+        try:
+            self.update_batch(group)
+        finally:
+            self._metrics.on_update(time.perf_counter() - started)
             with self._pending_condition:
-                self._pending_updates += 1
-            try:
-                self.update(batch)
-            finally:
-                with self._pending_condition:
-                    self._pending_updates -= 1
-                    if self._pending_updates == 0:
-                        self._pending_condition.notify_all()
+                self._pending_updates -= 1
+                if self._pending_updates == 0:
+                    self._pending_condition.notify_all()
+
+        return True
+
+    def _process(self, batch: Message) -> bool:
+        """
+        Process a batch released by the buffer. Returns ``False`` when the
+        batch carried a stop signal, so the caller should stop processing.
+        """
+        if isinstance(batch, Message) and isinstance(
+            batch.payload, ControlPayload
+        ):
+            self._handle_control(batch)
+
+            return batch.payload.signal >= 0
+
+        self._last_data_source_evt_id = batch.id
+        self._trace_context = self._begin_trace((batch,))
+        with self._pending_condition:
+            self._pending_updates += 1
+        started = time.perf_counter()
+        try:
+            self.update(batch)
+        finally:
+            self._metrics.on_update(time.perf_counter() - started)
+            with self._pending_condition:
+                self._pending_updates -= 1
+                if self._pending_updates == 0:
+                    self._pending_condition.notify_all()
+
+        return True
 
     def _source(self):
         while not self._stop_source_event.is_set():
-            if self._source_mode == 'pre':
-                time.sleep(self._source_sleep)
+            if self._source_mode == 'pre' and self._stop_source_event.wait(
+                self._source_sleep
+            ):
+                return
 
             message = self._source_f()
 
@@ -503,7 +907,7 @@ class Node[T_Input, T_Output]:
                 return
 
             if self._source_mode == 'post':
-                time.sleep(self._source_sleep)
+                self._stop_source_event.wait(self._source_sleep)
 
             self.put(message)
 
@@ -537,6 +941,62 @@ class Node[T_Input, T_Output]:
             case None:
                 return
 
+    def _mark_enqueued(self, message: Message):
+        with self._trace_lock:
+            self._enqueued[message.id] = time.time()
+
+            if len(self._enqueued) > _MAX_ENQUEUED:
+                del self._enqueued[next(iter(self._enqueued))]
+
+    def _begin_trace(self, batches) -> tuple[dict, float]:
+        """
+        Collect the trace context of the batches about to be processed: the
+        trace each batch descends from, and the time it entered the node. A
+        batch aggregating several messages follows the last one to enter.
+        """
+        started = time.time()
+        contexts = dict()
+
+        with self._trace_lock:
+            for batch in batches:
+                messages = (
+                    batch.payload.messages
+                    if isinstance(batch.payload, Batch)
+                    else (batch,)
+                )
+                enqueued, latest = max(
+                    ((self._enqueued.pop(m.id, started), m) for m in messages),
+                    key=lambda entry: entry[0],
+                    default=(started, batch),
+                )
+                contexts[batch.id] = (
+                    latest.trace or Trace(latest.id),
+                    enqueued,
+                )
+
+        return contexts, started
+
+    def _stamp_trace(self, message: Message, context: tuple[dict, float]):
+        """
+        Append the span of the node to the trace of a message about to be
+        transmitted. Messages forwarded as they are keep their trace, as they
+        may be shared with other nodes.
+        """
+        if not isinstance(message, Message) or message._is_frozen:
+            return
+
+        contexts, started = context
+        now = time.time()
+        trace, enqueued = contexts.get(message._data_source_id, (None, None))
+
+        if enqueued is None:
+            # not produced from a processed batch
+            enqueued = started = now
+
+        # messages received from a remote node already carry the remote spans
+        trace = message.trace or trace or Trace(message.id)
+        message.trace = trace.extend(Span(self.name, enqueued, started, now))
+
     def _rec_telemetry(self, message: Message, event: str):
         if self._telemetry_manager is None:
             return
@@ -551,8 +1011,13 @@ class Node[T_Input, T_Output]:
             getattr(message.payload, 'size_bytes', 0),
         )
 
-        self._telemetry_buffer.append(telemetry_entry)
+        # entries can be recorded from threads other than the node worker
+        with self._telemetry_lock:
+            self._telemetry_buffer.append(telemetry_entry)
+
+            if len(self._telemetry_buffer) < JUTURNA_TELEMETRY_BATCH_SIZE:
+                return
+
+            batch, self._telemetry_buffer = self._telemetry_buffer, list()
 
-        if len(self._telemetry_buffer) >= JUTURNA_TELEMETRY_BATCH_SIZE:
-            self._telemetry_manager.record_telemetry(self._telemetry_buffer)
-            self._telemetry_buffer = list()
+        self._telemetry_manager.record_telemetry(batch)
@@ -18,6 +18,16 @@ from juturna.names import PipelineStatus
 from juturna.payloads import ControlSignal, ControlPayload
 
 from juturna.components._telemetry_manager import TelemetryManager
+from juturna.components._message_log import MessageLogWriter
+from juturna.components._metrics import LatencyTracker
+from juturna.components._metrics import prometheus_text
+from juturna.components._profiler import NodeProfiler
+from juturna.components._scheduler import _SCHEDULERS
+from juturna.components._inbound_queue import _OVERFLOW_POLICIES
+from juturna.components._process_node import ProcessNode
+from juturna.components._process_node import _ISOLATION_MODES
+from juturna.components._replicated_node import ReplicatedNode
+from juturna.components._async_node import AsyncNode, EventLoop
 
 
 class Pipeline:
@@ -50,6 +60,11 @@ class Pipeline:
         self._telemetry_manager: TelemetryManager | None = None
         self._telemetry = False
         self._telemetry_file = None
+        self._latency_tracker = LatencyTracker()
+        self._recorders: list[MessageLogWriter] = list()
+
+        # event loop shared by all the async nodes, if any
+        self._event_loop: EventLoop | None = None
 
         self._status = PipelineStatus.NEW
         self.created_at = time.time()
@@ -95,13 +110,74 @@ class Pipeline:
             'folder': self.pipe_path,
             'self': self._status,
             'nodes': {
-                node_name: {'status': node.status, 'config': node.configuration}
+                node_name: {
+                    'status': node.status,
+                    'config': node.configuration,
+                    'metrics': node.metrics,
+                }
                 for node_name, node in self._nodes.items()
             }
             if self._nodes
             else dict(),
         }
 
+    @property
+    def metrics(self) -> dict:
+        """Rolling metrics of all the pipeline nodes"""
+        return {name: node.metrics for name, node in self._nodes.items()}
+
+    def prometheus_metrics(self) -> str:
+        """
+        Metrics of all the pipeline nodes, in the Prometheus text exposition
+        format. Counters and histograms cover the whole pipeline run.
+
+        Returns
+        -------
+        str
+            The pipeline metrics, labelled by pipeline id and node name.
+
+        """
+        return prometheus_text(self.pipe_id, self._nodes)
+
+    def profile(
+        self,
+        node_name: str,
+        seconds: float,
+        interval: float = 0.01,
+        memory: bool = False,
+    ) -> dict:
+        """
+        Profile a node of the pipeline, sampling the stacks of its threads for
+        the given time. This method blocks until profiling is over.
+
+        Parameters
+        ----------
+        node_name : str
+            The node to profile.
+        seconds : float
+            Profiling time.
+        interval : float
+            Sampling interval, in seconds.
+        memory : bool
+            Whether to also track the allocations made by the node module,
+            with ``tracemalloc``.
+
+        Returns
+        -------
+        dict
+            The node profile, with the sampled stacks in the collapsed format
+            used by flamegraph tools.
+
+        """
+        if node_name not in self._nodes:
+            raise KeyError(f'node {node_name} not in pipeline')
+
+        self._logger.info(f'profiling node {node_name} for {seconds}s')
+
+        return NodeProfiler(self._nodes[node_name], interval, memory).run(
+            seconds
+        )
+
     @property
     def DAG(self) -> DAG:
         return self._dag
@@ -122,13 +198,32 @@ class Pipeline:
         with open(pathlib.Path(self.pipe_path, 'config.json'), 'w') as f:
             json.dump(self._raw_config, f, indent=2)
 
-        if _tele_file := self._raw_config['pipeline'].get('telemetry', None):
+        if _tele_cfg := self._raw_config['pipeline'].get('telemetry', None):
+            # either the telemetry file, or a dictionary of sink options
+            _tele_cfg = (
+                dict(_tele_cfg)
+                if isinstance(_tele_cfg, dict)
+                else {'file': _tele_cfg}
+            )
+
             self._telemetry = True
-            self._telemetry_file = pathlib.Path(self.pipe_path, _tele_file)
+            self._telemetry_file = pathlib.Path(
+                self.pipe_path, _tele_cfg.pop('file')
+            )
             self._telemetry_manager = TelemetryManager(
-                str(self._telemetry_file)
+                str(self._telemetry_file), **_tele_cfg
             )
 
+        _scheduler_name = self._raw_config['pipeline'].get(
+            'scheduler', 'threaded'
+        )
+
+        if _scheduler_name not in _SCHEDULERS:
+            raise ValueError(f'unknown scheduler: {_scheduler_name}')
+
+        _scheduler_type = _SCHEDULERS[_scheduler_name]
+        _scheduler = _scheduler_type() if _scheduler_type else None
+
         nodes = self._raw_config['pipeline']['nodes']
         links = self._raw_config['pipeline']['links']
 
@@ -147,16 +242,63 @@ class Pipeline:
                 self._logger.info(f'{node_name} warped')
                 self._logger.info(node)
 
-            _node: Node = _component_builder.build_component(
-                node,
-                plugin_dirs=self._raw_config['plugins'],
-                pipe_name=self.name,
-            )
+            isolation = node.get('isolation', 'thread')
+            replicas = node.get('replicas', 1)
+
+            if isolation not in _ISOLATION_MODES:
+                raise ValueError(f'unknown isolation mode: {isolation}')
+
+            if replicas < 1:
+                raise ValueError(f'invalid number of replicas: {replicas}')
+
+            if replicas > 1 and isolation == 'process':
+                raise ValueError(
+                    f'node {node_name} cannot be both replicated and isolated'
+                )
+
+            if isolation == 'process':
+                _node: Node = ProcessNode(
+                    node_config=node,
+                    plugin_dirs=self._raw_config['plugins'],
+                    node_name=node_name,
+                    pipe_name=self.name,
+                )
+            elif replicas > 1:
+                _node = ReplicatedNode(
+                    replicas=[
+                        _component_builder.build_component(
+                            node,
+                            plugin_dirs=self._raw_config['plugins'],
+                            pipe_name=self.name,
+                        )
+                        for _ in range(replicas)
+                    ],
+                    dispatch=node.get('dispatch'),
+                    node_name=node_name,
+                    pipe_name=self.name,
+                )
+            else:
+                _node = _component_builder.build_component(
+                    node,
+                    plugin_dirs=self._raw_config['plugins'],
+                    pipe_name=self.name,
+                )
+
+            if isinstance(_node, AsyncNode):
+                self._event_loop = self._event_loop or EventLoop(self.name)
+                _node.event_loop = self._event_loop
 
             _node.pipe_id = copy.deepcopy(self._pipe_id)
             _node.pipe_path = node_folder
             _node.status = ComponentStatus.NEW
             _node.telemetry = self._telemetry
+            _node.scheduler = _scheduler
+            _node.overflow = node.get('overflow', 'block')
+
+            # nodes may set their own policy from their arguments
+            if 'micro_batch' in node:
+                _node.micro_batch = node['micro_batch']
+
             _node._auto_dump = node.get('auto_dump', False)
 
             self._nodes[node_name] = _node
@@ -165,18 +307,32 @@ class Pipeline:
         for link in links:
             from_node = link['from']
             to_node = link['to']
+            overflow = link.get('overflow')
+
+            if overflow is not None and overflow not in _OVERFLOW_POLICIES:
+                raise ValueError(f'unknown overflow policy: {overflow}')
 
             self._nodes[from_node].add_destination(
-                to_node, self._nodes[to_node]
+                to_node, self._nodes[to_node], overflow=overflow
             )
 
             self._nodes[to_node].origins.append(from_node)
 
+            if record := link.get('record'):
+                recorder = MessageLogWriter(
+                    pathlib.Path(self.pipe_path, record)
+                )
+                self._nodes[from_node].add_destination(
+                    f'{to_node}.record', recorder
+                )
+                self._recorders.append(recorder)
+
             self._links.append(copy.copy(link))
             self._dag.add_edge(from_node, to_node)
 
         for node_name, node in self._nodes.items():
             node.warmup()
+            node.link_metrics(self._latency_tracker)
 
             if self._telemetry:
                 node.link_telemetry(self._telemetry_manager)
@@ -256,8 +412,14 @@ class Pipeline:
                 self._nodes[node_name].join()
 
         if self._telemetry:
+            for node in self._nodes.values():
+                node.flush_telemetry()
+
             self._telemetry_manager.stop()
 
+        for recorder in self._recorders:
+            recorder.flush()
+
         self._status = PipelineStatus.READY
 
     def suspend_node(self, node_name: str):
@@ -315,6 +477,13 @@ class Pipeline:
             self._nodes[node_name] = None
 
         self._nodes = None
+
+        if self._event_loop is not None:
+            self._event_loop.close()
+
+        for recorder in self._recorders:
+            recorder.close()
+
         self._status = PipelineStatus.DESTROYED
         gc.collect()
 
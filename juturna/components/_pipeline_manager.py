@@ -15,6 +15,7 @@ from juturna.cli.commands.exceptions import (
     AlreadyRunningException,
     NotReadyException,
     NotRunningException,
+    InvalidNodeNameException,
 )
 from juturna.names import PipelineStatus
 
@@ -147,6 +148,32 @@ class PipelineManager:
 
         return self._pipelines[pipeline_id].status
 
+    def pipeline_metrics(self, pipeline_id: str) -> str:
+        if pipeline_id not in self._pipelines:
+            raise InvalidPipelineIdException(pipeline_id)
+
+        return self._pipelines[pipeline_id].prometheus_metrics()
+
+    def profile_node(
+        self,
+        pipeline_id: str,
+        node_name: str,
+        seconds: float,
+        memory: bool = False,
+    ) -> dict:
+        if pipeline_id not in self._pipelines:
+            raise InvalidPipelineIdException(pipeline_id)
+
+        pipeline = self._pipelines[pipeline_id]
+
+        if node_name not in pipeline.status['nodes']:
+            raise InvalidNodeNameException(pipeline_id, node_name)
+
+        if pipeline.status['self'] != PipelineStatus.RUNNING:
+            raise NotRunningException(pipeline_id)
+
+        return pipeline.profile(node_name, seconds, memory=memory)
+
     def pipeline_list(self) -> dict:
         return {
             'pipelines': [
@@ -0,0 +1,271 @@
+"""
+Process-isolated nodes
+
+A node configured with ``"isolation": "process"`` is built and run in a child
+process, so that CPU-bound Python code does not compete for the GIL with the
+rest of the pipeline. Within the pipeline, the node is replaced by a
+:class:`ProcessNode` proxy, that forwards every batch to the child process
+over a pipe, and transmits downstream whatever the child node transmits.
+
+Control signals are handled by the proxy as they would be by any other node:
+a suspended proxy forwards messages downstream with no processing, while a
+stop signal is forwarded to the child node after all the messages received
+before it, and the proxy only stops once the child node is stopped.
+"""
+
+import multiprocessing
+import threading
+import traceback
+
+from typing import Any
+
+from juturna.components import Message
+from juturna.components._node import Node
+from juturna.components._serialization import dump_message
+from juturna.components._serialization import load_message
+from juturna.payloads import ControlPayload, ControlSignal
+from juturna.names import ComponentStatus
+
+
+_ISOLATION_MODES = ('thread', 'process')
+
+
+class _ParentLink:
+    """Destination of the child node, sending messages to the parent"""
+
+    def __init__(self, conn, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def put(self, message: Message, overflow: str | None = None):
+        with self._lock:
+            self._conn.send(('tx', dump_message(message)))
+
+
+def _isolated_main(
+    conn,
+    node_config: dict,
+    plugin_dirs: list,
+    pipe_name: str,
+    pipe_id: str,
+    pipe_path: str,
+):
+    """Entry point of the child process"""
+    # imported here, as the builder imports nodes through the components
+    from juturna.components import _component_builder
+
+    lock = threading.Lock()
+
+    try:
+        node = _component_builder.build_component(
+            node_config, plugin_dirs=plugin_dirs, pipe_name=pipe_name
+        )
+        node.pipe_id = pipe_id
+        node.pipe_path = pipe_path
+        node.status = ComponentStatus.NEW
+
+        if 'micro_batch' in node_config:
+            node.micro_batch = node_config['micro_batch']
+
+        node.add_destination('_parent', _ParentLink(conn, lock))
+        node.warmup()
+        node.status = ComponentStatus.CONFIGURED
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+
+        return
+
+    conn.send(('ready', node.configuration))
+
+    while True:
+        try:
+            command, *args = conn.recv()
+        except EOFError:
+            break
+
+        match command:
+            case 'put':
+                message = load_message(args[0])
+                message._freeze()
+                node.put(message)
+            case 'start':
+                node.origins.clear()
+                node.origins.extend(args[0])
+                node.start()
+            case 'stop':
+                node.put(
+                    Message(
+                        creator=pipe_name,
+                        payload=ControlPayload(ControlSignal.STOP),
+                    )
+                )
+                node._stop_update_event.wait()
+                node.join()
+
+                with lock:
+                    conn.send(('stopped',))
+            case 'config':
+                node.set_on_config(*args)
+            case 'destroy':
+                node.destroy()
+
+                break
+
+    conn.close()
+
+
+class ProcessNode(Node):
+    def __init__(self, node_config: dict, plugin_dirs: list, **kwargs):
+        """
+        Parameters
+        ----------
+        node_config : dict
+            Configuration of the node to run in the child process, as it
+            appears in the pipeline configuration.
+        plugin_dirs : list
+            Plugin directories the node will be looked up in.
+        kwargs : dict
+            Supernode arguments.
+
+        """
+        super().__init__(**kwargs)
+
+        self._node_config = node_config
+        self._plugin_dirs = plugin_dirs
+        self._configuration = dict()
+
+        self._child = None
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._receiver_thread = None
+        self._child_stopped = threading.Event()
+        # set whenever the child node is not running
+        self._child_stopped.set()
+
+    @property
+    def configuration(self) -> dict:
+        return self._configuration or super().configuration
+
+    @property
+    def micro_batch(self) -> dict | None:
+        return self._node_config.get('micro_batch')
+
+    @micro_batch.setter
+    def micro_batch(self, policy: dict | None):
+        # messages are grouped by the child node
+        pass
+
+    @property
+    def pid(self) -> int | None:
+        """Process id of the child process running the node"""
+        return self._child.pid if self._child else None
+
+    def warmup(self):
+        """Spawn the child process, and wait for the node to be warmed up"""
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+
+        self._child = context.Process(
+            name=f'_process_{self.name}',
+            target=_isolated_main,
+            args=(
+                child_conn,
+                self._node_config,
+                self._plugin_dirs,
+                self.pipe_name,
+                self.pipe_id,
+                str(self.pipe_path),
+            ),
+            daemon=True,
+        )
+        self._child.start()
+        child_conn.close()
+
+        outcome, detail = self._conn.recv()
+
+        if outcome == 'error':
+            self._child.join()
+
+            raise RuntimeError(f'node {self.name} failed in child: {detail}')
+
+        self._configuration = detail
+        self._receiver_thread = threading.Thread(
+            name=f'_receiver_{self.name}', target=self._receiver, daemon=True
+        )
+        self._receiver_thread.start()
+
+        self.logger.info(f'node running in process {self._child.pid}')
+
+    def start(self):
+        """Start the child node, then the proxy"""
+        self._child_stopped.clear()
+        self._send('start', list(self.origins))
+
+        super().start()
+
+    def stop(self):
+        """Stop the child node once it processed all its messages"""
+        if self._status == ComponentStatus.STOPPED:
+            return
+
+        if self._receiver_thread is not None:
+            self._send('stop')
+            self._child_stopped.wait()
+
+        super().stop()
+
+    def join(self):
+        """
+        Wait for the child node to stop, so that all its messages were
+        transmitted, then for the proxy threads to terminate.
+        """
+        self._child_stopped.wait()
+
+        super().join()
+
+    def update(self, message: Message):
+        """Forward a message to the child node"""
+        self._send('put', dump_message(message))
+
+    def set_on_config(self, prop: str, value: Any):
+        """Forward a property update to the child node"""
+        self._send('config', prop, value)
+
+    def destroy(self):
+        """Destroy the child node, and terminate its process"""
+        if self._child is None:
+            return
+
+        self._send('destroy')
+        self._child.join(timeout=5)
+
+        if self._child.is_alive():
+            self._child.terminate()
+
+        self._conn.close()
+        self._child = None
+
+    def _send(self, command: str, *args):
+        with self._conn_lock:
+            self._conn.send((command, *args))
+
+    def _receiver(self):
+        while True:
+            try:
+                event, *args = self._conn.recv()
+            except (EOFError, OSError):
+                break
+
+            match event:
+                case 'tx':
+                    message = load_message(args[0], keep_id=False)
+
+                    # the trace already holds the span of the child node, and
+                    # the message keeps the data source set by the child
+                    message._freeze()
+                    self._transmit(message, message._data_source_id)
+                case 'stopped':
+                    self._child_stopped.set()
+
+        # an exited child cannot be waited for
+        self._child_stopped.set()
@@ -0,0 +1,177 @@
+"""
+Node profiler
+
+A sampling profiler that can be turned on for a single node of a running
+pipeline, with no external tools. At regular intervals, the profiler collects
+the stacks of the threads of the node (``_update_{name}``, ``_worker_{name}``
+and ``_source_{name}``), along with the stacks of any other thread currently
+running code of the node, such as scheduler workers or the event loop of async
+nodes. Stacks are returned in the collapsed format used by flamegraph tools
+(``flamegraph.pl``, speedscope, inferno), one line per distinct stack, with
+frames separated by semicolons and followed by the number of samples.
+
+Optionally, the allocations made during the profiling window by code in the
+node module can be tracked with ``tracemalloc``.
+"""
+
+import collections
+import inspect
+import sys
+import threading
+import time
+import tracemalloc
+
+from types import FrameType
+
+
+# node threads are named after the node
+_THREAD_PREFIXES = ('_update_', '_worker_', '_source_')
+
+# frames kept by tracemalloc tracebacks, when started by the profiler
+_TRACEMALLOC_FRAMES = 25
+_TOP_ALLOCATIONS = 20
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+
+    return f'{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})'
+
+
+def _stack(frame: FrameType) -> list[FrameType]:
+    stack = list()
+
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+
+    return stack[::-1]
+
+
+class NodeProfiler:
+    def __init__(self, node, interval: float = 0.01, memory: bool = False):
+        """
+        Parameters
+        ----------
+        node : Node
+            The node to profile.
+        interval : float
+            Sampling interval, in seconds.
+        memory : bool
+            Whether to track the allocations made by the node module.
+
+        """
+        self._node = node
+        self._interval = interval
+        self._memory = memory
+        self._thread_names = {
+            f'{prefix}{node.name}' for prefix in _THREAD_PREFIXES
+        }
+
+        self._stacks: collections.Counter = collections.Counter()
+        self._samples = 0
+
+    def run(self, seconds: float) -> dict:
+        """
+        Sample the node threads for the given time. This method blocks until
+        profiling is over.
+
+        Parameters
+        ----------
+        seconds : float
+            Profiling time.
+
+        Returns
+        -------
+        dict
+            The profile: ``node``, ``seconds``, ``samples`` (number of samples
+            taken), ``stacks`` (collapsed stacks, as text), and ``memory``
+            (the top allocations made by the node module during profiling,
+            or ``None`` if memory was not tracked).
+
+        """
+        started_tracing = self._memory and not tracemalloc.is_tracing()
+
+        if started_tracing:
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+
+        before = tracemalloc.take_snapshot() if self._memory else None
+        deadline = time.monotonic() + seconds
+        own = threading.get_ident()
+
+        try:
+            while time.monotonic() < deadline:
+                self._sample(own)
+                time.sleep(self._interval)
+
+            memory = self._allocations(before) if self._memory else None
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return {
+            'node': self._node.name,
+            'seconds': seconds,
+            'samples': self._samples,
+            'stacks': self.collapsed(),
+            'memory': memory,
+        }
+
+    def collapsed(self) -> str:
+        """Stacks sampled so far, in the collapsed format"""
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in self._stacks.most_common()
+        )
+
+    def _sample(self, own: int):
+        frames = sys._current_frames()
+        names = {t.ident: t.name for t in threading.enumerate()}
+
+        self._samples += 1
+
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+
+            name = names.get(ident, str(ident))
+            stack = _stack(frame)
+
+            if name not in self._thread_names and not self._runs_node(stack):
+                continue
+
+            self._stacks[';'.join([name, *map(_label, stack)])] += 1
+
+    def _runs_node(self, stack: list[FrameType]) -> bool:
+        # shared threads are only sampled while running the node methods
+        return any(
+            frame.f_locals.get('self') is self._node
+            for frame in stack
+            if 'self' in frame.f_code.co_varnames
+        )
+
+    def _allocations(self, before: tracemalloc.Snapshot) -> list[dict]:
+        node_file = inspect.getfile(type(self._node))
+        only_node = [tracemalloc.Filter(True, node_file, all_frames=True)]
+
+        after = tracemalloc.take_snapshot().filter_traces(only_node)
+        before = before.filter_traces(only_node)
+
+        # allocations are attributed to the innermost line of the node module
+        totals = collections.defaultdict(lambda: [0, 0])
+
+        for stat in after.compare_to(before, 'traceback'):
+            line = next(
+                frame
+                for frame in reversed(stat.traceback)
+                if frame.filename == node_file
+            )
+            totals[str(line)][0] += stat.size_diff
+            totals[str(line)][1] += stat.count_diff
+
+        top = sorted(totals.items(), key=lambda t: -abs(t[1][0]))
+
+        return [
+            {'location': location, 'size_diff': size, 'count_diff': count}
+            for location, (size, count) in top[:_TOP_ALLOCATIONS]
+            if size or count
+        ]
@@ -0,0 +1,301 @@
+"""
+Replicated nodes
+
+A node configured with ``"replicas": N`` is built N times, and replaced in the
+pipeline by a :class:`ReplicatedNode` proxy, that spreads the batches released
+by its buffer across the replicas, so that they are processed in parallel.
+Batches are dispatched either in round-robin, or by key, so that all the
+messages with the same key (the message creator, or a meta field) always reach
+the same replica, as stateful nodes require.
+
+Messages transmitted by the replicas go through a reorder buffer, that emits
+them in the order their inputs were dispatched: all the messages produced for
+an input are transmitted before any message produced for the following ones.
+"""
+
+import collections
+import inspect
+import threading
+
+from typing import Any
+from collections.abc import Callable
+
+from juturna.components import Message
+from juturna.components._node import Node
+from juturna.components._synchronisers import _SYNCHRONISERS
+from juturna.components._synchronisers import Synchroniser
+from juturna.payloads import ControlPayload, ControlSignal
+from juturna.names import ComponentStatus
+
+
+_DISPATCH_POLICIES = ('round_robin', 'keyed')
+
+
+class _ReplicaLink:
+    """Destination of a replica, collecting its messages in the proxy"""
+
+    def __init__(self, proxy: 'ReplicatedNode', index: int):
+        self._proxy = proxy
+        self._index = index
+
+    def put(self, message: Message, overflow: str | None = None):
+        self._proxy._collect(self._index, message)
+
+
+class ReplicatedNode(Node):
+    def __init__(
+        self,
+        replicas: list[Node],
+        dispatch: str | dict | None = None,
+        **kwargs,
+    ):
+        """
+        Parameters
+        ----------
+        replicas : list[Node]
+            The node instances to dispatch messages to.
+        dispatch : str | dict | None
+            Dispatch policy, either ``round_robin`` (default) or ``keyed``. A
+            dictionary can be used to provide the policy options: ``policy``,
+            ``key`` (the meta field used as dispatch key by the ``keyed``
+            policy, the message creator if not provided), and ``ordered``
+            (whether to restore the dispatch order on transmission, true by
+            default).
+        kwargs : dict
+            Supernode arguments.
+
+        """
+        dispatch = dispatch or 'round_robin'
+        options = (
+            dict(dispatch)
+            if isinstance(dispatch, dict)
+            else {'policy': dispatch}
+        )
+        policy = options.pop('policy', 'round_robin')
+
+        if policy not in _DISPATCH_POLICIES:
+            raise ValueError(f'unknown dispatch policy: {policy}')
+
+        if not replicas:
+            raise ValueError('at least one replica is required')
+
+        # async nodes scale through their own concurrency
+        if any(inspect.iscoroutinefunction(r.update) for r in replicas):
+            raise ValueError('async nodes cannot be replicated')
+
+        # batches are assembled by the proxy buffer, so that replicas receive
+        # exactly what the node would receive if it was not replicated
+        synchroniser = replicas[0].synchroniser
+
+        if (
+            isinstance(synchroniser, Synchroniser)
+            and synchroniser.origins is replicas[0].origins
+        ):
+            synchroniser.origins = None
+
+        super().__init__(synchroniser=synchroniser, **kwargs)
+
+        self._replicas = replicas
+        self._policy = policy
+        self._key = options.get('key')
+        self._ordered = options.get('ordered', True)
+
+        self._next_replica = 0
+        self._sequence = 0
+        self._released = 0
+        self._in_flight = [collections.deque() for _ in replicas]
+        self._held: dict[int, list] = dict()
+        self._completed: set[int] = set()
+        self._reorder_lock = threading.Lock()
+
+        # released messages wait in the outbox, and are transmitted in order
+        # outside the reorder lock, so that a slow destination only blocks the
+        # replica transmitting to it
+        self._outbox: collections.deque[Message] = collections.deque()
+        self._forward_lock = threading.Lock()
+
+        # set whenever the replicas are not running
+        self._replicas_stopped = threading.Event()
+        self._replicas_stopped.set()
+
+        shared = dict()
+
+        for index, replica in enumerate(replicas):
+            replica.synchroniser = _SYNCHRONISERS['passthrough']()
+            replica._shared = shared
+            replica.add_destination('_proxy', _ReplicaLink(self, index))
+            replica.update = self._completing(index, replica.update)
+
+            if hasattr(replica, 'update_batch'):
+                replica.update_batch = self._completing(
+                    index, replica.update_batch
+                )
+
+    @property
+    def configuration(self) -> dict:
+        return self._replicas[0].configuration
+
+    @property
+    def micro_batch(self) -> dict | None:
+        return self._replicas[0].micro_batch
+
+    @micro_batch.setter
+    def micro_batch(self, policy: dict | None):
+        # messages are grouped by each replica
+        for replica in self._replicas:
+            replica.micro_batch = policy
+
+    @property
+    def replicas(self) -> list[Node]:
+        return list(self._replicas)
+
+    @property
+    def pending(self) -> int:
+        """Number of dispatched messages not yet released"""
+        return self._sequence - self._released
+
+    def warmup(self):
+        """Warm up all the replicas, one after the other"""
+        for replica in self._replicas:
+            replica.pipe_id = self.pipe_id
+            replica.pipe_path = self.pipe_path
+            replica.status = ComponentStatus.NEW
+            replica.origins.clear()
+            replica.origins.extend(self.origins)
+            replica.warmup()
+            replica.status = ComponentStatus.CONFIGURED
+
+        self.logger.info(f'{len(self._replicas)} replicas warmed up')
+
+    def start(self):
+        """Start the replicas, then the proxy"""
+        self._replicas_stopped.clear()
+
+        for replica in self._replicas:
+            replica.start()
+
+        super().start()
+
+    def stop(self):
+        """Stop the replicas once they processed all their messages"""
+        if self._status == ComponentStatus.STOPPED:
+            return
+
+        for replica in self._replicas:
+            replica.put(
+                Message(
+                    creator=self.name,
+                    payload=ControlPayload(ControlSignal.STOP),
+                )
+            )
+
+        for replica in self._replicas:
+            replica.join()
+
+        self._replicas_stopped.set()
+
+        super().stop()
+
+    def join(self):
+        """
+        Wait for the replicas to stop, so that all their messages were
+        transmitted, then for the proxy threads to terminate.
+        """
+        self._replicas_stopped.wait()
+
+        super().join()
+
+    def update(self, message: Message):
+        """Dispatch a message to a replica"""
+        index = self._select(message)
+
+        with self._reorder_lock:
+            self._in_flight[index].append(self._sequence)
+            self._held[self._sequence] = list()
+            self._sequence += 1
+
+        self._replicas[index].put(message)
+
+    def set_on_config(self, prop: str, value: Any):
+        """Update a property on all the replicas"""
+        for replica in self._replicas:
+            replica.set_on_config(prop, value)
+
+    def destroy(self):
+        """Destroy all the replicas"""
+        for replica in self._replicas:
+            replica.destroy()
+
+    def _select(self, message: Message) -> int:
+        if self._policy == 'keyed':
+            key = message.meta.get(self._key) if self._key else message.creator
+
+            return hash(key) % len(self._replicas)
+
+        index = self._next_replica
+        self._next_replica = (index + 1) % len(self._replicas)
+
+        return index
+
+    def _completing(self, index: int, update: Callable) -> Callable:
+        # replicas process their messages in order, so the replica update
+        # returning marks the oldest messages in flight on it as completed
+        def _update(message: Message | list[Message]):
+            try:
+                update(message)
+            finally:
+                self._complete(
+                    index, len(message) if isinstance(message, list) else 1
+                )
+
+        return _update
+
+    def _collect(self, index: int, message: Message):
+        with self._reorder_lock:
+            in_flight = self._in_flight[index]
+
+            # messages for the oldest pending input can go straight out, as
+            # well as messages transmitted by a replica outside its update
+            if (
+                not self._ordered
+                or not in_flight
+                or in_flight[0] == self._released
+            ):
+                self._outbox.append(message)
+            else:
+                self._held[in_flight[0]].append(message)
+
+        self._flush()
+
+    def _complete(self, index: int, count: int = 1):
+        with self._reorder_lock:
+            for _ in range(count):
+                self._completed.add(self._in_flight[index].popleft())
+
+            while self._released in self._completed:
+                self._completed.remove(self._released)
+                self._outbox.extend(self._held.pop(self._released))
+                self._released += 1
+
+            # outputs already held for the new oldest input go out before the
+            # ones it still has to produce, which take the fast path
+            if held := self._held.get(self._released):
+                self._outbox.extend(held)
+                held.clear()
+
+        self._flush()
+
+    def _flush(self):
+        with self._forward_lock:
+            while True:
+                with self._reorder_lock:
+                    if not self._outbox:
+                        return
+
+                    message = self._outbox.popleft()
+
+                self._forward(message)
+
+    def _forward(self, message: Message):
+        # messages keep the data source they were produced from by the replica
+        self._transmit(message, message._data_source_id)
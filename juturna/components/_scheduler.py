@@ -0,0 +1,108 @@
+"""
+Node schedulers
+
+By default every node owns dedicated threads that move messages from its
+inbound queue into its buffer, and from its buffer into its ``update()``
+method. The pool scheduler replaces those threads with a single bounded pool,
+shared by the whole process, that drives the enqueue, synchronise and update
+steps of all the nodes attached to it.
+
+Per-node ordering is preserved: a node is never scheduled on more than one pool
+thread at a time, so its messages are still buffered and processed in the same
+order they were received.
+
+Pool threads never block on a full inbound queue: a producer waiting for room
+in the queue of a pooled destination would hold a pool thread that may be the
+one needed to drain it, and with enough producers waiting the whole pipeline
+would deadlock. Messages that would block are queued over the bound instead,
+and the producer is throttled: its step ends, and it is not scheduled again
+until the destination drains its queue below the bound, so that no message is
+lost and the queue grows by at most one update of every producer.
+"""
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from juturna.utils.log_utils import jt_logger
+from juturna.meta import JUTURNA_SCHEDULER_POOL_SIZE
+
+
+class PoolScheduler:
+    """
+    Process-wide pool scheduler. Nodes are submitted to the pool whenever they
+    have pending work, and each submission runs a bounded number of steps
+    before giving the pool thread back, so that busy nodes cannot starve idle
+    ones.
+    """
+
+    STEP_BUDGET = 64
+
+    _instance = None
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._executor = ThreadPoolExecutor(
+                        max_workers=JUTURNA_SCHEDULER_POOL_SIZE,
+                        thread_name_prefix='_jt_pool',
+                    )
+                    cls._instance._logger = jt_logger('scheduler')
+
+        return cls._instance
+
+    @property
+    def max_workers(self) -> int:
+        return self._executor._max_workers
+
+    @classmethod
+    def current(cls):
+        """The node whose step runs on the calling thread, if any"""
+        return getattr(cls._local, 'node', None)
+
+    def schedule(self, node):
+        """
+        Submit a node to the pool. If the node is already scheduled, this is a
+        no-op: the running step will pick up the new work before releasing the
+        node.
+
+        Parameters
+        ----------
+        node : Node
+            The node with pending work.
+
+        """
+        with node._step_lock:
+            if node._step_scheduled:
+                return
+
+            node._step_scheduled = True
+
+        self._executor.submit(self._run, node)
+
+    def _run(self, node):
+        self._local.node = node
+
+        try:
+            node._step(self.STEP_BUDGET)
+        except Exception as e:
+            node.logger.error(f'node step failed: {e}', exc_info=True)
+        finally:
+            self._local.node = None
+
+            with node._step_lock:
+                node._step_scheduled = False
+
+        # throttled nodes are scheduled again by the destination they wait for
+        if node._has_work() and not node._throttled:
+            self.schedule(node)
+
+
+_SCHEDULERS: dict[str, type | None] = {
+    'threaded': None,
+    'pool': PoolScheduler,
+}
@@ -0,0 +1,66 @@
+"""
+Message serialization
+
+Messages cross process boundaries, to process-isolated nodes, and are stored in
+message logs, as a picklable state that holds every message field, nested
+batches included.
+"""
+
+from juturna.components import Message
+from juturna.payloads import Batch
+
+
+def dump_message(message: Message) -> tuple:
+    """
+    Convert a message into a picklable state. Frozen messages hold read-only
+    mappings, so the message cannot be pickled directly.
+    """
+    payload = message.payload
+
+    if isinstance(payload, Batch):
+        payload = ('batch', [dump_message(m) for m in payload.messages])
+
+    return (
+        message.id,
+        message.created_at,
+        message.creator,
+        message.version,
+        payload,
+        dict(message.meta),
+        dict(message.timers),
+        message._data_source_id,
+        message.trace,
+    )
+
+
+def load_message(state: tuple, keep_id: bool = True) -> Message:
+    """
+    Rebuild a message from its state. If ``keep_id`` is false, the message
+    gets a new id, as messages created by a node would.
+    """
+    (
+        message_id,
+        created_at,
+        creator,
+        version,
+        payload,
+        meta,
+        timers,
+        data_source_id,
+        trace,
+    ) = state
+
+    if isinstance(payload, tuple) and payload[0] == 'batch':
+        payload = Batch(messages=tuple(load_message(m) for m in payload[1]))
+
+    message = Message(creator=creator, version=version, payload=payload)
+    message.created_at = created_at
+    message.meta = meta
+    message.timers = timers
+    message._data_source_id = data_source_id
+    message.trace = trace
+
+    if keep_id:
+        message.id = message_id
+
+    return message
@@ -1,17 +1,420 @@
-from collections.abc import Callable
+"""
+Synchronisers
 
+A synchroniser decides when the messages stored in a node buffer are ready to
+be processed. Buffers store messages in per-origin FIFO deques, and support two
+kinds of synchronisers:
 
-def passthrough(sources: dict) -> dict:
+- incremental synchronisers, derived from :class:`Synchroniser`, are notified
+  of every new arrival together with the origin it came from, and directly
+  pop from the buffer deques the messages to be released, so that their cost
+  does not need to grow with the number of buffered messages;
+- legacy synchronisers, plain callables (such as ``next_batch`` methods
+  defined on nodes) that receive the whole buffer content on every arrival,
+  and return, for every origin, the indexes of the messages to be released.
+
+Built-in synchronisers are registered in ``_SYNCHRONISERS``, and can be
+selected with the ``sync`` key of a node configuration, either by name or as
+an object whose ``policy`` field is the synchroniser name, and whose other
+fields are passed to the synchroniser constructor:
+
+.. code-block:: json
+
+    "sync": { "policy": "time_window", "tolerance": 0.02 }
+"""
+
+import heapq
+import math
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable
+
+from juturna.components import Message
+from juturna.payloads import ControlPayload
+
+
+def event_time(message: Message) -> float:
+    """
+    Get the event time of a message, in seconds. This is the ``start`` or the
+    ``timestamp`` field of the message payload, when available and set, or the
+    message creation time otherwise.
+    """
+    # object payloads are dictionaries, their keys are not looked up
+    payload = None if isinstance(message.payload, dict) else message.payload
+
+    for field in ('start', 'timestamp'):
+        if (ts := getattr(payload, field, None)) is not None and ts >= 0:
+            return ts
+
+    return message.created_at
+
+
+class Synchroniser(ABC):
+    """
+    Base class for incremental synchronisers. Instances can be stateful, so a
+    synchroniser object should not be shared across buffers. Subclasses must
+    implement :meth:`arrived`.
+    """
+
+    def __init__(self, origins: list[str] | None = None):
+        """
+        Parameters
+        ----------
+        origins : list[str], optional
+            Origins the synchroniser expects messages from. When not provided,
+            a node will share with its synchroniser the list of its upstream
+            nodes. An empty list means that any origin that sent data messages
+            so far is expected.
+
+        """
+        self.origins = origins
+
+    @abstractmethod
+    def arrived(
+        self, origin: str, sources: dict[str, deque[Message]]
+    ) -> Iterable[tuple[Message, ...]]:
+        """
+        Notify the synchroniser of a new arrival.
+
+        Parameters
+        ----------
+        origin : str
+            The origin of the new message, which was just appended to the right
+            end of ``sources[origin]``.
+        sources : dict[str, deque[Message]]
+            Buffered messages, per origin. The synchroniser is expected to pop
+            the messages it releases (or discards) from these deques.
+
+        Returns
+        -------
+        Iterable[tuple[Message, ...]]
+            Groups of messages to release, in the order they should be
+            processed. Every group is processed in a single update. An empty
+            iterable means nothing is ready yet.
+
+        """
+
+    def reset(self):  # noqa: B027
+        """Clear any internal state, called when the buffer is flushed"""
+        ...
+
+
+class Passthrough(Synchroniser):
     """
     Relay every message as soon as it is available
 
-    This synchroniser simply marks every message stored in `source` as to be
-    delivered, regardless of number, timestamp, or creator.
+    This synchroniser releases every message as soon as it arrives, regardless
+    of number, timestamp, or creator.
+    """
+
+    def arrived(
+        self, origin: str, sources: dict[str, deque[Message]]
+    ) -> Iterable[tuple[Message, ...]]:
+        return ((sources[origin].popleft(),),)
+
+
+class _MultiInput(Synchroniser):
+    """
+    Shared logic of synchronisers that combine messages from several origins.
+    Control messages, and messages from origins not listed in ``origins``, are
+    relayed as soon as they arrive.
+    """
+
+    def __init__(self, origins: list[str] | None = None):
+        super().__init__(origins)
+
+        self._seen: set[str] = set()
+
+    def arrived(
+        self, origin: str, sources: dict[str, deque[Message]]
+    ) -> Iterable[tuple[Message, ...]]:
+        message = sources[origin][-1]
+
+        if isinstance(message.payload, ControlPayload) or (
+            self.origins and origin not in self.origins
+        ):
+            return ((sources[origin].pop(),),)
+
+        self._seen.add(origin)
+
+        return self._arrived(origin, sources)
+
+    @abstractmethod
+    def _arrived(
+        self, origin: str, sources: dict[str, deque[Message]]
+    ) -> Iterable[tuple[Message, ...]]:
+        """Handle a data message from an expected origin"""
+
+    def _expected(self) -> int:
+        return len(self.origins) if self.origins else len(self._seen)
+
+    def reset(self):
+        self._seen = set()
+
+
+class LatestZip(_MultiInput):
+    """
+    Zip the latest message from each origin
+
+    Every origin holds at most one message, the latest it sent, and older ones
+    are discarded. As soon as all the origins hold a message, they are
+    released together, in the order of ``origins``.
     """
-    return {source: list(range(len(sources[source]))) for source in sources}
+
+    def __init__(self, origins: list[str] | None = None):
+        super().__init__(origins)
+
+        self._ready: set[str] = set()
+        self.discarded = 0
+
+    def _arrived(self, origin, sources):
+        origin_data = sources[origin]
+
+        while len(origin_data) > 1:
+            origin_data.popleft()
+            self.discarded += 1
+
+        self._ready.add(origin)
+
+        if len(self._ready) < self._expected():
+            return ()
+
+        order = self.origins or sorted(self._ready)
+        self._ready = set()
+
+        return (tuple(sources[src].popleft() for src in order),)
+
+    def reset(self):
+        super().reset()
+
+        self._ready = set()
+
+
+class TimeWindowJoin(_MultiInput):
+    """
+    Join messages from all origins whose event times are close enough
+
+    Messages are joined when the event times of one message for each origin
+    (see :func:`event_time`) are all within ``tolerance`` seconds. Event times
+    are expected not to decrease within the same origin, so the head of an
+    origin that is too old to be joined with the heads of all the others is
+    discarded.
+    """
+
+    def __init__(
+        self, tolerance: float = 0.02, origins: list[str] | None = None
+    ):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Maximum distance between the event times of joined messages, in
+            seconds.
+        origins : list[str], optional
+            Origins to join, see :class:`Synchroniser`.
+
+        """
+        super().__init__(origins)
+
+        self.tolerance = tolerance
+        self.discarded = 0
+
+        self._ready: set[str] = set()
+
+    def _arrived(self, origin, sources):
+        self._ready.add(origin)
+        joined = list()
+
+        while len(self._ready) >= self._expected():
+            order = self.origins or sorted(self._ready)
+            heads = {src: event_time(sources[src][0]) for src in order}
+            oldest = min(heads, key=heads.get)
+
+            if max(heads.values()) - heads[oldest] <= self.tolerance:
+                joined.append(tuple(self._pop(src, sources) for src in order))
+            else:
+                self._pop(oldest, sources)
+                self.discarded += 1
+
+        return joined
+
+    def _pop(self, origin: str, sources: dict[str, deque[Message]]):
+        message = sources[origin].popleft()
+
+        if not sources[origin]:
+            self._ready.discard(origin)
+
+        return message
+
+    def reset(self):
+        super().reset()
+
+        self._ready = set()
+
+
+class CountWindow(_MultiInput):
+    """
+    Release tumbling windows of a fixed number of messages per origin
+
+    Messages are released as soon as an origin has sent ``size`` of them, in
+    arrival order, and the next window starts empty.
+    """
+
+    def __init__(self, size: int = 2, origins: list[str] | None = None):
+        """
+        Parameters
+        ----------
+        size : int
+            Number of messages in every window.
+        origins : list[str], optional
+            Origins to window, see :class:`Synchroniser`.
+
+        """
+        super().__init__(origins)
+
+        if size < 1:
+            raise ValueError(f'invalid window size: {size}')
+
+        self.size = size
+
+    def _arrived(self, origin, sources):
+        origin_data = sources[origin]
+
+        if len(origin_data) < self.size:
+            return ()
+
+        return (tuple(origin_data.popleft() for _ in range(self.size)),)
+
+
+class SlidingWindow(_MultiInput):
+    """
+    Release sliding windows over the event time of messages from all origins
+
+    Windows are ``length`` seconds long, and a new one starts every ``slide``
+    seconds, so that a message belongs to ``ceil(length / slide)`` windows. A
+    window is released, with its messages sorted by event time, once the
+    watermark (the highest event time seen, minus ``lateness``) passes its
+    end. Messages belonging only to windows already released are late, and
+    are discarded.
+    """
+
+    def __init__(
+        self,
+        length: float = 1.0,
+        slide: float = 0.5,
+        lateness: float = 0.0,
+        origins: list[str] | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        length : float
+            Window length, in seconds.
+        slide : float
+            Distance between the start of consecutive windows, in seconds.
+        lateness : float
+            How late a message can be with respect to the highest event time
+            seen, before windows it belongs to are released.
+        origins : list[str], optional
+            Origins to window, see :class:`Synchroniser`.
+
+        """
+        super().__init__(origins)
+
+        if length <= 0 or slide <= 0:
+            raise ValueError('window length and slide must be positive')
+
+        self.length = length
+        self.slide = slide
+        self.lateness = lateness
+        self.discarded = 0
+
+        self._windows: dict[int, list] = dict()
+        self._open: list[int] = list()
+        self._closed = -math.inf
+        self._watermark = -math.inf
+
+    def _arrived(self, origin, sources):
+        message = sources[origin].pop()
+        ts = event_time(message)
+
+        first = max(
+            math.floor((ts - self.length) / self.slide) + 1, self._closed + 1
+        )
+        last = math.floor(ts / self.slide)
+
+        if first > last:
+            self.discarded += 1
+        else:
+            for idx in range(first, last + 1):
+                if idx not in self._windows:
+                    self._windows[idx] = list()
+                    heapq.heappush(self._open, idx)
+
+                self._windows[idx].append((ts, message.id, message))
+
+        self._watermark = max(self._watermark, ts - self.lateness)
+        released = list()
+
+        while (
+            self._open
+            and self._open[0] * self.slide + self.length <= self._watermark
+        ):
+            idx = heapq.heappop(self._open)
+            self._closed = idx
+
+            released.append(
+                tuple(entry[2] for entry in sorted(self._windows.pop(idx)))
+            )
+
+        return released
+
+    def reset(self):
+        super().reset()
+
+        self._windows = dict()
+        self._open = list()
+        self._closed = -math.inf
+        self._watermark = -math.inf
 
 
 _SYNCHRONISERS: dict[str, Callable | None] = {
-    'passthrough': passthrough,
+    'passthrough': Passthrough,
+    'latest_zip': LatestZip,
+    'time_window': TimeWindowJoin,
+    'count_window': CountWindow,
+    'sliding_window': SlidingWindow,
     'local': None,
 }
+
+
+def build_synchroniser(sync: str | dict | None) -> Synchroniser | None:
+    """
+    Build a synchroniser from the ``sync`` value of a node configuration.
+
+    Parameters
+    ----------
+    sync : str | dict | None
+        Either the name of a built-in synchroniser, or an object with the
+        synchroniser name in its ``policy`` field and its arguments.
+
+    Returns
+    -------
+    Synchroniser | None
+        The synchroniser, or ``None`` if the node should use its local
+        ``next_batch`` method or the default synchroniser.
+
+    """
+    if sync is None:
+        return None
+
+    arguments = dict(sync) if isinstance(sync, dict) else dict()
+    policy = arguments.pop('policy', None) if isinstance(sync, dict) else sync
+
+    if policy not in _SYNCHRONISERS:
+        raise ValueError(f'unknown synchroniser: {policy}')
+
+    synchroniser = _SYNCHRONISERS[policy]
+
+    return synchroniser(**arguments) if synchroniser else None
@@ -1,14 +1,28 @@
 import threading
 import queue
-import csv
 
 from juturna.utils.log_utils import jt_logger
 from juturna.payloads import ControlSignal
+from juturna.components._telemetry_sinks import build_sink
 
 
 class TelemetryManager:
-    def __init__(self, target: str):
+    def __init__(self, target: str, format: str | None = None, **options):
+        """
+        Parameters
+        ----------
+        target : str
+            Path of the telemetry file.
+        format : str | None
+            Telemetry file format (``csv``, ``binary`` or ``arrow``), guessed
+            from the target suffix if not provided.
+        options : dict
+            Sink options: ``max_bytes`` and ``max_seconds`` for rotation, and
+            ``compression``.
+
+        """
         self._target = target
+        self._sink = build_sink(target, format, **options)
 
         self._queue = queue.SimpleQueue()
         self._evt = threading.Event()
@@ -16,6 +30,11 @@ class TelemetryManager:
 
         self._thread: threading.Thread | None = None
 
+    @property
+    def segments(self) -> list:
+        """Files written so far"""
+        return self._sink.segments
+
     def start(self):
         if self._thread is not None:
             self._logger.info('telemetry already running')
@@ -29,7 +48,7 @@ class TelemetryManager:
         self._thread.start()
 
     def stop(self):
-        if self._thread is None or self._thread._is_stopped:
+        if self._thread is None or not self._thread.is_alive():
             return
 
         self._queue.put(ControlSignal.STOP)
@@ -42,24 +61,24 @@ class TelemetryManager:
     def _read_telemetry(self):
         self._logger.info(f'telemetry started, writing on {self._target}')
 
-        _telemetry_lock = threading.Lock()
-
-        with open(self._target, 'a', newline='', buffering=1) as f:
-            _writer = csv.writer(f)
-            _writer.writerow(
-                ['ts', 'evt', 'node', 'origin', 'msg_id', 'src_id', 'size']
-            )
-
-            while self._evt:
+        try:
+            while True:
                 telemetry_batch = self._queue.get()
 
                 if telemetry_batch == ControlSignal.STOP:
-                    self._evt.set()
-
                     return
 
-                for entry in telemetry_batch:
-                    ts, evt_type, node, origin, msg_id, src_id, size = entry
+                # batches queued meanwhile are written at once
+                while not self._queue.empty():
+                    queued = self._queue.get()
+
+                    if queued == ControlSignal.STOP:
+                        self._queue.put(queued)
+
+                        break
+
+                    telemetry_batch.extend(queued)
 
-                    with _telemetry_lock:
-                        _writer.writerow(entry)
+                self._sink.write(telemetry_batch)
+        finally:
+            self._sink.close()
@@ -0,0 +1,576 @@
+"""
+Telemetry sinks
+
+A telemetry sink writes the telemetry entries recorded by the pipeline nodes
+to disk, one batch at a time. Three formats are available:
+
+- ``csv``, one text row per entry;
+- ``binary``, a compact append-only format, where entries are packed as
+  fixed-size records, and strings (events, nodes) are stored once per file;
+- ``arrow``, Arrow IPC streams (or Parquet files, with the ``.parquet``
+  suffix), that require ``pyarrow`` to be installed.
+
+All sinks can rotate their file when it grows past a given size, or after a
+given time, and compress it. Rotated files are named after the target file,
+with a progressive index before its suffix (``tele.00001.jtl``).
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import lzma
+import pathlib
+import struct
+import time
+
+from collections.abc import Iterator
+
+import numpy as np
+
+
+TELEMETRY_FIELDS = ['ts', 'evt', 'node', 'origin', 'msg_id', 'src_id', 'size']
+
+_STRINGS = ('evt', 'node', 'origin')
+
+# numeric columns of the binary format, string columns are stored as indices
+# in the string table of the file
+_RECORD = np.dtype(
+    [
+        ('ts', '<f8'),
+        ('evt', '<u2'),
+        ('node', '<u2'),
+        ('origin', '<u2'),
+        ('msg_id', '<i8'),
+        ('src_id', '<i8'),
+        ('size', '<u8'),
+    ]
+)
+
+_FILE_HEADER = b'JTEL\x01'
+_BLOCK_HEADER = struct.Struct('<cII')
+_STRING_LENGTH = struct.Struct('<H')
+
+_COMPRESSIONS = {
+    None: (open, ''),
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'lzma': (lzma.open, '.xz'),
+}
+
+
+def _opener(path: pathlib.Path):
+    for opener, suffix in _COMPRESSIONS.values():
+        if suffix and path.suffix == suffix:
+            return opener
+
+    return open
+
+
+class TelemetrySink:
+    """
+    Base class of telemetry sinks. Subclasses implement how a file is opened,
+    written and closed, while rotation is handled here.
+    """
+
+    # whether an existing file can be appended to, rather than replaced
+    _appendable = True
+
+    def __init__(
+        self,
+        target: str,
+        max_bytes: int = 0,
+        max_seconds: float = 0,
+        compression: str | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        target : str
+            Path of the telemetry file.
+        max_bytes : int
+            Rotate the file once this many bytes were written to it. If 0, the
+            file is not rotated on size.
+        max_seconds : float
+            Rotate the file once it has been open for this many seconds. If 0,
+            the file is not rotated on time.
+        compression : str | None
+            Compression of the file, either ``gzip``, ``bz2`` or ``lzma``.
+
+        """
+        if compression not in self._compressions():
+            raise ValueError(f'unsupported compression: {compression}')
+
+        self._target = pathlib.Path(target)
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+        self._compression = compression
+
+        self._segment = 0
+        self._opened_at = 0.0
+        self._written = 0
+        self._is_open = False
+        self._segments: list[pathlib.Path] = list()
+
+    @property
+    def segments(self) -> list[pathlib.Path]:
+        """Files written by the sink so far"""
+        return list(self._segments)
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self._max_bytes or self._max_seconds)
+
+    def write(self, batch: list[tuple]):
+        """Write a batch of telemetry entries, rotating the file if needed"""
+        if not batch:
+            return
+
+        if self._is_open and self._should_rotate():
+            self.close()
+
+        if not self._is_open:
+            path = self._next_path()
+
+            self._open(path)
+            self._segments.append(path)
+            self._opened_at = time.monotonic()
+            self._written = 0
+            self._is_open = True
+
+        self._written += self._write(batch)
+
+    def close(self):
+        """Close the current file"""
+        if self._is_open:
+            self._close()
+            self._is_open = False
+
+    def _compressions(self) -> tuple:
+        return tuple(_COMPRESSIONS)
+
+    def _suffix(self) -> str:
+        return _COMPRESSIONS[self._compression][1]
+
+    def _should_rotate(self) -> bool:
+        return (self._max_bytes and self._written >= self._max_bytes) or (
+            self._max_seconds
+            and time.monotonic() - self._opened_at >= self._max_seconds
+        )
+
+    def _next_path(self) -> pathlib.Path:
+        path = self._target.with_name(self._target.name + self._suffix())
+
+        while self.rotating or not (self._appendable or not path.exists()):
+            self._segment += 1
+            path = self._target.with_name(
+                f'{self._target.stem}.{self._segment:05d}'
+                f'{self._target.suffix}{self._suffix()}'
+            )
+
+            if self._appendable or not path.exists():
+                break
+
+        return path
+
+    def _open(self, path: pathlib.Path): ...
+
+    def _write(self, batch: list[tuple]) -> int: ...
+
+    def _close(self): ...
+
+
+class CsvSink(TelemetrySink):
+    """Write entries as CSV rows"""
+
+    def _open(self, path: pathlib.Path):
+        opener = _COMPRESSIONS[self._compression][0]
+
+        self._file = opener(path, 'at', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(TELEMETRY_FIELDS)
+
+    def _write(self, batch: list[tuple]) -> int:
+        # the row size is only needed for rotation, so it is estimated
+        self._writer.writerows(batch)
+        self._file.flush()
+
+        return len(batch) * 64
+
+    def _close(self):
+        self._file.close()
+
+
+class BinarySink(TelemetrySink):
+    """
+    Write entries in the juturna binary telemetry format. A file starts with a
+    header, followed by blocks, one per batch. Each block holds the strings
+    first used in that batch, then the batch entries as packed records. When
+    a file is appended to, a new header resets its string table.
+    """
+
+    def _open(self, path: pathlib.Path):
+        opener = _COMPRESSIONS[self._compression][0]
+
+        self._file = opener(path, 'ab')
+        self._file.write(_FILE_HEADER)
+        self._strings: dict[str, int] = dict()
+
+    def _write(self, batch: list[tuple]) -> int:
+        new_strings = list()
+
+        def _index(value) -> int:
+            value = '' if value is None else str(value)
+
+            if (index := self._strings.get(value)) is None:
+                index = self._strings[value] = len(self._strings)
+                new_strings.append(value)
+
+            return index
+
+        records = np.array(
+            [
+                (
+                    ts,
+                    _index(evt),
+                    _index(node),
+                    _index(origin),
+                    -1 if msg_id is None else msg_id,
+                    -1 if src_id is None else src_id,
+                    size or 0,
+                )
+                for ts, evt, node, origin, msg_id, src_id, size in batch
+            ],
+            dtype=_RECORD,
+        )
+
+        chunk = io.BytesIO()
+        chunk.write(_BLOCK_HEADER.pack(b'B', len(new_strings), len(records)))
+
+        for string in new_strings:
+            encoded = string.encode()
+            chunk.write(_STRING_LENGTH.pack(len(encoded)))
+            chunk.write(encoded)
+
+        chunk.write(records.tobytes())
+
+        self._file.write(chunk.getbuffer())
+        self._file.flush()
+
+        return chunk.tell()
+
+    def _close(self):
+        self._file.close()
+
+
+class ArrowSink(TelemetrySink):
+    """
+    Write entries as Arrow record batches, in an IPC stream, or in a Parquet
+    file if the target has the ``.parquet`` suffix. Compression is applied by
+    Arrow itself, and can be either ``zstd`` or ``lz4``. Arrow files cannot
+    be appended to, so an existing file is never replaced: a new segment is
+    created next to it instead.
+    """
+
+    _appendable = False
+
+    def __init__(self, target: str, **kwargs):
+        # optional dependency, only required by this sink
+        import pyarrow
+
+        self._pa = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                ('ts', pyarrow.float64()),
+                ('evt', pyarrow.dictionary(pyarrow.int16(), pyarrow.string())),
+                ('node', pyarrow.dictionary(pyarrow.int16(), pyarrow.string())),
+                (
+                    'origin',
+                    pyarrow.dictionary(pyarrow.int16(), pyarrow.string()),
+                ),
+                ('msg_id', pyarrow.int64()),
+                ('src_id', pyarrow.int64()),
+                ('size', pyarrow.uint64()),
+            ]
+        )
+
+        super().__init__(target, **kwargs)
+
+        self._parquet = self._target.suffix == '.parquet'
+
+    def _compressions(self) -> tuple:
+        return (None, 'zstd', 'lz4')
+
+    def _suffix(self) -> str:
+        return ''
+
+    def _open(self, path: pathlib.Path):
+        if self._parquet:
+            import pyarrow.parquet
+
+            self._writer = pyarrow.parquet.ParquetWriter(
+                path, self._schema, compression=self._compression or 'none'
+            )
+
+            return
+
+        options = self._pa.ipc.IpcWriteOptions(compression=self._compression)
+        self._sink = self._pa.OSFile(str(path), 'wb')
+        self._writer = self._pa.ipc.new_stream(
+            self._sink, self._schema, options=options
+        )
+
+    def _write(self, batch: list[tuple]) -> int:
+        columns = list(zip(*batch, strict=True))
+        record_batch = self._pa.record_batch(
+            [
+                self._pa.array(column, type=field.type)
+                if not self._pa.types.is_dictionary(field.type)
+                else self._pa.array(
+                    [str(v) for v in column]
+                ).dictionary_encode()
+                for column, field in zip(columns, self._schema, strict=True)
+            ],
+            schema=self._schema,
+        )
+
+        self._writer.write_batch(record_batch)
+
+        return record_batch.nbytes
+
+    def _close(self):
+        self._writer.close()
+
+        if not self._parquet:
+            self._sink.close()
+
+
+_TELEMETRY_SINKS: dict[str, type[TelemetrySink]] = {
+    'csv': CsvSink,
+    'binary': BinarySink,
+    'arrow': ArrowSink,
+}
+
+_FORMAT_SUFFIXES = {
+    '.csv': 'csv',
+    '.jtl': 'binary',
+    '.arrow': 'arrow',
+    '.parquet': 'arrow',
+}
+
+
+def telemetry_format(path: str) -> str:
+    """
+    Guess the telemetry format of a file from its suffix, ignoring the
+    compression suffix, if any. Unknown suffixes default to ``csv``, the
+    format of telemetry files before the others were introduced, so the
+    binary and Arrow formats are only used when explicitly chosen.
+    """
+    path = pathlib.Path(path)
+
+    if path.suffix in {s for _, s in _COMPRESSIONS.values() if s}:
+        path = path.with_suffix('')
+
+    return _FORMAT_SUFFIXES.get(path.suffix, 'csv')
+
+
+def build_sink(target: str, format: str | None = None, **kwargs):
+    """
+    Build a telemetry sink.
+
+    Parameters
+    ----------
+    target : str
+        Path of the telemetry file.
+    format : str | None
+        Format of the file, guessed from the target suffix if not provided.
+    kwargs : dict
+        Sink options (``max_bytes``, ``max_seconds``, ``compression``).
+
+    Returns
+    -------
+    TelemetrySink
+        The telemetry sink.
+
+    """
+    format = format or telemetry_format(target)
+
+    if format not in _TELEMETRY_SINKS:
+        raise ValueError(f'unknown telemetry format: {format}')
+
+    return _TELEMETRY_SINKS[format](target, **kwargs)
+
+
+def read_telemetry(path: str) -> dict[str, np.ndarray]:
+    """
+    Read a telemetry file, in any of the supported formats.
+
+    Parameters
+    ----------
+    path : str
+        Path of the telemetry file.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        One array per telemetry field. Missing ids are set to -1.
+
+    """
+    chunks = list(iter_telemetry(path))
+
+    return {
+        field: (
+            np.concatenate([chunk[field] for chunk in chunks])
+            if chunks
+            else np.empty(0, dtype=str if field in _STRINGS else _RECORD[field])
+        )
+        for field in TELEMETRY_FIELDS
+    }
+
+
+def iter_telemetry(
+    path: str, chunk_size: int = 65536
+) -> Iterator[dict[str, np.ndarray]]:
+    """
+    Read a telemetry file in chunks, so that files of any size can be
+    processed in bounded memory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the telemetry file.
+    chunk_size : int
+        Approximate number of entries of every chunk. Binary files are read
+        one block at a time, so their chunks can be larger by one block.
+
+    Yields
+    ------
+    dict[str, np.ndarray]
+        One array per telemetry field, for the entries of a chunk, in file
+        order. Missing ids are set to -1.
+
+    """
+    path = pathlib.Path(path)
+    format = telemetry_format(path)
+
+    # binary files written with an explicit format can have any suffix
+    if format == 'csv' and _has_binary_header(path):
+        format = 'binary'
+
+    if format == 'binary':
+        return _iter_binary(path, chunk_size)
+
+    if format == 'arrow':
+        return _iter_arrow(path, chunk_size)
+
+    return _iter_csv(path, chunk_size)
+
+
+def _has_binary_header(path: pathlib.Path) -> bool:
+    with _opener(path)(path, 'rb') as f:
+        return f.read(len(_FILE_HEADER)) == _FILE_HEADER
+
+
+def _iter_binary(path: pathlib.Path, chunk_size: int) -> Iterator[dict]:
+    with _opener(path)(path, 'rb') as f:
+        parts = {field: list() for field in TELEMETRY_FIELDS}
+        buffered = 0
+        strings = list()
+
+        while tag := f.read(1):
+            if tag == _FILE_HEADER[:1]:
+                if f.read(len(_FILE_HEADER) - 1) != _FILE_HEADER[1:]:
+                    raise ValueError(f'invalid telemetry header at {f.tell()}')
+
+                strings = list()
+
+                continue
+
+            tag, string_count, record_count = _BLOCK_HEADER.unpack(
+                tag + f.read(_BLOCK_HEADER.size - 1)
+            )
+
+            if tag != b'B':
+                raise ValueError(f'invalid telemetry block at byte {f.tell()}')
+
+            for _ in range(string_count):
+                (length,) = _STRING_LENGTH.unpack(f.read(_STRING_LENGTH.size))
+                strings.append(f.read(length).decode())
+
+            records = np.frombuffer(
+                f.read(record_count * _RECORD.itemsize), dtype=_RECORD
+            )
+            table = np.array(strings, dtype=str)
+
+            for field in TELEMETRY_FIELDS:
+                column = records[field]
+                parts[field].append(
+                    table[column] if field in _STRINGS else column
+                )
+
+            buffered += record_count
+
+            if buffered >= chunk_size:
+                yield {k: np.concatenate(v) for k, v in parts.items()}
+
+                parts = {field: list() for field in TELEMETRY_FIELDS}
+                buffered = 0
+
+        if buffered:
+            yield {k: np.concatenate(v) for k, v in parts.items()}
+
+
+def _iter_arrow(path: pathlib.Path, chunk_size: int) -> Iterator[dict]:
+    import pyarrow
+
+    if path.suffix == '.parquet':
+        import pyarrow.parquet
+
+        batches = pyarrow.parquet.ParquetFile(path).iter_batches(chunk_size)
+
+        yield from (_arrow_columns(batch) for batch in batches)
+
+        return
+
+    with pyarrow.OSFile(str(path), 'rb') as f:
+        for batch in pyarrow.ipc.open_stream(f):
+            yield _arrow_columns(batch)
+
+
+def _arrow_columns(batch) -> dict[str, np.ndarray]:
+    import pyarrow
+
+    return {
+        field: (
+            np.array(batch.column(field).cast(pyarrow.string()), dtype=str)
+            if field in _STRINGS
+            else batch.column(field).to_numpy()
+        )
+        for field in TELEMETRY_FIELDS
+    }
+
+
+def _iter_csv(path: pathlib.Path, chunk_size: int) -> Iterator[dict]:
+    with _opener(path)(path, 'rt', newline='') as f:
+        rows = (row for row in csv.reader(f) if row and row[0] != 'ts')
+
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            yield _csv_columns(chunk)
+
+
+def _csv_columns(rows: list[list[str]]) -> dict[str, np.ndarray]:
+    columns = list(zip(*rows, strict=True))
+
+    def _ids(column) -> np.ndarray:
+        return np.array([int(v) if v else -1 for v in column], dtype=np.int64)
+
+    return {
+        'ts': np.array(columns[0], dtype=np.float64),
+        'evt': np.array(columns[1], dtype=str),
+        'node': np.array(columns[2], dtype=str),
+        'origin': np.array(columns[3], dtype=str),
+        'msg_id': _ids(columns[4]),
+        'src_id': _ids(columns[5]),
+        'size': np.array([int(v or 0) for v in columns[6]], dtype=np.uint64),
+    }
@@ -9,6 +9,7 @@ from juturna.meta._constants import (
     JUTURNA_MAX_QUEUE_SIZE,
     JUTURNA_ENV_VAR_PREFIX,
     JUTURNA_TELEMETRY_BATCH_SIZE,
+    JUTURNA_SCHEDULER_POOL_SIZE,
 )
 
 
@@ -22,4 +23,5 @@ __all__ = [
     'JUTURNA_MAX_QUEUE_SIZE',
     'JUTURNA_ENV_VAR_PREFIX',
     'JUTURNA_TELEMETRY_BATCH_SIZE',
+    'JUTURNA_SCHEDULER_POOL_SIZE',
 ]
@@ -14,6 +14,7 @@ _VAR_DEFAULTS = {
     'JUTURNA_MAX_QUEUE_SIZE': 999,
     'JUTURNA_ENV_VAR_PREFIX': '$JT_ENV_',
     'JUTURNA_TELEMETRY_BATCH_SIZE': 10,
+    'JUTURNA_SCHEDULER_POOL_SIZE': 16,
 }
 
 
@@ -30,3 +31,4 @@ JUTURNA_THREAD_JOIN_TIMEOUT = get_constant_var('JUTURNA_THREAD_JOIN_TIMEOUT')
 JUTURNA_MAX_QUEUE_SIZE = get_constant_var('JUTURNA_MAX_QUEUE_SIZE')
 JUTURNA_ENV_VAR_PREFIX = get_constant_var('JUTURNA_ENV_VAR_PREFIX')
 JUTURNA_TELEMETRY_BATCH_SIZE = get_constant_var('JUTURNA_TELEMETRY_BATCH_SIZE')
+JUTURNA_SCHEDULER_POOL_SIZE = get_constant_var('JUTURNA_SCHEDULER_POOL_SIZE')
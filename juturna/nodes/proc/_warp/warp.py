@@ -7,12 +7,22 @@ Warp Node
 Generic gRPC remote node using Juturna's protobuf messaging.
 """
 
+import collections
+import queue
+import threading
+import uuid
+
+from typing import NamedTuple
+
 import grpc
 
+from juturna.remotizer import _framing
+from juturna.remotizer._codecs import Encoding
+from juturna.remotizer._endpoints import Endpoint
+from juturna.remotizer._endpoints import EndpointPool
 from juturna.remotizer.c_protos import messaging_service_pb2_grpc
 
 from juturna.remotizer.utils import (
-    message_to_proto,
     create_envelope,
     deserialize_message,
 )
@@ -21,6 +31,25 @@ from juturna.components import Message
 from juturna.components import Node
 
 
+# errors after which a request is sent to another endpoint
+_FAILOVER_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+)
+
+
+class _Pending(NamedTuple):
+    """A request sent over a stream, waiting for its response"""
+
+    seq: int
+    message: Message
+    context: object
+    request: object
+    endpoint: Endpoint | None = None
+    # endpoints the request already failed on
+    tried: tuple = ()
+
+
 class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
     """
     Type Parameters
@@ -37,6 +66,19 @@ class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
         grpc_port: int,
         timeout: int,
         remote_config: dict,
+        max_in_flight: int = 1,
+        raw_frames: bool = False,
+        compression: str = '',
+        compression_threshold: int = 16384,
+        audio_encoding: str = '',
+        image_encoding: str = '',
+        jpeg_quality: int = 90,
+        object_format: str = '',
+        endpoints: list | None = None,
+        balancing: str = 'round_robin',
+        hash_key: str = '',
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
         **kwargs,
     ):
         """
@@ -50,38 +92,145 @@ class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
             Timeout for gRPC calls in seconds.
         remote_config : dict
             Missing description.
+        max_in_flight : int
+            Maximum number of requests waiting for a response. With more than
+            one request in flight, messages are exchanged over a bidirectional
+            stream per endpoint, and responses are transmitted in the order
+            the requests were sent.
+        raw_frames : bool
+            If true, large audio and image arrays are exchanged as raw frames
+            next to the envelopes, rather than copied into them. Requires a
+            remote service supporting the framed methods.
+        compression : str
+            Compression of the payloads exchanged with the remote service,
+            one of ``gzip``, ``zstd`` or ``lz4``. If empty, payloads are not
+            compressed. Takes precedence over raw frames.
+        compression_threshold : int
+            Payloads smaller than this, in bytes, are not compressed.
+        audio_encoding : str
+            Encoding of floating point audio samples: ``int16`` quantises
+            them to 16 bits integers. If empty, samples are sent as they are.
+        image_encoding : str
+            Encoding of 8 bits images, either ``jpeg`` or ``png``. If empty,
+            images are sent as they are.
+        jpeg_quality : int
+            Quality of jpeg images, from 1 to 100.
+        object_format : str
+            Binary format of object payloads and message metadata, either
+            ``msgpack`` or ``cbor``. If empty, they are converted to protobuf
+            structs, which turn all numbers into floating point ones.
+        endpoints : list
+            Addresses of identical remote services, as ``host:port``, to
+            spread the requests across. If empty, the only endpoint is
+            ``grpc_host:grpc_port``.
+        balancing : str
+            Policy picking the endpoint of every request: ``round_robin``,
+            ``least_outstanding`` (the endpoint with the fewest requests
+            waiting for a response), or ``consistent_hash`` (the endpoint
+            owning the ``hash_key`` of the message, so that messages with
+            the same key reach the same endpoint).
+        hash_key : str
+            Metadata key hashed by the ``consistent_hash`` policy. Messages
+            without it are balanced round robin.
+        max_failures : int
+            Number of consecutive failed requests after which an endpoint is
+            ejected. Requests failing because an endpoint is unavailable or
+            too slow are sent to another endpoint.
+        ejection_time : float
+            Time an endpoint stays ejected, in seconds.
         kwargs : dict
             Supernode arguments.
 
         """
+        if max_in_flight < 1:
+            raise ValueError(f'invalid max_in_flight: {max_in_flight}')
+
+        encoding = Encoding(
+            compression=compression,
+            threshold=compression_threshold,
+            audio=audio_encoding,
+            image=image_encoding,
+            quality=jpeg_quality,
+            objects=object_format,
+        )
+        encoding.validate()
+
+        if balancing == 'consistent_hash' and not hash_key:
+            raise ValueError('consistent_hash balancing requires a hash_key')
+
+        self._pool = EndpointPool(
+            list(endpoints or [f'{grpc_host}:{grpc_port}']),
+            policy=balancing,
+            max_failures=max_failures,
+            ejection_time=ejection_time,
+        )
+
         super().__init__(**kwargs)
 
         self._grpc_host = grpc_host
         self._grpc_port = grpc_port
         self._timeout = timeout
         self._remote_config = remote_config
+        self._max_in_flight = max_in_flight
+        self._raw_frames = raw_frames
+        self._hash_key = hash_key
+
+        # responses are encoded by the remote service as requests are
+        self._encoding = (
+            encoding
+            if any((compression, audio_encoding, image_encoding, object_format))
+            else None
+        )
+        self._metadata = (
+            {'encoding': self._encoding._asdict()} if self._encoding else {}
+        )
+
+        # requests sent over the streams, by envelope id, and responses
+        # waiting for earlier requests to be answered, by sequence number
+        self._pending: dict[str, _Pending] = dict()
+        self._completed: dict[int, tuple] = dict()
+        self._next_seq = 0
+        self._next_emit = 0
+        self._in_flight_cond = threading.Condition()
+
+        # responses released in order, transmitted outside the condition by
+        # one thread at a time, so that a slow destination does not block the
+        # receivers
+        self._ready: collections.deque[tuple] = collections.deque()
+        self._emit_lock = threading.Lock()
+
+        # open streams, as request queue, call and receiver thread, by
+        # endpoint address
+        self._streams: dict[str, tuple] = dict()
 
         self.logger.info('warp node initialized')
 
     def warmup(self):
         """Warmup the node"""
-        # Setup gRPC channel and stub
-        self.channel = grpc.insecure_channel(
-            f'{self._grpc_host}:{self._grpc_port}',
-            options=[
-                ('grpc.max_send_message_length', 100 * 1024 * 1024),  # 100MB
-                ('grpc.max_receive_message_length', 100 * 1024 * 1024),  # 100MB
-            ],
-        )
-
-        # Create stub: it stubs the remote service for the client-proxy;
-        # it will be defined as MessagingServiceImpl on the server side
-        self.stub = messaging_service_pb2_grpc.MessagingServiceStub(
-            self.channel
+        # Setup a gRPC channel and stub for every endpoint
+        self._pool.open(
+            channel=lambda address: grpc.insecure_channel(
+                address,
+                options=[
+                    ('grpc.max_send_message_length', 100 * 1024 * 1024),
+                    ('grpc.max_receive_message_length', 100 * 1024 * 1024),
+                ],
+            ),
+            # Create stub: it stubs the remote service for the client-proxy;
+            # it will be defined as MessagingServiceImpl on the server side
+            stub=(
+                _framing.FramedStub
+                if self._raw_frames
+                else messaging_service_pb2_grpc.MessagingServiceStub
+            ),
         )
 
         self.logger.info(f'warmup node: {self.name}')
 
+    def destroy(self):
+        """Close the channels of the endpoints"""
+        self._pool.close()
+
     def update(self, message: Message[T_Input]):
         """
         Send message via gRPC and wait for response
@@ -95,28 +244,21 @@ class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
             The message to send with input payload type
 
         """
+        if self._max_in_flight > 1:
+            self._send_streamed(message)
+
+            return
+
         try:
             self.logger.info('converting message to protobuf...')
-            message_proto = message_to_proto(message)
-            self.logger.debug('creating envelope...')
-            envelope = create_envelope(
-                message=message_proto,
-                creator=self.name,
-                request_type=type(T_Input).__name__,
-                response_type=type(T_Output).__name__,
-                priority=0,
-                timeout=self._timeout,
-                configuration={},
-                metadata={},
-            )
-
-            envelope.configuration.update(self._remote_config)
+            request = self._request(message)
+            envelope = request[0] if self._raw_frames else request
             self.logger.info(f'sending message (envelope_id={envelope.id})...')
 
             self.logger.info(f'sending message id {message.id}...')
 
-            response_envelope = self.stub.SendAndReceive(
-                envelope, timeout=self._timeout
+            response_envelope, frames = self._response(
+                self._send_and_receive(request, message)
             )
 
             self.logger.info(
@@ -125,7 +267,7 @@ class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
 
             self.logger.info('converting response to Message...')
             to_send: Message[T_Output] = deserialize_message(
-                response_envelope.message
+                response_envelope.message, frames
             )
 
             self.transmit(to_send)
@@ -137,3 +279,274 @@ class Warp[T_Input, T_Output](Node[T_Input, T_Output]):
         except Exception as e:
             self.logger.error(f'Error in update: {e}', exc_info=True)
             raise
+
+    def stop(self):
+        """Stop the node, once all the requests in flight are answered"""
+        super().stop()
+        self.flush()
+        self._close_streams()
+
+    def flush(self):
+        """Wait for all the requests in flight to be answered"""
+        with self._in_flight_cond:
+            self._in_flight_cond.wait_for(
+                lambda: not (self._pending or self._completed or self._ready),
+                timeout=self._timeout,
+            )
+
+        # the last responses may still be being transmitted
+        with self._emit_lock:
+            pass
+
+    def _request(self, message: Message[T_Input]):
+        """The request for a message, with its raw frames if enabled"""
+        frames = list() if self._raw_frames else None
+        envelope = create_envelope(
+            message=message,
+            creator=self.name,
+            id=str(uuid.uuid4()),
+            request_type=type(T_Input).__name__,
+            response_type=type(T_Output).__name__,
+            priority=0,
+            timeout=self._timeout,
+            configuration={},
+            metadata=self._metadata,
+            frames=frames,
+            encoding=self._encoding,
+        )
+
+        envelope.configuration.update(self._remote_config)
+
+        return (envelope, frames) if self._raw_frames else envelope
+
+    def _response(self, response) -> tuple:
+        """The envelope of a response, and its raw frames if enabled"""
+        return response if self._raw_frames else (response, None)
+
+    def _envelope(self, request):
+        return request[0] if self._raw_frames else request
+
+    def _key(self, message: Message) -> str | None:
+        """The consistent hashing key of a message, if any"""
+        value = message.meta.get(self._hash_key) if self._hash_key else None
+
+        return None if value is None else str(value)
+
+    def _send_and_receive(self, request, message: Message[T_Input]):
+        """Send a request, failing over to other endpoints if needed"""
+        tried = list()
+
+        while True:
+            endpoint = self._pool.pick(self._key(message), tried)
+
+            try:
+                response = endpoint.stub.SendAndReceive(
+                    request, timeout=self._timeout
+                )
+            except grpc.RpcError as e:
+                self._pool.release(endpoint, ok=False)
+                tried.append(endpoint)
+
+                if e.code() not in _FAILOVER_CODES or len(tried) == len(
+                    self._pool.endpoints
+                ):
+                    raise
+
+                self.logger.warning(
+                    f'endpoint {endpoint.address} failed: {e.code()}, '
+                    'failing over'
+                )
+
+                continue
+
+            self._pool.release(endpoint, ok=True)
+
+            return response
+
+    def _send_streamed(self, message: Message[T_Input]):
+        request = self._request(message)
+
+        # responses not yet transmitted count as in flight, so that waiting
+        # for a slow request blocks the node rather than growing the buffer
+        with self._in_flight_cond:
+            self._in_flight_cond.wait_for(
+                lambda: (
+                    len(self._pending) + len(self._completed) + len(self._ready)
+                    < self._max_in_flight
+                )
+            )
+
+            self._dispatch(
+                _Pending(
+                    seq=self._next_seq,
+                    message=message,
+                    context=self._trace_context,
+                    request=request,
+                )
+            )
+            self._next_seq += 1
+
+        self._emit_ready()
+
+        self.logger.debug(
+            f'sent message {message.id} ({self._envelope(request).id})'
+        )
+
+    def _dispatch(self, entry: _Pending):
+        """Send a request over the stream of an endpoint (holding the lock)"""
+        endpoint = self._pool.pick(self._key(entry.message), entry.tried)
+
+        if endpoint is None:
+            self.logger.error(
+                f'request for message {entry.message.id} failed on all '
+                'endpoints'
+            )
+            self._completed[entry.seq] = None
+            self._release_ready()
+            self._in_flight_cond.notify_all()
+
+            return
+
+        if endpoint.address not in self._streams:
+            self._open_stream(endpoint)
+
+        self._pending[self._envelope(entry.request).id] = entry._replace(
+            endpoint=endpoint
+        )
+        self._streams[endpoint.address][0].put(entry.request)
+
+    def _open_stream(self, endpoint: Endpoint):
+        requests = queue.Queue()
+        call = endpoint.stub.SendAndReceiveStream(iter(requests.get, None))
+        thread = threading.Thread(
+            name=f'_receiver_{self.name}_{endpoint.address}',
+            target=self._receive,
+            args=(endpoint, call, requests),
+            daemon=True,
+        )
+
+        self._streams[endpoint.address] = (requests, call, thread)
+        thread.start()
+
+    def _close_streams(self):
+        with self._in_flight_cond:
+            streams = list(self._streams.values())
+
+        # closing the request streams lets the service end the calls once the
+        # requests in flight are answered
+        for requests, _, _ in streams:
+            requests.put(None)
+
+        for _, call, thread in streams:
+            thread.join(timeout=self._timeout)
+
+            if thread.is_alive():
+                call.cancel()
+                thread.join()
+
+    def _receive(self, endpoint: Endpoint, call, requests: queue.Queue):
+        code = None
+
+        try:
+            for response in call:
+                self._received(*self._response(response))
+        except grpc.RpcError as e:
+            code = e.code()
+
+            if code != grpc.StatusCode.CANCELLED:
+                self.logger.error(
+                    f'gRPC error from {endpoint.address}: {code} - '
+                    f'{e.details()}'
+                )
+        finally:
+            with self._in_flight_cond:
+                if self._streams.get(endpoint.address, (None,))[0] is requests:
+                    del self._streams[endpoint.address]
+
+                lost = [
+                    envelope_id
+                    for envelope_id, entry in self._pending.items()
+                    if entry.endpoint is endpoint
+                ]
+
+                # requests still pending will never be answered on this
+                # endpoint, and are sent to another one, unless cancelled
+                for envelope_id in lost:
+                    entry = self._pending.pop(envelope_id)
+                    self._pool.release(endpoint, ok=False)
+
+                    if code == grpc.StatusCode.CANCELLED:
+                        self._completed[entry.seq] = None
+                    else:
+                        self._dispatch(
+                            entry._replace(tried=entry.tried + (endpoint,))
+                        )
+
+                self._release_ready()
+                self._in_flight_cond.notify_all()
+
+            self._emit_ready()
+
+    def _received(self, envelope, frames: list | None):
+        with self._in_flight_cond:
+            entry = self._pending.pop(envelope.response_to, None)
+
+        if entry is None:
+            self.logger.warning(
+                f'unexpected response to {envelope.response_to}'
+            )
+
+            return
+
+        seq, request, context = entry.seq, entry.message, entry.context
+        error = envelope.metadata.fields.get('error')
+
+        # requests failing on the remote node count as endpoint failures, but
+        # are not sent to another endpoint
+        self._pool.release(entry.endpoint, ok=error is None)
+
+        if error is None:
+            response = deserialize_message(envelope.message, frames)
+
+            object.__setattr__(response, '_data_source_id', request.id)
+            self._stamp_trace(response, context)
+            response._freeze()
+
+            completed = (request, response)
+        else:
+            self.logger.error(
+                f'request for message {request.id} failed: {error.string_value}'
+            )
+
+            completed = None
+
+        with self._in_flight_cond:
+            self._completed[seq] = completed
+            self._release_ready()
+            self._in_flight_cond.notify_all()
+
+        self._emit_ready()
+
+    def _release_ready(self):
+        # responses are released in the order the requests were sent (holding
+        # the lock)
+        while self._next_emit in self._completed:
+            completed = self._completed.pop(self._next_emit)
+            self._next_emit += 1
+
+            if completed is not None:
+                self._ready.append(completed)
+
+    def _emit_ready(self):
+        # transmit the released responses, never holding the condition
+        with self._emit_lock:
+            while True:
+                with self._in_flight_cond:
+                    if not self._ready:
+                        self._in_flight_cond.notify_all()
+
+                        return
+
+                    request, response = self._ready.popleft()
+
+                self.transmit(response, source=request)
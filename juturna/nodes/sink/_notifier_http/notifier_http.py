@@ -8,9 +8,14 @@ Transmit message to a HTTP endpoint.
 """
 
 import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from requests.adapters import HTTPAdapter
+
 from juturna.components import Message
 from juturna.components import Node
 
@@ -26,7 +31,16 @@ class NotifierHTTP(Node[ObjectPayload, None]):
     }
 
     def __init__(
-        self, endpoint: str, timeout: int, content_type: str, **kwargs
+        self,
+        endpoint: str,
+        timeout: int,
+        content_type: str,
+        max_in_flight: int = 8,
+        batch_size: int = 1,
+        batch_wait_ms: int = 0,
+        retries: int = 0,
+        backoff: float = 0.5,
+        **kwargs,
     ):
         """
         Parameters
@@ -38,15 +52,51 @@ class NotifierHTTP(Node[ObjectPayload, None]):
         content_type : str
             Transmission data content type (this node supports, for now,
             application/json and text/plain data).
+        max_in_flight : int
+            Maximum number of requests in flight at once, which is also the
+            size of the worker and connection pools.
+        batch_size : int
+            Maximum number of messages sent in a single request, as a JSON
+            array. If 1, messages are sent one by one.
+        batch_wait_ms : int
+            How long to wait for a batch to fill up, in milliseconds.
+        retries : int
+            How many times a failed request is retried.
+        backoff : float
+            Delay before the first retry, in seconds, doubled on every retry.
         kwargs : dict
             Superclass arguments.
 
         """
+        if max_in_flight < 1:
+            raise ValueError(f'invalid max_in_flight: {max_in_flight}')
+
         super().__init__(**kwargs)
 
         self._endpoint = endpoint
         self._timeout = timeout
         self._content_type = content_type
+        self._max_in_flight = max_in_flight
+        self._retries = retries
+        self._backoff = backoff
+
+        self._session: requests.Session | None = None
+        self._workers: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        self._in_flight_cond = threading.Condition()
+
+        self._stats_lock = threading.Lock()
+        self._sent = 0
+        self._failed = 0
+        self._requests = 0
+        self._latency = 0.0
+        self._max_latency = 0.0
+
+        if batch_size > 1:
+            self.micro_batch = {
+                'max_size': batch_size,
+                'max_wait_ms': batch_wait_ms,
+            }
 
     @property
     def configuration(self) -> dict:
@@ -56,8 +106,40 @@ class NotifierHTTP(Node[ObjectPayload, None]):
 
         return base_config
 
+    @property
+    def stats(self) -> dict:
+        """
+        Transmission counters: number of messages sent and failed, and mean
+        and max request latency in milliseconds, retries included
+        """
+        with self._stats_lock:
+            return {
+                'sent': self._sent,
+                'failed': self._failed,
+                'latency_ms': (
+                    self._latency / self._requests * 1000
+                    if self._requests
+                    else 0.0
+                ),
+                'max_latency_ms': self._max_latency * 1000,
+            }
+
     def warmup(self):
         """Warmup the node"""
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self._max_in_flight
+        )
+
+        self._session = requests.Session()
+        self._session.headers['Content-Type'] = self._content_type
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._workers = ThreadPoolExecutor(
+            max_workers=self._max_in_flight,
+            thread_name_prefix=f'{self.name}_thread',
+        )
+
         self.logger.info(f'[{self.name}] set to endpoint {self._endpoint}')
 
     def set_on_config(self, prop: str, value: str):
@@ -68,7 +150,34 @@ class NotifierHTTP(Node[ObjectPayload, None]):
             self._endpoint = value
 
     def update(self, message: Message[ObjectPayload]):
-        """Receive a message, transmit a message"""
+        """Receive a message, send it to the endpoint"""
+        self._submit([message], self._content(message))
+
+    def update_batch(self, messages: list[Message[ObjectPayload]]):
+        """Receive a group of messages, send them as a single array"""
+        self._submit(messages, [self._content(m) for m in messages])
+
+    def stop(self):
+        """Stop the node, once all the requests in flight are done"""
+        super().stop()
+        self.flush()
+
+    def flush(self):
+        """Wait for all the requests in flight to complete"""
+        with self._in_flight_cond:
+            self._in_flight_cond.wait_for(lambda: self._in_flight == 0)
+
+    def destroy(self):
+        """Release the worker and connection pools"""
+        if self._workers is not None:
+            self._workers.shutdown(wait=True)
+            self._workers = None
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _content(self, message: Message[ObjectPayload]):
         to_send = Message[ObjectPayload](
             creator=message.creator,
             version=message.version,
@@ -77,27 +186,74 @@ class NotifierHTTP(Node[ObjectPayload, None]):
         )
 
         to_send.meta['session_id'] = self.pipe_id
-        to_send = NotifierHTTP._CNT_CB[self._content_type](message)
 
-        t = threading.Thread(
-            name=f'{self.name}_thread',
-            target=self._send_chunk,
-            args=(to_send,),
-            daemon=True,
-        )
+        return NotifierHTTP._CNT_CB[self._content_type](to_send)
 
-        t.start()
+    def _submit(self, messages: list[Message], content):
+        # a full pool blocks the node, so its inbound queue applies
+        # backpressure when the endpoint cannot keep up
+        with self._in_flight_cond:
+            self._in_flight_cond.wait_for(
+                lambda: self._in_flight < self._max_in_flight
+            )
+            self._in_flight += 1
 
-    def _send_chunk(self, message_cnt):
         try:
-            headers = {'Content-Type': self._content_type}
-            response = requests.post(
-                self._endpoint,
-                json=message_cnt,
-                headers=headers,
-                timeout=self._timeout,
-            )
+            self._workers.submit(self._send_chunk, messages, content)
+        except Exception:
+            self._done()
+
+            raise
+
+    def _send_chunk(self, messages: list[Message], message_cnt):
+        start = time.perf_counter()
+        sent = False
+
+        try:
+            sent = self._post(message_cnt)
+        finally:
+            latency = time.perf_counter() - start
+
+            with self._stats_lock:
+                if sent:
+                    self._sent += len(messages)
+                else:
+                    self._failed += len(messages)
+
+                self._requests += 1
+                self._latency += latency
+                self._max_latency = max(self._max_latency, latency)
+
+            for message in messages:
+                self._rec_telemetry(message, 'sent' if sent else 'failed')
+
+            self._done()
+
+    def _done(self):
+        with self._in_flight_cond:
+            self._in_flight -= 1
+            self._in_flight_cond.notify_all()
+
+    def _post(self, message_cnt) -> bool:
+        for attempt in range(self._retries + 1):
+            if attempt:
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+
+            try:
+                response = self._session.post(
+                    self._endpoint,
+                    json=message_cnt,
+                    timeout=self._timeout,
+                )
+            except requests.RequestException as e:
+                self.logger.info(e)
+
+                continue
 
             self.logger.info(f'message sent: {response.status_code}')
-        except Exception as e:
-            self.logger.info(e)
+
+            # client errors would fail again, so they are not retried
+            if response.status_code < 500:
+                return response.ok
+
+        return False
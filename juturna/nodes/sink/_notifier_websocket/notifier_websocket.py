@@ -7,8 +7,12 @@ NotifierWebsocket
 Transmit message to a websocket socket.
 """
 
+import heapq
+import itertools
 import threading
+import time
 
+from websockets.exceptions import WebSocketException
 from websockets.sync.client import connect
 
 from juturna.components import Message
@@ -20,29 +24,134 @@ from juturna.payloads import BasePayload
 class NotifierWebsocket(Node[BasePayload, None]):
     """Transmit data to a websocket endpoint"""
 
-    def __init__(self, endpoint: str, **kwargs):
+    def __init__(
+        self,
+        endpoint: str,
+        replay_size: int = 256,
+        coalesce: bool = False,
+        reorder_ms: int = 0,
+        reconnect_ms: int = 500,
+        **kwargs,
+    ):
         """
         Parameters
         ----------
         endpoint : str
             Destination endpoint, including port.
+        replay_size : int
+            Maximum number of messages waiting to be sent. Messages are kept
+            while the connection is down, and replayed once it is restored;
+            when the limit is reached, the oldest messages are dropped.
+        coalesce : bool
+            If true, all the messages waiting to be sent are sent together, as
+            a single JSON array.
+        reorder_ms : int
+            How long a message waits before being sent, in milliseconds, so
+            that messages with a lower version received later can overtake it.
+        reconnect_ms : int
+            Delay before the first reconnection attempt, in milliseconds,
+            doubled on every failed attempt.
         kwargs : dict
             Superclass arguments.
 
         """
+        if replay_size < 1:
+            raise ValueError(f'invalid replay_size: {replay_size}')
+
         super().__init__(**kwargs)
 
         self._endpoint = endpoint
+        self._replay_size = replay_size
+        self._coalesce = coalesce
+        self._reorder = reorder_ms / 1000
+        self._reconnect = reconnect_ms / 1000
 
         self._sent = 0
-        self._t = None
+        self._discarded = 0
+        self._connections = 0
+
+        # messages waiting to be sent, ordered by version, then by arrival
+        self._pending: list[tuple] = list()
+        self._arrivals = itertools.count()
+        self._pending_cond = threading.Condition()
+
+        # the connection, and the endpoint it is open to, only changed by the
+        # sender thread while running
+        self._ws = None
+        self._ws_endpoint: str | None = None
+        self._sender: threading.Thread | None = None
+        self._closing = threading.Event()
+
+    @property
+    def configuration(self) -> dict:
+        """Fetch node configuration"""
+        base_config = super().configuration
+        base_config['endpoint'] = self._endpoint
+
+        return base_config
+
+    @property
+    def sent(self) -> int:
+        """Number of messages sent"""
+        return self._sent
+
+    @property
+    def discarded(self) -> int:
+        """Number of messages dropped from the replay buffer"""
+        return self._discarded
+
+    @property
+    def reconnections(self) -> int:
+        """Number of times the connection was restored after being lost"""
+        return max(self._connections - 1, 0)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the node is connected to its endpoint"""
+        return self._ws is not None
 
     def warmup(self):
         """Warmup the node"""
         self.logger.info(f'[{self.name}] set to endpoint {self._endpoint}')
 
+    def set_on_config(self, prop: str, value: str):
+        """Change the node configuration"""
+        if prop == 'endpoint':
+            self.logger.info(f'updating endpoint to {value}')
+
+            # the sender reconnects to the new endpoint on its next message
+            self._endpoint = value
+
+    def start(self):
+        """Start the node, and its sender thread"""
+        self._closing.clear()
+
+        if self._sender is None or not self._sender.is_alive():
+            self._sender = threading.Thread(
+                name=f'_sender_{self.name}',
+                target=self._send_messages,
+                daemon=True,
+            )
+            self._sender.start()
+
+        super().start()
+
+    def stop(self):
+        """Stop the node, once all the pending messages are sent"""
+        super().stop()
+
+        self._closing.set()
+
+        with self._pending_cond:
+            self._pending_cond.notify()
+
+        if self._sender is not None:
+            self._sender.join()
+
+        self._disconnect()
+
     def update(self, message: Message[BasePayload]):
-        """Receive a message, transmit a message"""
+        """Receive a message, queue it for transmission"""
         meta = dict(message.meta)
         to_send = Message[BasePayload](
             creator=message.creator,
@@ -53,27 +162,183 @@ class NotifierWebsocket(Node[BasePayload, None]):
         meta['session_id'] = self.pipe_id
         to_send.meta = meta
 
-        self._t = threading.Thread(
-            name='_post_transcript',
-            target=self._send_message,
-            args=(to_send,),
-            daemon=True,
+        entry = (
+            message.version,
+            next(self._arrivals),
+            time.monotonic(),
+            to_send.to_json(),
+            message,
         )
 
-        self._t.start()
+        with self._pending_cond:
+            heapq.heappush(self._pending, entry)
 
-        self._sent += 1
+            dropped = (
+                self._pop_oldest()
+                if len(self._pending) > self._replay_size
+                else None
+            )
 
-    def _send_message(self, message: Message[BasePayload]):
-        with connect(self._endpoint) as ws:
-            try:
-                message_json = message.to_json()
-                ws.send(message_json)
-            except Exception as e:
-                self.logger.warning(e)
+            if dropped is not None:
+                self._discarded += 1
+
+            self._pending_cond.notify()
+
+        if dropped is not None:
+            self._rec_telemetry(dropped[-1], 'drop')
 
     def destroy(self):
         """Destroy the node"""
-        if self._t:
-            self._t.join()
-        ...
+        self._closing.set()
+
+        with self._pending_cond:
+            self._pending_cond.notify()
+
+        if self._sender is not None:
+            self._sender.join()
+
+        self._disconnect()
+
+    def _next_batch(self) -> list[tuple]:
+        # wait for the messages to send, and collect them once they spent
+        # enough time in the reorder window
+        with self._pending_cond:
+            while True:
+                if not self._pending:
+                    if self._closing.is_set():
+                        return list()
+
+                    self._pending_cond.wait()
+
+                    continue
+
+                wait = (
+                    0
+                    if self._closing.is_set()
+                    else self._pending[0][2] + self._reorder - time.monotonic()
+                )
+
+                if wait > 0:
+                    self._pending_cond.wait(wait)
+
+                    continue
+
+                if not self._coalesce:
+                    return [heapq.heappop(self._pending)]
+
+                batch = [heapq.heappop(self._pending)]
+
+                while self._pending and (
+                    self._closing.is_set()
+                    or self._pending[0][2] + self._reorder <= time.monotonic()
+                ):
+                    batch.append(heapq.heappop(self._pending))
+
+                return batch
+
+    def _requeue(self, batch: list[tuple]):
+        with self._pending_cond:
+            for entry in batch:
+                heapq.heappush(self._pending, entry)
+
+            while len(self._pending) > self._replay_size:
+                dropped = self._pop_oldest()
+                self._discarded += 1
+                self._rec_telemetry(dropped[-1], 'drop')
+
+    def _pop_oldest(self) -> tuple:
+        # the heap is ordered by version, so the oldest arrival is looked up:
+        # this only happens on overflow, on at most replay_size entries
+        index = min(
+            range(len(self._pending)), key=lambda i: self._pending[i][1]
+        )
+        oldest = self._pending[index]
+        self._pending[index] = self._pending[-1]
+        self._pending.pop()
+        heapq.heapify(self._pending)
+
+        return oldest
+
+    def _send_messages(self):
+        delay = self._reconnect
+
+        while batch := self._next_batch():
+            if not self._connect():
+                self._requeue(batch)
+
+                # pending messages cannot be delivered once the node stops
+                if self._closing.wait(delay):
+                    self._drop_pending()
+
+                    return
+
+                delay = min(delay * 2, 30)
+
+                continue
+
+            delay = self._reconnect
+            ws = self._ws
+
+            frame = (
+                f'[{",".join(e[3] for e in batch)}]'
+                if self._coalesce
+                else batch[0][3]
+            )
+
+            try:
+                ws.send(frame)
+            except (WebSocketException, OSError) as e:
+                self.logger.warning(f'connection lost: {e}')
+                self._disconnect()
+                self._requeue(batch)
+
+                continue
+
+            with self._pending_cond:
+                self._sent += len(batch)
+
+            for entry in batch:
+                self._rec_telemetry(entry[-1], 'sent')
+
+    def _connect(self) -> bool:
+        endpoint = self._endpoint
+
+        if self._ws is not None:
+            if self._ws_endpoint == endpoint:
+                return True
+
+            # the endpoint was changed since the connection was open
+            self._disconnect()
+
+        try:
+            # the connection outlives this call, so the context manager is
+            # entered here, and exited when disconnecting
+            self._ws = connect(endpoint).__enter__()
+        except (WebSocketException, OSError, TimeoutError) as e:
+            self.logger.warning(f'cannot connect to {endpoint}: {e}')
+
+            return False
+
+        self._ws_endpoint = endpoint
+        self._connections += 1
+        self.logger.info(f'connected to {endpoint}')
+
+        return True
+
+    def _disconnect(self):
+        ws, self._ws = self._ws, None
+
+        if ws is not None:
+            ws.close()
+
+    def _drop_pending(self):
+        with self._pending_cond:
+            pending, self._pending = self._pending, list()
+
+            self._discarded += len(pending)
+
+        for entry in pending:
+            self._rec_telemetry(entry[-1], 'drop')
+
+        if pending:
+            self.logger.warning(f'{len(pending)} messages were not sent')
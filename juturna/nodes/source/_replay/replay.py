@@ -0,0 +1,105 @@
+"""
+Replay
+
+Stream the messages recorded in a message log, at their original pace, at a
+multiple of it, or as fast as possible.
+"""
+
+import pathlib
+import time
+
+from juturna.components import Message
+from juturna.components import Node
+from juturna.components._message_log import MessageLog
+from juturna.payloads import BasePayload
+from juturna.payloads import ControlPayload
+from juturna.payloads import ControlSignal
+
+
+class Replay(Node[BasePayload, BasePayload]):
+    """
+    Read a message log, and transmit the recorded messages with the same
+    timing they were recorded with, scaled by the configured speed.
+    """
+
+    def __init__(self, log_file: str, speed: float, loop: bool, **kwargs):
+        """
+        Parameters
+        ----------
+        log_file : str
+            The message log to replay. Relative paths are resolved against the
+            pipeline folder, where recorded links are written.
+        speed : float
+            Replay speed, as a multiple of the recording pace: ``1`` replays
+            the log in real time, ``2`` twice as fast. With ``0``, messages
+            are transmitted as fast as the pipeline accepts them.
+        loop : bool
+            Whether to restart from the beginning once the log is over.
+        kwargs : dict
+            Superclass arguments.
+
+        """
+        super().__init__(**kwargs)
+
+        self._log_file = log_file
+        self._speed = speed
+        self._loop = loop
+
+        self._log: MessageLog | None = None
+        self._position = 0
+        self._started_at: float | None = None
+        self._first_ts = 0.0
+
+    def warmup(self):  # noqa: D102
+        log_file = pathlib.Path(self._log_file)
+
+        # like link recordings, logs live in the pipeline folder, the parent
+        # of the node folder
+        if not log_file.is_absolute() and self.pipe_path is not None:
+            log_file = pathlib.Path(self.pipe_path).parent / log_file
+
+        self._log = MessageLog(log_file)
+
+        self.set_source(self._next_message, by=0, mode='post')
+
+        self.logger.info(f'log loaded, {len(self._log)} messages')
+        self.logger.info(f'duration: {self._log.duration}')
+
+    def _next_message(self) -> Message[BasePayload | ControlPayload]:
+        if self._position == len(self._log) and self._loop and len(self._log):
+            self._position = 0
+            self._started_at = None
+
+        if self._position == len(self._log):
+            self.logger.info('last message replayed, stopping')
+            return Message[ControlPayload](
+                creator=self.name,
+                payload=ControlPayload(signal=ControlSignal.STOP),
+            )
+
+        timestamp, recorded = self._log.read(self._position)
+        self._position += 1
+
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+            self._first_ts = timestamp
+
+        if self._speed > 0:
+            due = self._started_at + (timestamp - self._first_ts) / self._speed
+            self._stop_source_event.wait(max(due - time.monotonic(), 0))
+
+        message = Message(
+            creator=self.name,
+            version=recorded.version,
+            payload=recorded.payload,
+        )
+        message.meta = recorded.meta
+
+        return message
+
+    def update(self, message: Message[BasePayload]):  # noqa: D102
+        self.transmit(message)
+
+    def destroy(self):  # noqa: D102
+        if self._log is not None:
+            self._log.close()
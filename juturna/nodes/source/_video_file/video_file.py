@@ -17,12 +17,20 @@ import numpy as np
 from juturna.components import Node
 from juturna.components import Message
 from juturna.payloads import BytesPayload, ImagePayload
+from juturna.utils.mem_utils import FramePool
 
 
 class VideoFile(Node[BytesPayload, ImagePayload]):
     """Read video file and steam it locally"""
 
-    def __init__(self, video_path: str, width: int, height: int, **kwargs):
+    def __init__(
+        self,
+        video_path: str,
+        width: int,
+        height: int,
+        frame_slots: int = 0,
+        **kwargs,
+    ):
         """
         Parameters
         ----------
@@ -32,6 +40,9 @@ class VideoFile(Node[BytesPayload, ImagePayload]):
             Output width of the produced video frames.
         height : int
             Output height of the produced video frames.
+        frame_slots : int
+            Number of preallocated frame slots frames are read into. If 0,
+            every frame is read into a newly allocated buffer.
         kwargs : dict
             Superclass arguments.
 
@@ -47,6 +58,11 @@ class VideoFile(Node[BytesPayload, ImagePayload]):
 
         self._ffmpeg_launcher_path = None
         self._ffmpeg_proc = None
+        self._frame_pool = (
+            FramePool((height, width, 3), np.uint8, frame_slots)
+            if frame_slots > 0
+            else None
+        )
 
     def configure(self):
         """Configure the node"""
@@ -93,16 +109,7 @@ class VideoFile(Node[BytesPayload, ImagePayload]):
             bufsize=10**8,
         )
 
-        self.set_source(
-            lambda: Message[BytesPayload](
-                creator=self.name,
-                payload=BytesPayload(
-                    cnt=self._ffmpeg_proc.stdout.read(
-                        self._width * self._height * 3
-                    )
-                ),
-            )
-        )
+        self.set_source(self._read_frame)
 
         super().start()
 
@@ -127,6 +134,21 @@ class VideoFile(Node[BytesPayload, ImagePayload]):
         """Destroy the node"""
         self.stop()
 
+    def _read_frame(self) -> Message[BytesPayload]:
+        stdout = self._ffmpeg_proc.stdout
+        slot = self._frame_pool.acquire() if self._frame_pool else None
+
+        # with no free slot, fall back to a newly allocated frame
+        cnt = (
+            stdout.read(self._width * self._height * 3)
+            if slot is None
+            else slot.data[: stdout.readinto(slot.data)]
+        )
+
+        return Message[BytesPayload](
+            creator=self.name, payload=BytesPayload(cnt=cnt)
+        )
+
     def update(self, message: Message[BytesPayload]):
         """Receive a message, transmit a message"""
         try:
@@ -11,6 +11,7 @@ from juturna.components import Node
 from juturna.components import _resource_broker as rb
 
 from juturna.payloads import BytesPayload, ImagePayload
+from juturna.utils.mem_utils import FramePool
 
 
 class VideoRTP(Node[BytesPayload, ImagePayload]):
@@ -24,6 +25,7 @@ class VideoRTP(Node[BytesPayload, ImagePayload]):
         codec: str,
         width: int,
         height: int,
+        frame_slots: int = 0,
         **kwargs,
     ):
         """
@@ -42,6 +44,9 @@ class VideoRTP(Node[BytesPayload, ImagePayload]):
             Width of the received RTP video stream.
         height : int
             Height of the received RTP video stream.
+        frame_slots : int
+            Number of preallocated frame slots frames are read into. If 0,
+            every frame is read into a newly allocated buffer.
         kwargs : dict
             Superclass arguments.
 
@@ -60,6 +65,11 @@ class VideoRTP(Node[BytesPayload, ImagePayload]):
         self._sdp_file_path = None
         self._ffmpeg_launcher_path = None
         self._ffmpeg_proc = None
+        self._frame_pool = (
+            FramePool((height, width, 3), np.uint8, frame_slots)
+            if frame_slots > 0
+            else None
+        )
         self._sent = 0
 
     def configure(self):
@@ -81,16 +91,7 @@ class VideoRTP(Node[BytesPayload, ImagePayload]):
             bufsize=10**8,
         )
 
-        self.set_source(
-            lambda: Message[BytesPayload](
-                creator=self.name,
-                payload=BytesPayload(
-                    cnt=self._ffmpeg_proc.stdout.read(  # type: ignore
-                        self._width * self._height * 3
-                    )
-                ),
-            )
-        )
+        self.set_source(self._read_frame)
 
         super().start()
 
@@ -118,6 +119,21 @@ class VideoRTP(Node[BytesPayload, ImagePayload]):
         """Destroy the node"""
         self.stop()
 
+    def _read_frame(self) -> Message[BytesPayload]:
+        stdout = self._ffmpeg_proc.stdout  # type: ignore
+        slot = self._frame_pool.acquire() if self._frame_pool else None
+
+        # with no free slot, fall back to a newly allocated frame
+        cnt = (
+            stdout.read(self._width * self._height * 3)
+            if slot is None
+            else slot.data[: stdout.readinto(slot.data)]
+        )
+
+        return Message[BytesPayload](
+            creator=self.name, payload=BytesPayload(cnt=cnt)
+        )
+
     @property
     def configuration(self) -> dict:
         """Fetch node configuration"""
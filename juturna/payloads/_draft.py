@@ -9,6 +9,8 @@ from typing import Any
 
 from dataclasses import fields
 
+import numpy as np
+
 
 class Draft[T]:
     """
@@ -25,6 +27,8 @@ class Draft[T]:
             selected from this.
         copy_from : T
             A payload that can be used to fill initial values for the draft.
+            Values are not copied, so arrays are shared with the original
+            payload until :meth:`writable` is invoked on them.
 
         """
         object.__setattr__(self, '_payload_type', payload_type)
@@ -73,6 +77,32 @@ class Draft[T]:
     def __getattr__(self, key: str) -> Any:
         return self._draft[key]
 
+    def writable(self, key: str) -> np.ndarray:
+        """
+        Get an array field that can be modified in place. If the stored array
+        is read-only (for instance, because it belongs to a frozen payload),
+        it is copied and the copy replaces it in the draft, so that the copy
+        only happens once.
+
+        Parameters
+        ----------
+        key : str
+            The name of the array field.
+
+        Returns
+        -------
+        np.ndarray
+            A writable array.
+
+        """
+        array = self._draft[key]
+
+        if not array.flags.writeable:
+            array = array.copy()
+            self._draft[key] = array
+
+        return array
+
     def clear(self):
         """Clear all stored keys and values"""
         self._draft = dict()
@@ -5,7 +5,7 @@ import sys
 
 from typing import Self
 from typing import Any
-from dataclasses import field, dataclass
+from dataclasses import field, fields, dataclass, is_dataclass
 
 import numpy as np
 
@@ -22,6 +22,26 @@ class BasePayload:
         return json.JSONEncoder.default(obj)
 
 
+def _seal(obj: Any):
+    """
+    Mark as read-only all the arrays held by a payload, so that a payload can
+    be shared by all the consumers of a message without copying them. Nested
+    payloads, lists, tuples, and dictionaries are sealed recursively, while
+    messages (for instance, in batches) are sealed when they are frozen.
+    """
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _seal(value)
+    elif isinstance(obj, list | tuple):
+        for value in obj:
+            _seal(value)
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        for f in fields(obj):
+            _seal(getattr(obj, f.name))
+
+
 @dataclass(frozen=True)
 class ControlPayload(BasePayload):
     signal: ControlSignal = ControlSignal.STOP
@@ -85,7 +105,7 @@ class VideoPayload(BasePayload):
 
     def __post_init__(self):
         object.__setattr__(
-            self, 'size_bytes', sum([f.nbytes for f in self.video])
+            self, 'size_bytes', sum([f.size_bytes for f in self.video])
         )
 
     @staticmethod
@@ -127,6 +147,10 @@ class Batch(BasePayload):
         return [msg.to_dict() for msg in obj.messages]
 
 
+def _rebuild_object_payload(cls: type, items: dict) -> 'ObjectPayload':
+    return cls(**items)
+
+
 @dataclass(frozen=True)
 class ObjectPayload(dict, BasePayload):
     def __init__(self, **kwargs):
@@ -159,6 +183,10 @@ class ObjectPayload(dict, BasePayload):
 
         return cls(**kwargs)
 
+    def __reduce__(self) -> tuple:
+        # item assignment is disabled, so the default dict pickling fails
+        return (_rebuild_object_payload, (type(self), dict(self)))
+
     @staticmethod
     def from_dict(origin: dict):
         return ObjectPayload(**origin)
@@ -0,0 +1,303 @@
+"""
+Payload codecs
+
+Codecs reduce the size of the payloads exchanged with a remote service, at the
+cost of some CPU time on both sides of the call. Three kinds of codecs can be
+combined:
+
+- compressions (``gzip``, ``zstd``, ``lz4``), applied to a whole serialised
+  payload, and wrapped into a ``CompressedProtoPayload``, so that payloads are
+  transparently decompressed on the receiving side;
+- domain codecs, applied to the arrays of specific payload types: ``int16``
+  quantisation of floating point audio samples, and ``jpeg`` (lossy) or
+  ``png`` (lossless) encoding of 8 bits images;
+- object formats (``msgpack``, ``cbor``), that pack object payloads and
+  message metadata as binary documents rather than protobuf structs, which
+  are slower to build and parse, and turn all numbers into doubles.
+
+``zstd`` and ``lz4`` require the ``zstandard`` and ``lz4`` packages to be
+installed, ``msgpack`` and ``cbor`` the ``msgpack`` and ``cbor2`` packages,
+while images are encoded with ``av``.
+"""
+
+import datetime
+import decimal
+import fractions
+import gzip
+import logging
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+def _gzip():
+    return lambda data: gzip.compress(data, compresslevel=6), gzip.decompress
+
+
+def _zstd():
+    import zstandard
+
+    return lambda data: zstandard.compress(data, 3), zstandard.decompress
+
+
+def _lz4():
+    import lz4.frame
+
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+def _msgpack():
+    import msgpack
+
+    def _pack(obj) -> bytes:
+        return msgpack.packb(obj, default=_to_native, use_bin_type=True)
+
+    def _unpack(data: bytes):
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+    return _pack, _unpack
+
+
+def _cbor():
+    import cbor2
+
+    def _pack(obj) -> bytes:
+        return cbor2.dumps(
+            obj,
+            default=lambda encoder, value: encoder.encode(_to_native(value)),
+        )
+
+    return _pack, cbor2.loads
+
+
+_COMPRESSIONS = {'gzip': _gzip, 'zstd': _zstd, 'lz4': _lz4}
+_OBJECT_FORMATS = {'msgpack': _msgpack, 'cbor': _cbor}
+_AUDIO_CODECS = ('int16',)
+_IMAGE_CODECS = ('jpeg', 'png')
+
+# loaded compressions and object formats, as pairs of functions
+_LOADED: dict[str, tuple] = dict()
+
+logger = logging.getLogger('jt.remotizer.codecs')
+
+
+class Encoding(NamedTuple):
+    """Codecs used to encode the payloads sent to a remote service"""
+
+    # compression of whole payloads, if any
+    compression: str = ''
+    # payloads smaller than this (in bytes) are not compressed
+    threshold: int = 16384
+    # codec of floating point audio samples, if any
+    audio: str = ''
+    # codec of 8 bits images, if any
+    image: str = ''
+    # quality of jpeg images, from 1 to 100
+    quality: int = 90
+    # binary format of object payloads and metadata, if any
+    objects: str = ''
+
+    @classmethod
+    def from_dict(cls, encoding: dict | None) -> 'Encoding | None':
+        """Build an encoding from its dictionary form, as sent by peers"""
+        if not encoding:
+            return None
+
+        return cls(
+            compression=str(encoding.get('compression', '')),
+            threshold=int(
+                encoding.get('threshold', cls._field_defaults['threshold'])
+            ),
+            audio=str(encoding.get('audio', '')),
+            image=str(encoding.get('image', '')),
+            quality=int(
+                encoding.get('quality', cls._field_defaults['quality'])
+            ),
+            objects=str(encoding.get('objects', '')),
+        )
+
+    def validate(self):
+        """
+        Check that the codecs exist and can be loaded.
+
+        Raises
+        ------
+        ValueError
+            If any codec is unknown, or the quality is out of range.
+        ImportError
+            If the package required by the compression, or by the object
+            format, is not installed.
+
+        """
+        if self.compression:
+            compression(self.compression)
+
+        if self.objects:
+            object_format(self.objects)
+
+        if self.audio and self.audio not in _AUDIO_CODECS:
+            raise ValueError(f'unknown audio codec: {self.audio}')
+
+        if self.image and self.image not in _IMAGE_CODECS:
+            raise ValueError(f'unknown image codec: {self.image}')
+
+        if not 1 <= self.quality <= 100:
+            raise ValueError(f'invalid jpeg quality: {self.quality}')
+
+
+def compression(name: str) -> tuple:
+    """
+    The compress and decompress functions of a compression.
+
+    Parameters
+    ----------
+    name : str
+        One of ``gzip``, ``zstd`` or ``lz4``.
+
+    Returns
+    -------
+    tuple
+        The compress and decompress functions, from bytes to bytes.
+
+    """
+    return _load(_COMPRESSIONS, 'compression', name)
+
+
+def object_format(name: str) -> tuple:
+    """
+    The pack and unpack functions of an object format. Numpy scalars and
+    arrays are packed as numbers and lists, while integers and floating point
+    numbers keep their type.
+
+    Parameters
+    ----------
+    name : str
+        Either ``msgpack`` or ``cbor``.
+
+    Returns
+    -------
+    tuple
+        The pack function, from objects to bytes, and the unpack function,
+        from bytes to objects.
+
+    """
+    return _load(_OBJECT_FORMATS, 'object format', name)
+
+
+def _load(codecs: dict, kind: str, name: str) -> tuple:
+    if name not in _LOADED:
+        if name not in codecs:
+            raise ValueError(f'unknown {kind}: {name}')
+
+        _LOADED[name] = codecs[name]()
+
+    return _LOADED[name]
+
+
+def _to_native(value):
+    """Convert a value the object formats cannot pack to one they can"""
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+
+    if hasattr(value, '__dict__'):
+        return vars(value)
+
+    logger.warning(f'dropping non-serializable object: {type(value).__name__}')
+
+    return None
+
+
+def quantise_audio(samples: np.ndarray) -> np.ndarray:
+    """Quantise floating point samples, in [-1, 1], to 16 bits integers"""
+    scaled = np.multiply(samples, 32767, dtype=np.float32)
+
+    return np.clip(scaled, -32768, 32767, out=scaled).astype('<i2')
+
+
+def dequantise_audio(data, dtype: str) -> np.ndarray:
+    """Restore floating point samples from 16 bits integers"""
+    return np.multiply(
+        np.frombuffer(data, dtype='<i2'), 1 / 32767, dtype=np.dtype(dtype)
+    )
+
+
+# pixel formats of the encoders, and of the arrays, by image depth
+_PIXEL_FORMATS = {
+    'jpeg': {1: ('yuvj444p', 'gray'), 3: ('yuvj444p', 'rgb24')},
+    'png': {1: ('gray', 'gray'), 3: ('rgb24', 'rgb24'), 4: ('rgba', 'rgba')},
+}
+
+_AV_CODECS = {'jpeg': 'mjpeg', 'png': 'png'}
+
+
+def can_encode_image(codec: str, image: np.ndarray) -> bool:
+    """Whether an image can be encoded with a codec"""
+    depth = 1 if image.ndim == 2 else image.shape[-1]
+
+    return image.dtype == np.uint8 and depth in _PIXEL_FORMATS[codec]
+
+
+def encode_image(codec: str, image: np.ndarray, quality: int = 90) -> bytes:
+    """
+    Encode an 8 bits image. Channels are encoded as they are, so images with
+    channels in any order (such as BGR) are restored in the same order.
+
+    Parameters
+    ----------
+    codec : str
+        Either ``jpeg`` or ``png``.
+    image : np.ndarray
+        The image, with shape (height, width) or (height, width, depth).
+    quality : int
+        Quality of jpeg images, from 1 to 100.
+
+    Returns
+    -------
+    bytes
+        The encoded image.
+
+    """
+    import av
+
+    height, width = image.shape[:2]
+    depth = 1 if image.ndim == 2 else image.shape[-1]
+    encoder_format, array_format = _PIXEL_FORMATS[codec][depth]
+
+    context = av.CodecContext.create(_AV_CODECS[codec], 'w')
+    context.width, context.height = width, height
+    context.pix_fmt = encoder_format
+    context.time_base = fractions.Fraction(1, 1)
+
+    if codec == 'jpeg':
+        # quality 100 is quantiser 2 (the finest), quality 1 is quantiser 31
+        context.qmin = context.qmax = round(31 - (quality - 1) * 29 / 99)
+
+    array = image.reshape(height, width) if depth == 1 else image
+    frame = av.VideoFrame.from_ndarray(
+        np.ascontiguousarray(array), format=array_format
+    )
+
+    return b''.join(bytes(p) for p in context.encode(frame))
+
+
+def decode_image(codec: str, data: bytes, depth: int) -> np.ndarray:
+    """Decode an image encoded with ``encode_image``"""
+    import av
+
+    context = av.CodecContext.create(_AV_CODECS[codec], 'r')
+    frame = context.decode(av.Packet(data))[0]
+
+    return frame.to_ndarray(format=_PIXEL_FORMATS[codec][depth][1])
@@ -0,0 +1,262 @@
+"""
+Remote endpoints
+
+A warp node can spread its requests across several identical remote services.
+Every endpoint has its own channel, and the pool picks one for every request
+with a balancing policy:
+
+- ``round_robin``, endpoints in turn;
+- ``least_outstanding``, the endpoint with the fewest requests waiting for a
+  response;
+- ``consistent_hash``, the endpoint owning a key (such as a session id) on a
+  hash ring, so that messages with the same key reach the same endpoint, and
+  only the keys of an endpoint move when it leaves or joins the pool.
+
+Endpoints are health checked through the connectivity state of their channels,
+which gRPC keeps up to date by reconnecting in the background: endpoints whose
+channel is failing are skipped. Endpoints failing several requests in a row are
+ejected for a while (outlier ejection), even if their channel is connected.
+When no endpoint is available, requests are sent to unavailable ones rather
+than dropped.
+"""
+
+import bisect
+import hashlib
+import itertools
+import threading
+import time
+
+from collections.abc import Callable
+
+import grpc
+
+
+POLICIES = ('round_robin', 'least_outstanding', 'consistent_hash')
+
+# points of every endpoint on the hash ring
+_REPLICAS = 64
+
+_FAILING_STATES = (
+    grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+    grpc.ChannelConnectivity.SHUTDOWN,
+)
+
+
+class Endpoint:
+    """A remote service, with the state used to balance requests"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.channel: grpc.Channel | None = None
+        self.stub = None
+
+        # requests waiting for a response
+        self.outstanding = 0
+        # consecutive failed requests, and end of the current ejection
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.connectivity: grpc.ChannelConnectivity | None = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the channel of the endpoint is not failing"""
+        return self.connectivity not in _FAILING_STATES
+
+    def available(self, now: float) -> bool:
+        """Whether the endpoint is healthy, and not ejected"""
+        return self.healthy and self.ejected_until <= now
+
+    def _on_connectivity(self, state: grpc.ChannelConnectivity):
+        self.connectivity = state
+
+    def __repr__(self) -> str:
+        return f'Endpoint({self.address})'
+
+
+class EndpointPool:
+    """A pool of endpoints, balancing requests across them"""
+
+    def __init__(
+        self,
+        addresses: list[str],
+        policy: str = 'round_robin',
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+    ):
+        """
+        Parameters
+        ----------
+        addresses : list[str]
+            Addresses of the endpoints, as ``host:port``.
+        policy : str
+            Balancing policy, one of ``round_robin``, ``least_outstanding`` or
+            ``consistent_hash``.
+        max_failures : int
+            Number of consecutive failed requests after which an endpoint is
+            ejected.
+        ejection_time : float
+            Time an endpoint stays ejected, in seconds.
+
+        Raises
+        ------
+        ValueError
+            If there are no addresses, duplicated ones, or the policy or the
+            outlier ejection settings are invalid.
+
+        """
+        if not addresses:
+            raise ValueError('no endpoint addresses')
+
+        if len(set(addresses)) != len(addresses):
+            raise ValueError(f'duplicated endpoint addresses: {addresses}')
+
+        if policy not in POLICIES:
+            raise ValueError(f'unknown balancing policy: {policy}')
+
+        if max_failures < 1 or ejection_time < 0:
+            raise ValueError(
+                f'invalid outlier ejection: {max_failures} failures, '
+                f'{ejection_time} seconds'
+            )
+
+        self.endpoints = [Endpoint(address) for address in addresses]
+        self.policy = policy
+
+        self._max_failures = max_failures
+        self._ejection_time = ejection_time
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+        self._ring = sorted(
+            (_hash(f'{endpoint.address}#{replica}'), index)
+            for index, endpoint in enumerate(self.endpoints)
+            for replica in range(_REPLICAS)
+        )
+        self._ring_hashes = [point for point, _ in self._ring]
+
+    def open(self, channel: Callable, stub: Callable):
+        """
+        Open the channels of the endpoints, and watch their connectivity.
+
+        Parameters
+        ----------
+        channel : Callable
+            Function building the channel of an address.
+        stub : Callable
+            Function building the stub of a channel.
+
+        """
+        for endpoint in self.endpoints:
+            endpoint.channel = channel(endpoint.address)
+            endpoint.stub = stub(endpoint.channel)
+            endpoint.channel.subscribe(
+                endpoint._on_connectivity, try_to_connect=True
+            )
+
+    def close(self):
+        """Close the channels of the endpoints"""
+        for endpoint in self.endpoints:
+            if endpoint.channel is not None:
+                endpoint.channel.unsubscribe(endpoint._on_connectivity)
+                endpoint.channel.close()
+                endpoint.channel = None
+
+    def pick(self, key: str | None = None, exclude=()) -> Endpoint | None:
+        """
+        Pick the endpoint of a request, and count the request as outstanding
+        on it, until released.
+
+        Parameters
+        ----------
+        key : str, optional
+            Key of the request, for consistent hashing. Requests with no key
+            are balanced round robin.
+        exclude : Collection, optional
+            Endpoints not to pick, such as the ones a request already failed
+            on.
+
+        Returns
+        -------
+        Endpoint | None
+            The available endpoint picked by the policy. If no endpoint is
+            available, the one that will be available first. If all the
+            endpoints are excluded, None.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in exclude]
+
+            if not candidates:
+                return None
+
+            available = [e for e in candidates if e.available(now)]
+
+            if available:
+                endpoint = self._select(available, key)
+            else:
+                # better late than never: healthy endpoints first, then the
+                # endpoint whose ejection ends first
+                endpoint = min(
+                    candidates, key=lambda e: (not e.healthy, e.ejected_until)
+                )
+
+            endpoint.outstanding += 1
+
+            return endpoint
+
+    def release(self, endpoint: Endpoint, ok: bool):
+        """
+        Release a request picked on an endpoint, once answered or failed.
+
+        Parameters
+        ----------
+        endpoint : Endpoint
+            The endpoint of the request.
+        ok : bool
+            Whether the request succeeded. Failures in a row eject the
+            endpoint, while a success resets them.
+
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+
+            if ok:
+                endpoint.failures = 0
+
+                return
+
+            endpoint.failures += 1
+
+            if endpoint.failures >= self._max_failures:
+                endpoint.failures = 0
+                endpoint.ejected_until = time.monotonic() + self._ejection_time
+
+    def _select(self, available: list[Endpoint], key: str | None) -> Endpoint:
+        if self.policy == 'consistent_hash' and key is not None:
+            # first point of an available endpoint, clockwise from the key
+            start = bisect.bisect(self._ring_hashes, _hash(key))
+
+            for offset in range(len(self._ring)):
+                _, index = self._ring[(start + offset) % len(self._ring)]
+
+                if self.endpoints[index] in available:
+                    return self.endpoints[index]
+
+        turn = next(self._next)
+
+        if self.policy == 'least_outstanding':
+            # ties are broken in turn, not always on the first endpoint
+            return min(
+                available,
+                key=lambda e: (
+                    e.outstanding,
+                    (self.endpoints.index(e) - turn) % len(self.endpoints),
+                ),
+            )
+
+        return available[turn % len(available)]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
@@ -0,0 +1,177 @@
+"""
+Raw frames
+
+Protobuf bytes fields cost several copies of the arrays they carry: the array
+is copied into a bytes object, then into the payload, then serialised with the
+envelope, and the same happens, in reverse, on the receiving side. To avoid
+that, large arrays can travel next to the envelope, as raw frames, in framed
+variants of the messaging service methods.
+
+A framed request (or response) is laid out as follows, integers being little
+endian:
+
+- a magic string, ``JTRF``;
+- the number of frames, as an unsigned 32 bits integer;
+- the length of the serialised envelope, and the length of every frame, as
+  unsigned 64 bits integers;
+- the serialised envelope, followed by the frames, each of them starting at
+  an offset aligned to 64 bytes.
+
+When sending, the frames are copied once, when the request is assembled. When
+receiving, frames are handed out as views of the received buffer, so that
+arrays are built on top of it with no copy at all.
+
+Framed methods are not part of the protobuf service definition, as gRPC only
+sees their requests as opaque buffers: they are registered on a server with
+:func:`add_framed_methods`, and invoked through a :class:`FramedStub`.
+"""
+
+import struct
+
+import grpc
+
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+
+
+_MAGIC = b'JTRF'
+_COUNT = struct.Struct('<4sI')
+_ALIGNMENT = 64
+
+_SERVICE = 'juturna.proto.messaging.MessagingService'
+
+SEND_AND_RECEIVE = f'/{_SERVICE}/SendAndReceiveFramed'
+SEND_AND_RECEIVE_STREAM = f'/{_SERVICE}/SendAndReceiveStreamFramed'
+
+
+def _padding(offset: int) -> int:
+    return -offset % _ALIGNMENT
+
+
+def encode(request: tuple[ProtoEnvelope, list]) -> bytes:
+    """
+    Serialise an envelope and its raw frames.
+
+    Parameters
+    ----------
+    request : tuple[ProtoEnvelope, list]
+        The envelope, and the frames, as bytes-like objects.
+
+    Returns
+    -------
+    bytes
+        The framed request.
+
+    """
+    envelope, frames = request
+    parts = [
+        envelope.SerializeToString(),
+        *(memoryview(f).cast('B') for f in frames),
+    ]
+
+    header = _COUNT.pack(_MAGIC, len(frames))
+    header += struct.pack(f'<{len(parts)}Q', *map(len, parts))
+
+    chunks = [header]
+    offset = len(header)
+
+    for part in parts:
+        padding = bytes(_padding(offset))
+        chunks += (padding, part)
+        offset += len(padding) + len(part)
+
+    return b''.join(chunks)
+
+
+def decode(data: bytes) -> tuple[ProtoEnvelope, list[memoryview]]:
+    """
+    Parse a framed request.
+
+    Parameters
+    ----------
+    data : bytes
+        The framed request.
+
+    Returns
+    -------
+    tuple[ProtoEnvelope, list[memoryview]]
+        The envelope, and the frames, as read-only views of ``data``.
+
+    """
+    view = memoryview(data)
+    magic, count = _COUNT.unpack_from(view)
+
+    if magic != _MAGIC:
+        raise ValueError('invalid framed request')
+
+    lengths = struct.unpack_from(f'<{count + 1}Q', view, _COUNT.size)
+    offset = _COUNT.size + 8 * len(lengths)
+    parts = list()
+
+    for length in lengths:
+        offset += _padding(offset)
+
+        if offset + length > len(view):
+            raise ValueError('truncated framed request')
+
+        parts.append(view[offset : offset + length])
+        offset += length
+
+    envelope, *frames = parts
+
+    return ProtoEnvelope.FromString(envelope), frames
+
+
+class FramedStub:
+    """Client of the framed methods of the messaging service"""
+
+    def __init__(self, channel: grpc.Channel):
+        """
+        Parameters
+        ----------
+        channel : grpc.Channel
+            The channel to the remote service.
+
+        """
+        self.SendAndReceive = channel.unary_unary(
+            SEND_AND_RECEIVE,
+            request_serializer=encode,
+            response_deserializer=decode,
+        )
+        self.SendAndReceiveStream = channel.stream_stream(
+            SEND_AND_RECEIVE_STREAM,
+            request_serializer=encode,
+            response_deserializer=decode,
+        )
+
+
+def add_framed_methods(servicer, server: grpc.Server):
+    """
+    Register the framed methods of a messaging service on a server. Requests
+    reach the servicer as tuples of envelope and frames, and responses are
+    expected in the same form.
+
+    Parameters
+    ----------
+    servicer : MessagingServiceImpl
+        The servicer, implementing ``SendAndReceiveFramed`` and
+        ``SendAndReceiveStreamFramed``.
+    server : grpc.Server
+        The server.
+
+    """
+    handlers = {
+        'SendAndReceiveFramed': grpc.unary_unary_rpc_method_handler(
+            servicer.SendAndReceiveFramed,
+            request_deserializer=decode,
+            response_serializer=encode,
+        ),
+        'SendAndReceiveStreamFramed': grpc.stream_stream_rpc_method_handler(
+            servicer.SendAndReceiveStreamFramed,
+            request_deserializer=decode,
+            response_serializer=encode,
+        ),
+    }
+
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(_SERVICE, handlers),)
+    )
@@ -1,4 +1,5 @@
 from juturna.components import Message
+from juturna.remotizer._codecs import Encoding
 from concurrent import futures
 from typing import Any
 import time
@@ -14,6 +15,7 @@ class RequestContext:
         message_id: int,
         timeout: float,
         response_type: str = None,
+        encoding: Encoding | None = None,
     ):
         self.sender = sender
         self.envelope_id = envelope_id
@@ -21,6 +23,7 @@ class RequestContext:
         self.future = futures.Future()
         self.timeout = timeout
         self.response_type = response_type
+        self.encoding = encoding
         self.created_at = time.time()
 
     def is_valid_response(self, message: Message | None) -> bool:
@@ -7,6 +7,15 @@ This module provides helper functions to:
 - Deserialize `ProtoMessage` and `ProtoPayload` back into Python objects.
 - Create/deserialize `ProtoEnvelope` for wrapping messages in the wire protocol.
 
+Envelopes can be built in place from a `Message`, and large arrays can be
+collected as raw frames to be sent next to the envelope (see
+`juturna.remotizer._framing`) rather than copied into protobuf bytes fields.
+Payloads can also be encoded to save bandwidth, with the codecs of an
+`Encoding` (see `juturna.remotizer._codecs`): the receiving side decodes them
+transparently. This includes object payloads and metadata, that can be packed
+with a binary format (msgpack or CBOR) rather than converted to protobuf
+structs.
+
 These utilities are essential for the serialization layer of the Remotizer.
 """
 
@@ -21,6 +30,8 @@ from decimal import Decimal
 
 
 from juturna.components import Message
+from juturna.components import Span
+from juturna.components import Trace
 from juturna.payloads import (
     AudioPayload,
     ImagePayload,
@@ -30,32 +41,68 @@ from juturna.payloads import (
     Batch,
 )
 
+from juturna.remotizer import _codecs
+from juturna.remotizer._codecs import Encoding
 from juturna.remotizer.c_protos.payloads_pb2 import (
     ProtoMessage,
     ProtoEnvelope,
+    ProtoTrace,
     AudioProtoPayload,
     ImageProtoPayload,
     VideoProtoPayload,
     BytesProtoPayload,
     ObjectProtoPayload,
     BatchProto,
+    CompressedProtoPayload,
 )
+from google.protobuf import any_pb2
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
 
 logger = logging.getLogger('jt.remotizer.utils')
 
+# arrays smaller than this are always copied into the envelope
+RAW_FRAME_MIN_SIZE = 16384
+
+_TYPE_URL_PREFIX = 'type.googleapis.com/'
+
 # ============================================================================
 # PYTHON → PROTOBUF CONVERTERS
 # ============================================================================
 
 
-def _audio_to_proto(audio: AudioPayload) -> AudioProtoPayload:
+def _to_frame(array: np.ndarray, frames: list | None) -> int:
+    """
+    Append an array to the raw frames, if large enough, and return its 1-based
+    index (0 if the array is to be copied into the envelope)
+    """
+    if frames is None or array.nbytes < RAW_FRAME_MIN_SIZE:
+        return 0
+
+    frames.append(memoryview(np.ascontiguousarray(array)).cast('B'))
+
+    return len(frames)
+
+
+def _audio_to_proto(
+    audio: AudioPayload,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> AudioProtoPayload:
     """Convert Python AudioPayload to Protobuf AudioProtoPayload"""
     proto = AudioProtoPayload()
+    samples = audio.audio
+
+    if encoding is not None and encoding.audio and samples.dtype.kind == 'f':
+        proto.encoding = encoding.audio
+        samples = _codecs.quantise_audio(samples)
+
+    # Convert numpy array to bytes, unless sent as a raw frame
+    proto.frame = _to_frame(samples, frames)
+
+    if not proto.frame:
+        proto.audio_data = samples.tobytes()
 
-    # Convert numpy array to bytes
-    proto.audio_data = audio.audio.tobytes()
     proto.dtype = str(audio.audio.dtype)
     proto.shape.extend(audio.audio.shape)
 
@@ -68,12 +115,30 @@ def _audio_to_proto(audio: AudioPayload) -> AudioProtoPayload:
     return proto
 
 
-def _image_to_proto(image: ImagePayload) -> ImageProtoPayload:
+def _image_to_proto(
+    image: ImagePayload,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> ImageProtoPayload:
     """Convert Python ImagePayload to Protobuf ImageProtoPayload"""
     proto = ImageProtoPayload()
 
-    # Convert numpy array to bytes
-    proto.image_data = image.image.tobytes()
+    if (
+        encoding is not None
+        and encoding.image
+        and _codecs.can_encode_image(encoding.image, image.image)
+    ):
+        proto.encoding = encoding.image
+        proto.image_data = _codecs.encode_image(
+            encoding.image, image.image, encoding.quality
+        )
+    else:
+        # Convert numpy array to bytes, unless sent as a raw frame
+        proto.frame = _to_frame(image.image, frames)
+
+        if not proto.frame:
+            proto.image_data = image.image.tobytes()
+
     proto.dtype = str(image.image.dtype)
 
     # Copy metadata
@@ -86,14 +151,17 @@ def _image_to_proto(image: ImagePayload) -> ImageProtoPayload:
     return proto
 
 
-def _video_to_proto(video: VideoPayload) -> VideoProtoPayload:
+def _video_to_proto(
+    video: VideoPayload,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> VideoProtoPayload:
     """Convert Python VideoPayload to Protobuf VideoProtoPayload"""
     proto = VideoProtoPayload()
 
     # Convert each frame
     for frame in video.video:
-        frame_proto = _image_to_proto(frame)
-        proto.frames.append(frame_proto)
+        proto.frames.add().CopyFrom(_image_to_proto(frame, frames, encoding))
 
     # Copy metadata
     proto.frames_per_second = video.frames_per_second
@@ -104,7 +172,11 @@ def _video_to_proto(video: VideoPayload) -> VideoProtoPayload:
     return proto
 
 
-def _bytes_to_proto(bytes_payload: BytesPayload) -> BytesProtoPayload:
+def _bytes_to_proto(
+    bytes_payload: BytesPayload,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> BytesProtoPayload:
     """Convert Python BytesPayload to Protobuf BytesProtoPayload"""
     proto = BytesProtoPayload()
     proto.cnt = bytes_payload.cnt
@@ -112,10 +184,21 @@ def _bytes_to_proto(bytes_payload: BytesPayload) -> BytesProtoPayload:
     return proto
 
 
-def _object_to_proto(obj: ObjectPayload) -> ObjectProtoPayload:
+def _object_to_proto(
+    obj: ObjectPayload,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> ObjectProtoPayload:
     """Convert Python ObjectPayload (dict) to Protobuf ObjectProtoPayload"""
     proto = ObjectProtoPayload()
 
+    if encoding is not None and encoding.objects:
+        pack, _ = _codecs.object_format(encoding.objects)
+        proto.packed = pack(dict(obj))
+        proto.format = encoding.objects
+
+        return proto
+
     # Convert dict to Struct
     struct = Struct()
     struct.update(dict(obj))
@@ -124,12 +207,62 @@ def _object_to_proto(obj: ObjectPayload) -> ObjectProtoPayload:
     return proto
 
 
-def _batch_to_proto(batch: Batch) -> BatchProto:
+def _batch_to_proto(
+    batch: Batch,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> BatchProto:
     """Convert Python Batch to Protobuf BatchProto"""
     proto = BatchProto()
     for message in batch.messages:
-        message_proto = message_to_proto(message)
-        proto.messages.append(message_proto)
+        message_to_proto(message, proto.messages.add(), frames, encoding)
+    return proto
+
+
+def _pack_payload(target: any_pb2.Any, payload: Any, encoding: Encoding | None):
+    """Pack a payload, compressed if the encoding requires it"""
+    if encoding is None or not encoding.compression:
+        target.Pack(payload)
+
+        return
+
+    data = payload.SerializeToString()
+
+    if len(data) >= encoding.threshold:
+        compress, _ = _codecs.compression(encoding.compression)
+        compressed = compress(data)
+
+        # already compressed data (such as jpeg images) is sent as it is
+        if len(compressed) < len(data):
+            target.Pack(
+                CompressedProtoPayload(
+                    compression=encoding.compression,
+                    compressed_data=compressed,
+                    original_size=len(data),
+                    compressed_size=len(compressed),
+                    original_type=payload.DESCRIPTOR.full_name,
+                )
+            )
+
+            return
+
+    target.type_url = _TYPE_URL_PREFIX + payload.DESCRIPTOR.full_name
+    target.value = data
+
+
+def _trace_to_proto(trace: Trace) -> ProtoTrace:
+    """Convert Python Trace to Protobuf ProtoTrace"""
+    proto = ProtoTrace()
+    proto.root_id = trace.root_id
+
+    for span in trace.spans:
+        proto.spans.add(
+            node=span.node,
+            enqueue_ts=span.enqueue_ts,
+            start_ts=span.start_ts,
+            end_ts=span.end_ts,
+        )
+
     return proto
 
 
@@ -143,7 +276,12 @@ PROTOBUF_PAYLOAD_TYPE_MAP = {
 }
 
 
-def message_to_proto(message: Message) -> ProtoMessage:
+def message_to_proto(
+    message: Message,
+    proto: ProtoMessage | None = None,
+    frames: list | None = None,
+    encoding: Encoding | None = None,
+) -> ProtoMessage:
     """
     Convert Python Message to Protobuf ProtoMessage
 
@@ -159,6 +297,18 @@ def message_to_proto(message: Message) -> ProtoMessage:
     ----------
     message : Message
         Python Message object with any payload type
+    proto : ProtoMessage, optional
+        Protobuf message to fill, such as the message of an envelope, so that
+        it is built in place rather than copied. If not provided, a new
+        message is created.
+    frames : list, optional
+        If provided, arrays of audio and image payloads that are larger than
+        ``RAW_FRAME_MIN_SIZE`` are not copied into the message, but appended
+        to this list as byte views, to be sent as raw frames.
+    encoding : Encoding, optional
+        Codecs to encode the payload with. As compressing arrays copies them
+        anyway, raw frames are not used when a compression is set. If the
+        encoding has an object format, metadata is packed with it as well.
 
     Returns
     -------
@@ -166,22 +316,42 @@ def message_to_proto(message: Message) -> ProtoMessage:
         Protobuf message ready for serialization
 
     """
-    proto = ProtoMessage()
+    if proto is None:
+        proto = ProtoMessage()
+
+    if encoding is not None and encoding.compression:
+        frames = None
 
     proto.created_at = message.created_at
     proto.creator = message.creator
     proto.version = message.version
     proto.id = message.id
 
-    proto.meta.update(sanitize_struct_for_proto(message.meta))
+    if encoding is not None and encoding.objects:
+        if message.meta:
+            pack, _ = _codecs.object_format(encoding.objects)
+            proto.packed_meta = pack(dict(message.meta))
+            proto.meta_format = encoding.objects
+    else:
+        proto.meta.update(sanitize_struct_for_proto(message.meta))
+
     proto.timers.update(dict(message.timers))
 
+    if message.trace is not None:
+        proto.trace.CopyFrom(_trace_to_proto(message.trace))
+
     if message.payload is not None:
         protocol_converter = PROTOBUF_PAYLOAD_TYPE_MAP.get(
             type(message.payload)
         )
-        payload_proto = protocol_converter(message.payload)
-        proto.payload.Pack(payload_proto)
+        payload_proto = protocol_converter(message.payload, frames, encoding)
+
+        # messages in a batch are compressed one by one
+        _pack_payload(
+            proto.payload,
+            payload_proto,
+            None if isinstance(message.payload, Batch) else encoding,
+        )
     return proto
 
 
@@ -190,7 +360,9 @@ def message_to_proto(message: Message) -> ProtoMessage:
 # ============================================================================
 
 
-def deserialize_message(message: ProtoMessage) -> Message:
+def deserialize_message(
+    message: ProtoMessage, frames: list | None = None
+) -> Message:
     """
     Convert Protobuf ProtoMessage to Python Message
 
@@ -206,6 +378,9 @@ def deserialize_message(message: ProtoMessage) -> Message:
     ----------
     message : ProtoMessage
         Protobuf message to convert
+    frames : list, optional
+        Raw frames received with the message. Arrays sent as raw frames are
+        built on top of them, with no copy.
 
     Returns
     -------
@@ -219,46 +394,102 @@ def deserialize_message(message: ProtoMessage) -> Message:
         payload=None,  # to be filled below
     )
     message_obj.created_at = message.created_at
-    message_obj.meta.update(dict(message.meta))
+
+    if message.meta_format:
+        _, unpack = _codecs.object_format(message.meta_format)
+        message_obj.meta.update(unpack(message.packed_meta))
+    else:
+        message_obj.meta.update(dict(message.meta))
+
     message_obj.timers.update(dict(message.timers))
     message_obj.id = message.id
 
-    if message.payload.Is(AudioProtoPayload.DESCRIPTOR):
+    if message.HasField('trace'):
+        message_obj.trace = _deserialize_trace(message.trace)
+
+    payload = message.payload
+
+    # compressed payloads wrap any of the other payload types
+    if payload.Is(CompressedProtoPayload.DESCRIPTOR):
+        payload = _decompress_payload(payload)
+
+    if payload.Is(AudioProtoPayload.DESCRIPTOR):
         audio = AudioProtoPayload()
-        message.payload.Unpack(audio)
-        message_obj.payload = _deserialize_audio_payload(audio)
+        payload.Unpack(audio)
+        message_obj.payload = _deserialize_audio_payload(audio, frames)
 
-    elif message.payload.Is(ImageProtoPayload.DESCRIPTOR):
+    elif payload.Is(ImageProtoPayload.DESCRIPTOR):
         image = ImageProtoPayload()
-        message.payload.Unpack(image)
-        message_obj.payload = _deserialize_image_payload(image)
+        payload.Unpack(image)
+        message_obj.payload = _deserialize_image_payload(image, frames)
 
-    elif message.payload.Is(VideoProtoPayload.DESCRIPTOR):
+    elif payload.Is(VideoProtoPayload.DESCRIPTOR):
         video = VideoProtoPayload()
-        message.payload.Unpack(video)
-        message_obj.payload = _deserialize_video_payload(video)
+        payload.Unpack(video)
+        message_obj.payload = _deserialize_video_payload(video, frames)
 
-    elif message.payload.Is(BytesProtoPayload.DESCRIPTOR):
+    elif payload.Is(BytesProtoPayload.DESCRIPTOR):
         bytes_payload = BytesProtoPayload()
-        message.payload.Unpack(bytes_payload)
+        payload.Unpack(bytes_payload)
         message_obj.payload = _deserialize_bytes_payload(bytes_payload)
 
-    elif message.payload.Is(ObjectProtoPayload.DESCRIPTOR):
+    elif payload.Is(ObjectProtoPayload.DESCRIPTOR):
         obj = ObjectProtoPayload()
-        message.payload.Unpack(obj)
+        payload.Unpack(obj)
         message_obj.payload = _deserialize_object_payload(obj)
 
-    elif message.payload.Is(BatchProto.DESCRIPTOR):
+    elif payload.Is(BatchProto.DESCRIPTOR):
         batch = BatchProto()
-        message.payload.Unpack(batch)
-        message_obj.payload = _deserialize_batch_payload(batch)
+        payload.Unpack(batch)
+        message_obj.payload = _deserialize_batch_payload(batch, frames)
 
     return message_obj
 
 
-def _deserialize_audio_payload(payload: AudioProtoPayload) -> AudioPayload:
+def _decompress_payload(payload: any_pb2.Any) -> any_pb2.Any:
+    """Restore the original payload of a CompressedProtoPayload"""
+    compressed = CompressedProtoPayload()
+    payload.Unpack(compressed)
+
+    _, decompress = _codecs.compression(compressed.compression)
+    data = decompress(compressed.compressed_data)
+
+    if len(data) != compressed.original_size:
+        raise ValueError(
+            f'corrupted {compressed.compression} payload: {len(data)} bytes, '
+            f'expected {compressed.original_size}'
+        )
+
+    return any_pb2.Any(
+        type_url=_TYPE_URL_PREFIX + compressed.original_type, value=data
+    )
+
+
+def _from_frame(data: bytes, frame: int, frames: list | None):
+    """The buffer of an array, either inline or sent as a raw frame"""
+    if not frame:
+        return data
+
+    if frames is None or frame > len(frames):
+        raise ValueError(f'missing raw frame {frame}')
+
+    return frames[frame - 1]
+
+
+def _deserialize_audio_payload(
+    payload: AudioProtoPayload, frames: list | None = None
+) -> AudioPayload:
     """Deserialize AudioProtoPayload to AudioPayload with numpy array"""
-    audio_data = np.frombuffer(payload.audio_data, dtype=payload.dtype)
+    data = _from_frame(payload.audio_data, payload.frame, frames)
+
+    match payload.encoding:
+        case '':
+            audio_data = np.frombuffer(data, dtype=payload.dtype)
+        case 'int16':
+            audio_data = _codecs.dequantise_audio(data, payload.dtype)
+        case _:
+            raise ValueError(f'unknown audio encoding: {payload.encoding}')
+
     audio_data = audio_data.reshape(payload.shape)
 
     return AudioPayload(
@@ -270,9 +501,21 @@ def _deserialize_audio_payload(payload: AudioProtoPayload) -> AudioPayload:
     )
 
 
-def _deserialize_image_payload(payload: ImageProtoPayload) -> ImagePayload:
+def _deserialize_image_payload(
+    payload: ImageProtoPayload, frames: list | None = None
+) -> ImagePayload:
     """Deserialize ImageProtoPayload to ImagePayload with numpy array"""
-    image_data = np.frombuffer(payload.image_data, dtype=payload.dtype)
+    data = _from_frame(payload.image_data, payload.frame, frames)
+
+    match payload.encoding:
+        case '':
+            image_data = np.frombuffer(data, dtype=payload.dtype)
+        case 'jpeg' | 'png':
+            image_data = _codecs.decode_image(
+                payload.encoding, data, payload.depth
+            )
+        case _:
+            raise ValueError(f'unknown image encoding: {payload.encoding}')
 
     if payload.depth == 1:
         shape = (payload.height, payload.width)
@@ -291,12 +534,16 @@ def _deserialize_image_payload(payload: ImageProtoPayload) -> ImagePayload:
     )
 
 
-def _deserialize_video_payload(payload: VideoProtoPayload) -> VideoPayload:
+def _deserialize_video_payload(
+    payload: VideoProtoPayload, frames: list | None = None
+) -> VideoPayload:
     """Deserialize VideoProtoPayload to VideoPayload with numpy arrays list"""
-    frames = [_deserialize_image_payload(frame) for frame in payload.frames]
+    images = [
+        _deserialize_image_payload(frame, frames) for frame in payload.frames
+    ]
 
     return VideoPayload(
-        video=frames,
+        video=images,
         frames_per_second=payload.frames_per_second,
         codec=payload.codec,
         start=payload.start,
@@ -313,20 +560,40 @@ def _deserialize_bytes_payload(payload: BytesProtoPayload) -> BytesPayload:
 
 def _deserialize_object_payload(payload: ObjectProtoPayload) -> ObjectPayload:
     """Deserialize ObjectProtoPayload (Struct) to ObjectPayload (dict)"""
+    if payload.format:
+        _, unpack = _codecs.object_format(payload.format)
+
+        return ObjectPayload.from_dict(unpack(payload.packed))
+
     proto_dict = MessageToDict(payload)
     return ObjectPayload.from_dict(proto_dict.get('data', {}))
 
 
-def _deserialize_batch_payload(payload: BatchProto) -> Batch:
-    """Deserialize BatchProto to Batch"""
-    return Batch(messages=tuple(payload.messages))
+def _deserialize_batch_payload(
+    payload: BatchProto, frames: list | None = None
+) -> Batch:
+    """Deserialize BatchProto to Batch, with its messages and their traces"""
+    return Batch(
+        messages=tuple(deserialize_message(m, frames) for m in payload.messages)
+    )
+
+
+def _deserialize_trace(trace: ProtoTrace) -> Trace:
+    """Deserialize ProtoTrace to Trace"""
+    return Trace(
+        root_id=trace.root_id,
+        spans=tuple(
+            Span(s.node, s.enqueue_ts, s.start_ts, s.end_ts)
+            for s in trace.spans
+        ),
+    )
 
 
 # ! FIXME: probably we should change the request_type and response_type
 # ! signature: they are meaningful only in the context of requests,
 # ! for responses they should be empty, or with a different naming
 def create_envelope(
-    message: ProtoMessage,
+    message: ProtoMessage | Message,
     configuration: dict[str, Any],
     metadata: dict[str, Any],
     creator: str,
@@ -336,8 +603,16 @@ def create_envelope(
     response_to: str = None,
     response_type: str = '',
     request_type: str = '',
+    frames: list | None = None,
+    encoding: Encoding | None = None,
 ) -> ProtoEnvelope:
-    """Create envelope around message"""
+    """
+    Create envelope around message. A protobuf message is copied into the
+    envelope, while a Message is converted in place, directly into the
+    envelope message; in this case, if a list of frames is provided, large
+    arrays are appended to it rather than copied, and payloads are encoded
+    with the given encoding, if any (see `message_to_proto`).
+    """
     assert message is not None
 
     envelope = ProtoEnvelope()
@@ -351,14 +626,20 @@ def create_envelope(
     envelope.response_to = response_to if response_to is not None else ''
     envelope.configuration.update(configuration)
     envelope.metadata.update(metadata)
-    envelope.message.CopyFrom(message)
+
+    if isinstance(message, Message):
+        message_to_proto(message, envelope.message, frames, encoding)
+    else:
+        envelope.message.CopyFrom(message)
 
     return envelope
 
 
-def deserialize_envelope(envelope: ProtoEnvelope) -> dict[str, Any]:
+def deserialize_envelope(
+    envelope: ProtoEnvelope, frames: list | None = None
+) -> dict[str, Any]:
     """Deserialize ProtoEnvelope to dictionary"""
-    message = deserialize_message(envelope.message)
+    message = deserialize_message(envelope.message, frames)
     envelope_dict = {
         'id': envelope.id,
         'sender': envelope.sender,
@@ -435,7 +716,7 @@ def sanitize_struct_for_proto(meta: dict[str, Any]) -> dict[str, Any]:
     if not meta:
         return {}
 
-    logger.info(f'sanitizing metadata with {len(meta)} entries')
+    logger.debug('sanitizing metadata with %d entries', len(meta))
     sanitized = to_primitive(dict(meta))
 
     if sanitized is None:
@@ -444,6 +725,7 @@ def sanitize_struct_for_proto(meta: dict[str, Any]) -> dict[str, Any]:
         )
         return {}
 
-    logger.info(f'sanitized metadata: {sanitized}')
+    # formatted lazily, as metadata can be large
+    logger.debug('sanitized metadata: %s', sanitized)
 
     return sanitized
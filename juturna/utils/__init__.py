@@ -2,6 +2,7 @@
 from juturna.utils import net_utils
 from juturna.utils import proc_utils
 from juturna.utils import jt_utils
+from juturna.utils import mem_utils
 
 
-__all__ = ['net_utils', 'proc_utils', 'jt_utils']
+__all__ = ['net_utils', 'proc_utils', 'jt_utils', 'mem_utils']
@@ -0,0 +1,8 @@
+# noqa: D104
+from juturna.utils.mem_utils._frame_pool import FramePool
+from juturna.utils.mem_utils._frame_pool import FrameSlot
+from juturna.utils.mem_utils._frame_pool import FrameHandle
+from juturna.utils.mem_utils._frame_pool import attach_frame
+
+
+__all__ = ['FramePool', 'FrameSlot', 'FrameHandle', 'attach_frame']
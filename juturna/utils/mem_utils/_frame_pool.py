@@ -0,0 +1,247 @@
+"""
+Frame pool
+
+A frame pool is a ring of preallocated, fixed-size frame slots, that source
+nodes can write frames into instead of allocating a new array for every frame.
+Slots are handed out as numpy arrays, and a slot goes back to the pool as soon
+as the last reference to its array (or to any view derived from it) is gone,
+so a frame is released when its last consumer drops it, with no explicit
+bookkeeping in nodes.
+
+Pools can optionally be backed by ``multiprocessing.shared_memory``, so that
+other processes can map a frame from its handle with :func:`attach_frame`.
+"""
+
+import collections
+import contextlib
+import sys
+import threading
+import weakref
+
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+
+# shared memory blocks attached by this process, closed when it exits
+_ATTACHED: dict[str, shared_memory.SharedMemory] = dict()
+_ATTACHED_LOCK = threading.Lock()
+
+
+class FrameHandle(NamedTuple):
+    """Reference to a frame slot in a shared memory pool"""
+
+    name: str
+    index: int
+    shape: tuple
+    dtype: str
+
+
+class _SlotBuffer:
+    """
+    Buffer of a single acquisition of a slot. As numpy arrays reference the
+    buffer object they were built from (rather than other arrays), all the
+    views derived from a slot array keep this object alive, so that it can be
+    used to track when the slot is no longer referenced.
+    """
+
+    __slots__ = ('_view', '__weakref__')
+
+    def __init__(self, view: memoryview):
+        self._view = view
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self._view)
+
+
+class FrameSlot:
+    __slots__ = ('index', 'array', 'handle')
+
+    def __init__(self, index: int, array: np.ndarray, handle: FrameHandle):
+        self.index = index
+        self.array = array
+        self.handle = handle
+
+    @property
+    def data(self) -> memoryview:
+        """Writable flat byte view of the slot, to be used with readinto"""
+        return memoryview(self.array).cast('B')
+
+
+class FramePool:
+    def __init__(
+        self,
+        shape: tuple,
+        dtype: np.dtype | str = np.uint8,
+        slots: int = 8,
+        shared: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        shape : tuple
+            Shape of every frame in the pool.
+        dtype : np.dtype | str
+            Data type of the frames.
+        slots : int
+            Number of frames in the pool.
+        shared : bool
+            If true, frames are allocated in a shared memory block, that other
+            processes can attach to.
+
+        """
+        if slots < 1:
+            raise ValueError(f'invalid number of slots: {slots}')
+
+        self._shape = tuple(shape)
+        self._dtype = np.dtype(dtype)
+        self._slots = slots
+        self._frame_size = int(np.prod(self._shape)) * self._dtype.itemsize
+
+        size = slots * self._frame_size
+
+        self._shm = (
+            shared_memory.SharedMemory(create=True, size=max(size, 1))
+            if shared
+            else None
+        )
+
+        self._buffer = (
+            self._shm.buf if self._shm else memoryview(bytearray(size))
+        )
+
+        self._free = collections.deque(range(slots))
+        self._free_cond = threading.Condition()
+        self._misses = 0
+
+    @property
+    def name(self) -> str | None:
+        """Name of the shared memory block, if any"""
+        return self._shm.name if self._shm else None
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @property
+    def available(self) -> int:
+        """Number of free slots"""
+        return len(self._free)
+
+    @property
+    def misses(self) -> int:
+        """Number of acquisitions that found no free slot"""
+        return self._misses
+
+    def acquire(self, timeout: float | None = 0) -> FrameSlot | None:
+        """
+        Acquire a free slot. The slot is released back to the pool once its
+        array, and all the views derived from it, are garbage collected.
+
+        Parameters
+        ----------
+        timeout : float | None
+            How long to wait for a slot to become free. If 0 (default), the
+            method does not block, and if None, it blocks until a slot is free.
+
+        Returns
+        -------
+        FrameSlot | None
+            The acquired slot, or None if no slot was free within the timeout,
+            in which case the caller should fall back to a regular allocation.
+
+        """
+        if self._buffer is None:
+            raise ValueError('frame pool is closed')
+
+        with self._free_cond:
+            if not self._free_cond.wait_for(lambda: self._free, timeout):
+                self._misses += 1
+
+                return None
+
+            index = self._free.popleft()
+
+        offset = index * self._frame_size
+        slot_buffer = _SlotBuffer(
+            self._buffer[offset : offset + self._frame_size]
+        )
+        weakref.finalize(slot_buffer, self._release, index)
+
+        array = np.frombuffer(slot_buffer, self._dtype).reshape(self._shape)
+
+        return FrameSlot(
+            index,
+            array,
+            FrameHandle(self.name, index, self._shape, self._dtype.str),
+        )
+
+    def _release(self, index: int):
+        if self._buffer is None:
+            return
+
+        with self._free_cond:
+            self._free.append(index)
+            self._free_cond.notify()
+
+    def close(self):
+        """
+        Release the pool memory. If the pool is shared, the shared memory block
+        is unlinked, and will be freed once all processes detach from it.
+        """
+        if self._shm is None:
+            return
+
+        with contextlib.suppress(FileNotFoundError):
+            self._shm.unlink()
+
+        self._buffer = None
+        self._free.clear()
+
+        # frames still referenced by consumers keep the mapping alive, so the
+        # block is only closed if none is
+        try:
+            self._shm.close()
+        except BufferError:
+            return
+
+        self._shm = None
+
+
+def attach_frame(handle: FrameHandle) -> np.ndarray:
+    """
+    Map a frame of a shared memory pool, from another process. The returned
+    array is read-only. Shared memory blocks stay attached until the process
+    exits, so that frames can be mapped repeatedly at no cost.
+
+    Parameters
+    ----------
+    handle : FrameHandle
+        The handle of the frame slot.
+
+    Returns
+    -------
+    np.ndarray
+        The frame.
+
+    """
+    with _ATTACHED_LOCK:
+        if (shm := _ATTACHED.get(handle.name)) is None:
+            # the creating process owns the block, do not track it here
+            kwargs = {'track': False} if sys.version_info >= (3, 13) else {}
+            shm = shared_memory.SharedMemory(name=handle.name, **kwargs)
+            _ATTACHED[handle.name] = shm
+
+    dtype = np.dtype(handle.dtype)
+    frame_size = int(np.prod(handle.shape)) * dtype.itemsize
+
+    frame = np.ndarray(
+        handle.shape,
+        dtype=dtype,
+        buffer=shm.buf,
+        offset=handle.index * frame_size,
+    )
+    frame.flags.writeable = False
+
+    return frame
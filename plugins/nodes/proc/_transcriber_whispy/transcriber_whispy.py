@@ -67,9 +67,8 @@ class TranscriberWhispy(Node[AudioPayload, ObjectPayload]):
         super().__init__(**kwargs)
 
         self._only_local = only_local
-        self._model = WhisperModel(
-            model_name, local_files_only=self._only_local, device=device
-        )
+        self._device = device
+        self._model = None
         self._model_name = model_name
         self._buffer_size = buffer_size
 
@@ -82,10 +81,21 @@ class TranscriberWhispy(Node[AudioPayload, ObjectPayload]):
         self.logger.info(f'init sources: {self.origins}')
 
         logging.getLogger('faster_whisper').setLevel(logging.ERROR)
-        self.logger.info(f'trx created, model id {id(self._model)}')
 
     def warmup(self):
         """Warmup the node"""
+        # replicas of the node can transcribe concurrently with the same model
+        self._model = self.shared(
+            'model',
+            lambda: WhisperModel(
+                self._model_name,
+                local_files_only=self._only_local,
+                device=self._device,
+            ),
+        )
+
+        self.logger.info(f'trx created, model id {id(self._model)}')
+
         self._data = {
             k: collections.deque(maxlen=self._buffer_size) for k in self.origins
         }
@@ -88,6 +88,8 @@ class VadSilero(Node[AudioPayload, AudioPayload]):
         waveform = np.concatenate(waveform)
         version = self._data[-1].version
 
+        # the draft shares the fields of the received payload, and only its
+        # audio is replaced; meta is copied shallowly, as values are shared
         to_send = Message[AudioPayload](
             creator=self.name,
             version=message.version,
@@ -106,6 +108,11 @@ class VadSilero(Node[AudioPayload, AudioPayload]):
                 waveform
             )
 
+        # the waveform reaches all the destinations through meta, and is
+        # sealed as payload arrays are (torch warns on read-only arrays, so
+        # only once the inference is done)
+        waveform.flags.writeable = False
+
         to_send.payload.audio = clip
         to_send.meta['duration_after_vad'] = duration_after_vad
 
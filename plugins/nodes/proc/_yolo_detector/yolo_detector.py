@@ -9,12 +9,15 @@ It can plot the annotations on the image or just pass them as metadata.
 For more info about the models, see here: https://github.com/ultralytics/ultralytics
 """
 
+import time
+
 from ultralytics import YOLO
 import numpy as np
 
 from juturna.components import Message
 from juturna.components import Node
 
+from juturna.payloads import Draft
 from juturna.payloads._payloads import ImagePayload
 
 
@@ -86,65 +89,84 @@ class YoloDetector(Node[ImagePayload, ImagePayload]):
 
     def update(self, message: Message[ImagePayload]):
         """Process an incoming message"""
+        self.update_batch([message])
+
+    def update_batch(self, messages: list[Message[ImagePayload]]):
+        """Process a group of incoming messages with a single inference"""
         assert self._model is not None
 
-        image = message.payload.image
-        image_format = message.payload.pixel_format
-        meta = dict(message.meta)
+        to_send = [
+            Message[ImagePayload](
+                creator=self.name,
+                version=message.version,
+                payload=(),
+                timers_from=message,
+            )
+            for message in messages
+        ]
+
+        normalized_images = list()
+
+        for message, out in zip(messages, to_send, strict=True):
+            with out.timeit(self.name + '_image_preprocessing_numpy'):
+                normalized_images.append(self._normalize(message.payload))
+
+        inference_start = time.time()
+        results = self._model.predict(
+            normalized_images,
+            verbose=False,
+            classes=self._classes,
+            conf=self._confidence,
+            half=self._half,
+            imgsz=max(max(image.shape[:2]) for image in normalized_images),
+        )
+        inference_time = time.time() - inference_start
 
-        normalized_image = None
-        results = None
+        for message, out, result in zip(
+            messages, to_send, results, strict=True
+        ):
+            out.timer(self.name + '_inference', inference_time)
 
-        to_send = Message[ImagePayload](
-            creator=self.name,
-            version=message.version,
-            payload=(),
-            timers_from=message,
-        )
+            # the received frame is shared, not copied, unless annotations
+            # are plotted on a new image
+            draft = Draft(ImagePayload, copy_from=message.payload)
 
-        with to_send.timeit(self.name + '_image_preprocessing_numpy'):
-            if image.shape[2] == 4 and image_format == 'RGB':
-                normalized_image = image[
-                    :, :, 2::-1
-                ]  # remove alpha and convert RGB→BGR
-            elif image.shape[2] == 4:
-                normalized_image = image[:, :, :3]  # remove alpha only
-            elif image_format == 'RGB':
-                normalized_image = image[:, :, ::-1]  # only RGB→BGR
-            else:
-                normalized_image = image  # no modification
-
-        with to_send.timeit(self.name + '_inference'):
-            results = self._model.predict(
-                normalized_image,
-                verbose=False,
-                classes=self._classes,
-                conf=self._confidence,
-                half=self._half,
-                imgsz=max(image.shape[0], image.shape[1]),
-            )
+            if self._plot:
+                with out.timeit(self.name + '_postprocessing'):
+                    annotated = result.plot()
 
-        annotated = None
-        pixel_format = None
+                draft.image = annotated
+                draft.width = annotated.shape[1]
+                draft.height = annotated.shape[0]
+                draft.depth = annotated.shape[2]
+                draft.pixel_format = 'BGR'
 
-        with to_send.timeit(self.name + '_postprocessing'):
-            annotated = results[0].plot() if self._plot else image
-            pixel_format = 'BGR' if self._plot else image_format
+            out.payload = draft
 
-        to_send.payload = ImagePayload(
-            image=annotated,
-            width=annotated.shape[1],
-            height=annotated.shape[0],
-            depth=annotated.shape[2],
-            pixel_format=pixel_format,
-            timestamp=message.payload.timestamp,
-        )
+            # meta values are shared with the other destinations of the
+            # received message, so the annotations are extended in a copy
+            meta = dict(message.meta)
+            meta['annotations'] = {
+                **meta.get('annotations', {}),
+                self.name: result,
+            }
+
+            out.meta = meta
+
+            self.transmit(out, source=message)
+
+    @staticmethod
+    def _normalize(payload: ImagePayload) -> np.ndarray:
+        image = payload.image
+        image_format = payload.pixel_format
 
-        if 'annotations' not in meta:
-            meta['annotations'] = {}
+        if image.shape[2] == 4 and image_format == 'RGB':
+            return image[:, :, 2::-1]  # remove alpha and convert RGB→BGR
 
-        meta['annotations'][self.name] = results[0]
+        if image.shape[2] == 4:
+            return image[:, :, :3]  # remove alpha only
 
-        to_send.meta = meta
+        if image_format == 'RGB':
+            return image[:, :, ::-1]  # only RGB→BGR
 
-        self.transmit(to_send)
+        return image  # no modification
@@ -7,23 +7,44 @@ NotifierMongo
 Transmit messages to a Mongo endpoint.
 """
 
+import os
+import pathlib
+import threading
+
 import pymongo
 
+from bson import json_util
+from pymongo.errors import BulkWriteError, PyMongoError
+
 from juturna.components import Message
 from juturna.components import Node
 
 from juturna.payloads import ObjectPayload
 
 
+# mongo error code for documents that were already inserted
+_DUPLICATE_KEY = 11000
+
+# spilled documents written back after every successful write
+_REPLAY_SIZE = 1000
+
+
 class NotifierMongo(Node[ObjectPayload, None]):
     """Node implementation class"""
 
+    # client class, that tests can replace with a stand-in (e.g. mongomock)
+    _client_cls = pymongo.MongoClient
+
     def __init__(
         self,
         endpoint: str,
         database: str,
         collection: str,
         timeout: int,
+        bulk_size: int = 1,
+        flush_ms: int = 1000,
+        max_pending: int = 10000,
+        spill_file: str = '',
         **kwargs,
     ):
         """
@@ -37,6 +58,21 @@ class NotifierMongo(Node[ObjectPayload, None]):
             The destination collection.
         timeout : int
             The timeout before dropping a message transmission.
+        bulk_size : int
+            Number of documents written at once. If greater than 1, documents
+            are buffered and written by a background flusher.
+        flush_ms : int
+            Maximum time a document is buffered before being written, in
+            milliseconds.
+        max_pending : int
+            Maximum number of buffered documents. When reached, the node waits
+            for the flusher to write them, so that its inbound queue applies
+            its overflow policy.
+        spill_file : str
+            File where documents are appended when mongo cannot be reached,
+            to be written once it is back. Relative paths are resolved against
+            the node folder in the pipeline. If empty, those documents are
+            lost.
         kwargs : dict
             Superclass arguments.
 
@@ -47,29 +83,225 @@ class NotifierMongo(Node[ObjectPayload, None]):
         self._database = database
         self._collection = collection
         self._timeout = timeout
+        self._bulk_size = bulk_size
+        self._flush_wait = flush_ms / 1000
+        self._max_pending = max(max_pending, bulk_size)
+        self._spill_file = pathlib.Path(spill_file) if spill_file else None
+
+        # bytes of the spill file already written back
+        self._spill_offset = 0
 
         self._client: pymongo.MongoClient | None = None
         self._db: pymongo.database.Database | None = None
 
+        self._pending: list[tuple[dict, Message]] = list()
+        self._pending_cond = threading.Condition()
+        self._flusher: threading.Thread | None = None
+        self._closing = threading.Event()
+
+    @property
+    def bulk(self) -> bool:
+        """Whether documents are written in bulk, by the flusher"""
+        return self._bulk_size > 1
+
     def warmup(self):
         """Warmup the node"""
-        self._client = pymongo.MongoClient(self._endpoint)
+        self._client = self._client_cls(self._endpoint)
         self._db = self._client[self._database]
         self._cl = self._db[self._collection]
 
+        # like the other pipeline files, the spill file lives in the pipeline
+        if (
+            self._spill_file is not None
+            and not self._spill_file.is_absolute()
+            and self.pipe_path is not None
+        ):
+            self._spill_file = pathlib.Path(self.pipe_path, self._spill_file)
+
         self.logger.info(f'[{self.name}] set to endpoint {self._endpoint}')
 
+    def start(self):
+        """Start the node, and its flusher in bulk mode"""
+        self._closing.clear()
+
+        if self.bulk and (
+            self._flusher is None or not self._flusher.is_alive()
+        ):
+            self._flusher = threading.Thread(
+                name=f'_flusher_{self.name}',
+                target=self._flush_documents,
+                daemon=True,
+            )
+            self._flusher.start()
+
+        super().start()
+
+    def stop(self):
+        """Stop the node, once all the buffered documents are written"""
+        super().stop()
+        self._stop_flusher()
+
     def update(self, message: Message[ObjectPayload]):
         """Receive a message, transmit a message"""
-        message = message.to_dict()
-        message['session_id'] = self.pipe_id
+        document = message.to_dict()
+        document['session_id'] = self.pipe_id
+
+        if not self.bulk:
+            self._write([(document, message)])
 
-        with pymongo.timeout(self._timeout):
-            _ = self._cl.insert_one(message)
+            return
 
-            self.logger.info('message sent')
+        with self._pending_cond:
+            # memory stays bounded while mongo is slow or unreachable
+            self._pending_cond.wait_for(
+                lambda: (
+                    len(self._pending) < self._max_pending
+                    or self._closing.is_set()
+                )
+            )
+            self._pending.append((document, message))
+
+            # the first document starts the flush time, a full bulk ends it
+            if len(self._pending) in (1, self._bulk_size):
+                self._pending_cond.notify_all()
 
     def destroy(self):
-        """Close the connection with mongo"""
+        """Write the buffered documents, and close the connection with mongo"""
+        self._stop_flusher()
+
         if self._client:
             self._client.close()
+
+    def _stop_flusher(self):
+        self._closing.set()
+
+        with self._pending_cond:
+            self._pending_cond.notify_all()
+
+        if self._flusher is not None:
+            self._flusher.join()
+
+    def _flush_documents(self):
+        while True:
+            with self._pending_cond:
+                self._pending_cond.wait_for(
+                    lambda: self._pending or self._closing.is_set()
+                )
+
+                # a partial bulk waits for the flush time to elapse
+                self._pending_cond.wait_for(
+                    lambda: (
+                        len(self._pending) >= self._bulk_size
+                        or self._closing.is_set()
+                    ),
+                    timeout=self._flush_wait,
+                )
+
+                pending = self._pending[: self._bulk_size]
+                self._pending = self._pending[self._bulk_size :]
+                done = self._closing.is_set() and not self._pending
+
+                # there is room for the documents the node waits to buffer
+                self._pending_cond.notify_all()
+
+            if pending:
+                self._write(pending)
+
+            if done:
+                return
+
+    def _write(self, pending: list[tuple[dict, Message]]):
+        documents = [document for document, _ in pending]
+
+        try:
+            with pymongo.timeout(self._timeout):
+                rejected = self._insert(documents)
+        except PyMongoError as e:
+            self.logger.warning(f'cannot write {len(documents)} documents: {e}')
+            self._spill(documents)
+
+            for _, message in pending:
+                self._rec_telemetry(message, 'failed')
+
+            return
+
+        self.logger.info(f'{len(documents) - len(rejected)} documents sent')
+
+        for index, (_, message) in enumerate(pending):
+            self._rec_telemetry(
+                message, 'failed' if index in rejected else 'sent'
+            )
+
+        # mongo is reachable again, spilled documents can be written back
+        self._unspill()
+
+    def _insert(self, documents: list[dict]) -> set[int]:
+        """Write documents, and return the indexes of those rejected"""
+        try:
+            self._cl.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # replayed documents may already be there, other errors are
+            # specific to single documents, and would fail again
+            rejected = {
+                error['index']
+                for error in e.details.get('writeErrors', list())
+                if error.get('code') != _DUPLICATE_KEY
+            }
+
+            if rejected:
+                self.logger.warning(f'{len(rejected)} documents rejected')
+
+            return rejected
+
+        return set()
+
+    def _spill(self, documents: list[dict]):
+        if self._spill_file is None:
+            return
+
+        # documents keep the ids assigned on the first attempt, so that
+        # those already written are not duplicated on replay
+        with open(self._spill_file, 'a') as f:
+            for document in documents:
+                f.write(json_util.dumps(document) + '\n')
+
+        self.logger.info(f'{len(documents)} documents spilled')
+
+    def _unspill(self):
+        # a bounded number of documents is read from the last replayed offset
+        # and written back at every call, with its own timeout, so that a
+        # large spill file does not delay writes
+        if self._spill_file is None or not self._spill_file.exists():
+            return
+
+        with open(self._spill_file, 'rb') as f:
+            f.seek(self._spill_offset)
+            documents = list()
+
+            while len(documents) < _REPLAY_SIZE and (line := f.readline()):
+                if line.strip():
+                    documents.append(json_util.loads(line.decode()))
+
+            offset = f.tell()
+            exhausted = offset >= os.fstat(f.fileno()).st_size
+
+        if documents:
+            try:
+                with pymongo.timeout(self._timeout):
+                    rejected = self._insert(documents)
+            except PyMongoError as e:
+                self.logger.warning(f'cannot write spilled documents: {e}')
+
+                return
+
+            self.logger.info(
+                f'{len(documents) - len(rejected)} spilled documents sent'
+            )
+
+        # documents are only spilled from this thread, so a file read to the
+        # end holds nothing left to write back
+        if exhausted:
+            self._spill_file.unlink()
+            self._spill_offset = 0
+        else:
+            self._spill_offset = offset
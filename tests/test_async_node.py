@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import juturna as jt
+
+from juturna.components import AsyncNode, Message, Node
+from juturna.components._inbound_queue import InboundQueue
+from juturna.payloads import BytesPayload, ControlPayload, ControlSignal
+
+
+class _Waiter(AsyncNode):
+    def __init__(self, delay: float, **kwargs):
+        super().__init__(**kwargs)
+
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def update(self, message):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        await asyncio.sleep(self._delay)
+
+        self.in_flight -= 1
+        await self.transmit(Message(creator=self.name, version=message.version))
+
+
+class _Sink(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.messages = list()
+
+    def update(self, message):
+        self.messages.append(message)
+
+
+def _stop(node: Node):
+    node.put(Message(creator='test', payload=ControlPayload(ControlSignal.STOP)))
+    node.join()
+
+
+def _run(waiter: AsyncNode, count: int) -> tuple:
+    sink = _Sink(node_name='sink', pipe_name='test')
+    waiter.add_destination('sink', sink)
+    sink.start()
+    waiter.start()
+
+    sent = [
+        Message(creator='src', version=v, payload=BytesPayload())
+        for v in range(count)
+    ]
+
+    start = time.perf_counter()
+
+    for message in sent:
+        waiter.put(message)
+
+    _stop(waiter)
+    elapsed = time.perf_counter() - start
+    _stop(sink)
+
+    return sent, sink.messages, elapsed
+
+
+def test_async_node_concurrent_updates():
+    waiter = _Waiter(0.05, concurrency=100, node_name='w', pipe_name='test')
+
+    sent, received, elapsed = _run(waiter, 200)
+
+    assert len(received) == 200
+    assert waiter.max_in_flight == 100
+    assert elapsed < 2
+    assert sorted(m._data_source_id for m in received) == sorted(
+        m.id for m in sent
+    )
+
+
+def test_async_node_full_threaded_destination(wait_for_condition):
+    waiter = _Waiter(0, concurrency=10, node_name='w', pipe_name='test')
+    sink = _Sink(node_name='sink', pipe_name='test')
+    sink._queue = InboundQueue(maxsize=2)
+    waiter.add_destination('sink', sink)
+    waiter.start()
+
+    for v in range(10):
+        waiter.put(Message(creator='src', version=v, payload=BytesPayload()))
+
+    # the sink is not running: deliveries wait for room in its queue without
+    # blocking the event loop of the waiter
+    assert wait_for_condition(sink._queue.full, timeout=5)
+    assert waiter.event_loop.submit(asyncio.sleep(0, 'alive')).result(1)
+
+    sink.start()
+    _stop(waiter)
+    _stop(sink)
+
+    assert sorted(m.version for m in sink.messages) == list(range(10))
+
+
+def test_async_node_serial_by_default():
+    waiter = _Waiter(0.001, node_name='w', pipe_name='test')
+
+    _, received, _ = _run(waiter, 50)
+
+    assert waiter.max_in_flight == 1
+    assert [m.version for m in received] == list(range(50))
+    assert waiter.status == 'component_stopped'
+
+
+def test_async_pipeline_shares_loop(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'async_pipeline',
+            'id': 'async_1',
+            'folder': f'{p}/async_pipeline',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {}
+                },
+                {
+                    'name': 'proc_1',
+                    'type': 'proc',
+                    'mark': 'async_delay',
+                    'configuration': {'delay': 0.01}
+                },
+                {
+                    'name': 'proc_2',
+                    'type': 'proc',
+                    'mark': 'async_delay',
+                    'configuration': {'delay': 0.01}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'proc_1'},
+                {'from': 'proc_1', 'to': 'proc_2'},
+                {'from': 'proc_2', 'to': 'sink_1'}
+            ]
+        }
+    })
+    pipeline.warmup()
+
+    proc_1, proc_2 = pipeline._nodes['proc_1'], pipeline._nodes['proc_2']
+
+    assert proc_1.event_loop is proc_2.event_loop
+
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    pipeline.stop()
+
+    assert [m.version for m in sink.messages] == [0, 1, 2, 3]
+    assert all(m.creator == 'proc_2' for m in sink.messages)
+
+    pipeline.destroy()
+
+    assert not proc_1.event_loop.running
@@ -0,0 +1,37 @@
+import copy
+
+from juturna.cli.commands import _bench_tools
+
+
+def test_bench_sweep():
+    report = _bench_tools.sweep(
+        ['chain', 'fanout'], ['bytes', 'audio'], [1024], messages=50
+    )
+
+    assert len(report['results']) == 4
+
+    for result in report['results']:
+        fan = 4 if result['topology'] == 'fanout' else 1
+
+        assert result['delivered'] == 50 * fan
+        assert result['throughput'] > 0
+        assert result['latency_ms']['p50'] <= result['latency_ms']['p99']
+        assert result['rss_mib'] > 0
+
+
+def test_bench_fanin_synchroniser():
+    result = _bench_tools.run('fanin', 'object', 1024, messages=50)
+
+    assert 0 < result['delivered'] <= 50
+
+
+def test_bench_compare():
+    report = _bench_tools.sweep(['chain'], ['bytes'], [1024], messages=20)
+    baseline = copy.deepcopy(report)
+
+    assert _bench_tools.compare(report, baseline) == []
+
+    baseline['results'][0]['throughput'] *= 2
+    regressions = _bench_tools.compare(report, baseline)
+
+    assert [r['metric'] for r in regressions] == ['throughput']
@@ -0,0 +1,124 @@
+from juturna.components import Buffer, Message, Node
+from juturna.components._synchronisers import _SYNCHRONISERS
+from juturna.components._synchronisers import Passthrough, Synchroniser
+from juturna.payloads import Batch, BytesPayload, ControlPayload, ControlSignal
+
+
+def _msg(version, creator='src'):
+    return Message(creator=creator, version=version, payload=BytesPayload())
+
+
+def test_passthrough_releases_every_message():
+    buffer = Buffer('test', Passthrough())
+
+    for i in range(10):
+        buffer.put(_msg(i, f'src_{i % 4}'))
+
+    released = [buffer.get(block=False).version for _ in range(10)]
+
+    assert released == list(range(10))
+    assert buffer.empty()
+    assert all(len(data) == 0 for data in buffer._data.values())
+
+
+def test_incremental_synchroniser_batches():
+    class Pairs(Synchroniser):
+        def arrived(self, origin, sources):
+            if len(sources) < 2 or not all(sources.values()):
+                return tuple()
+
+            return (tuple(sources[src].popleft() for src in sorted(sources)),)
+
+    buffer = Buffer('test', Pairs())
+
+    buffer.put(_msg(0, 'a'))
+    buffer.put(_msg(1, 'a'))
+    assert buffer.empty()
+
+    buffer.put(_msg(2, 'b'))
+    batch = buffer.get(block=False)
+
+    assert isinstance(batch.payload, Batch)
+    assert batch.creator == 'test_sync'
+    assert [m.version for m in batch.payload.messages] == [0, 2]
+    assert [m.version for m in buffer._data['a']] == [1]
+
+
+def test_legacy_synchroniser_marks():
+    def every_third(sources):
+        if len(sources['src']) < 3:
+            return dict()
+
+        return {'src': [0, 2]}
+
+    buffer = Buffer('test', every_third)
+
+    for i in range(3):
+        buffer.put(_msg(i))
+
+    batch = buffer.get(block=False)
+
+    # legacy marks are consumed in reverse order
+    assert [m.version for m in batch.payload.messages] == [2, 0]
+    assert [m.version for m in buffer._data['src']] == [1]
+
+
+def test_flush_resets_synchroniser():
+    class Counting(Synchroniser):
+        def __init__(self):
+            self.resets = 0
+
+        def arrived(self, origin, sources):
+            return tuple()
+
+        def reset(self):
+            self.resets += 1
+
+    sync = Counting()
+    buffer = Buffer('test', sync)
+    buffer.put(_msg(0))
+    buffer.flush()
+
+    assert buffer._data == dict()
+    assert sync.resets == 1
+
+
+def test_node_synchroniser_is_per_node():
+    a = Node(node_name='a', pipe_name='test_pipe')
+    b = Node(node_name='b', pipe_name='test_pipe')
+
+    assert isinstance(a.synchroniser, _SYNCHRONISERS['passthrough'])
+    assert a.synchroniser is not b.synchroniser
+
+    sync = Passthrough()
+    a.synchroniser = sync
+
+    assert a._buffer.synchroniser is sync
+
+
+def test_get_many_groups_until_control():
+    buffer = Buffer('test', Passthrough())
+
+    for i in range(3):
+        buffer.put(_msg(i))
+
+    buffer.put(Message(creator='src', payload=ControlPayload(ControlSignal.STOP)))
+    buffer.put(_msg(3))
+
+    group = buffer.get_many(max_size=8, max_wait=0.01)
+
+    assert [m.version for m in group] == [0, 1, 2]
+    assert not buffer.empty()
+    assert isinstance(buffer.get_many(8)[0].payload, ControlPayload)
+    assert [m.version for m in buffer.get_many(8, block=False)] == [3]
+    assert buffer.empty()
+
+
+def test_get_many_max_size():
+    buffer = Buffer('test', Passthrough())
+
+    for i in range(5):
+        buffer.put(_msg(i))
+
+    assert len(buffer.get_many(max_size=2)) == 2
+    assert len(buffer.get_many(max_size=8, block=False)) == 3
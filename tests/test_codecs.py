@@ -0,0 +1,196 @@
+import numpy as np
+import pytest
+
+from juturna.components import Message
+from juturna.payloads import AudioPayload
+from juturna.payloads import Batch
+from juturna.payloads import ImagePayload
+from juturna.payloads import ObjectPayload
+from juturna.remotizer._codecs import Encoding
+from juturna.remotizer.c_protos.payloads_pb2 import ProtoEnvelope
+from juturna.remotizer.utils import create_envelope
+from juturna.remotizer.utils import deserialize_message
+
+
+def _audio():
+    t = np.arange(16000) / 16000
+    samples = 0.5 * np.sin(2 * np.pi * 440 * t)
+
+    return samples.astype(np.float32).reshape(-1, 1)
+
+
+def _image(depth=3):
+    x = np.linspace(0, 255, 160)
+    y = np.linspace(0, 255, 120)
+    image = (np.add.outer(y, x) / 2).astype(np.uint8)
+
+    if depth == 1:
+        return image
+
+    return np.stack([image, image[::-1], 255 - image][:depth], axis=-1)
+
+
+def _round_trip(payload, encoding):
+    message = Message(creator='test', version=1, payload=payload)
+    envelope = create_envelope(
+        message, {}, {}, 'test', id='e', encoding=encoding
+    )
+    data = envelope.SerializeToString()
+    out = deserialize_message(ProtoEnvelope.FromString(data).message)
+
+    return out.payload, len(data)
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd', 'lz4'])
+def test_codecs_compression(compression):
+    if compression != 'gzip':
+        pytest.importorskip('zstandard' if compression == 'zstd' else 'lz4')
+
+    encoding = Encoding(compression=compression)
+    audio = _audio()
+
+    payload, size = _round_trip(
+        AudioPayload(audio=audio, sampling_rate=16000, channels=1), encoding
+    )
+
+    assert np.array_equal(payload.audio, audio)
+    assert size < audio.nbytes / 2
+
+    text = 'juturna ' * 4000
+    payload, size = _round_trip(ObjectPayload(text=text), encoding)
+
+    assert payload.text == text
+    assert size < len(text) / 10
+
+    # small payloads are not compressed
+    payload, _ = _round_trip(ObjectPayload(text='small'), encoding)
+
+    assert payload.text == 'small'
+
+
+def test_codecs_audio_int16():
+    audio = _audio()
+    payload, size = _round_trip(
+        AudioPayload(audio=audio, sampling_rate=16000, channels=1),
+        Encoding(audio='int16'),
+    )
+
+    assert payload.audio.dtype == np.float32
+    assert payload.audio.shape == audio.shape
+    assert np.abs(payload.audio - audio).max() < 1e-4
+    assert size < audio.nbytes * 0.6
+
+
+@pytest.mark.parametrize(
+    'codec, depth', [('jpeg', 1), ('jpeg', 3), ('png', 1), ('png', 4)]
+)
+def test_codecs_image(codec, depth):
+    image = _image(depth) if depth < 4 else np.dstack([_image(), _image(1)])
+    payload, size = _round_trip(
+        ImagePayload(image=image, width=160, height=120, depth=depth),
+        Encoding(image=codec),
+    )
+
+    assert payload.image.shape == image.shape
+    assert size < image.nbytes / 2
+
+    error = np.abs(payload.image.astype(int) - image).mean()
+
+    assert error == 0 if codec == 'png' else error < 4
+
+
+def test_codecs_batch_and_fallback():
+    image = _image().astype(np.float32)
+    audio = _audio()
+    batch = Batch(
+        messages=(
+            Message(
+                creator='a',
+                payload=ImagePayload(image=image, width=160, height=120),
+            ),
+            Message(
+                creator='b',
+                payload=AudioPayload(
+                    audio=audio, sampling_rate=16000, channels=1
+                ),
+            ),
+        )
+    )
+
+    payload, _ = _round_trip(
+        batch, Encoding(compression='gzip', audio='int16', image='jpeg')
+    )
+    first, second = payload.messages
+
+    # floating point images cannot be encoded as jpeg, and are sent as they are
+    assert np.array_equal(first.payload.image, image)
+    assert np.abs(second.payload.audio - audio).max() < 1e-4
+
+
+def test_codecs_validation():
+    with pytest.raises(ValueError):
+        Encoding(compression='rar').validate()
+
+    with pytest.raises(ValueError):
+        Encoding(image='gif').validate()
+
+    with pytest.raises(ValueError):
+        Encoding(image='jpeg', quality=0).validate()
+
+    encoding = Encoding(compression='gzip', audio='int16', quality=50)
+
+    assert Encoding.from_dict(encoding._asdict()) == encoding
+    assert Encoding.from_dict({}) is None
+
+
+@pytest.mark.parametrize('objects', ['msgpack', 'cbor'])
+def test_codecs_object_formats(objects):
+    pytest.importorskip('msgpack' if objects == 'msgpack' else 'cbor2')
+
+    payload = ObjectPayload(
+        count=3,
+        score=0.5,
+        words=[{'word': 'ciao', 'start': np.float32(0.25), 'id': np.int64(7)}],
+        vector=np.arange(3),
+        flags={'final': True, 'speaker': None},
+    )
+    message = Message(creator='test', version=1, payload=payload)
+    message.meta.update({'chunk': 12, 'offset': np.float64(3.5)})
+
+    envelope = create_envelope(
+        message, {}, {}, 'test', id='e', encoding=Encoding(objects=objects)
+    )
+    data = envelope.SerializeToString()
+    out = deserialize_message(ProtoEnvelope.FromString(data).message)
+
+    assert envelope.message.payload.type_url.endswith('ObjectProtoPayload')
+    assert not envelope.message.meta
+    assert isinstance(out.payload, ObjectPayload)
+    assert out.payload == {
+        'count': 3,
+        'score': 0.5,
+        'words': [{'word': 'ciao', 'start': 0.25, 'id': 7}],
+        'vector': [0, 1, 2],
+        'flags': {'final': True, 'speaker': None},
+    }
+    assert type(out.payload.count) is int
+    assert type(out.payload.words[0]['id']) is int
+    assert out.meta == {'chunk': 12, 'offset': 3.5}
+    assert type(out.meta['chunk']) is int
+
+    # structs turn integers into floating point numbers
+    message = Message(creator='test', payload=ObjectPayload(count=3))
+    out = deserialize_message(
+        create_envelope(message, {}, {}, 'test', id='e').message
+    )
+
+    assert type(out.payload.count) is float
+
+
+def test_codecs_object_formats_validation():
+    with pytest.raises(ValueError):
+        Encoding(objects='pickle').validate()
+
+    encoding = Encoding(objects='msgpack')
+
+    assert Encoding.from_dict(encoding._asdict()) == encoding
@@ -0,0 +1,110 @@
+import time
+
+import grpc
+import pytest
+
+from juturna.remotizer._endpoints import EndpointPool
+
+
+ADDRESSES = ['a:1', 'b:1', 'c:1']
+
+
+def _addresses(pool, picks, key=None):
+    addresses = list()
+
+    for _ in range(picks):
+        endpoint = pool.pick(key)
+        pool.release(endpoint, ok=True)
+        addresses.append(endpoint.address)
+
+    return addresses
+
+
+def test_endpoints_round_robin():
+    pool = EndpointPool(ADDRESSES)
+
+    assert _addresses(pool, 6) == ADDRESSES * 2
+
+
+def test_endpoints_least_outstanding():
+    pool = EndpointPool(ADDRESSES, policy='least_outstanding')
+    a, b, c = pool.endpoints
+
+    a.outstanding, b.outstanding = 2, 2
+
+    assert pool.pick() is c
+    assert pool.pick() is c
+    assert c.outstanding == 2
+
+    # ties are broken in turn
+    assert set(_addresses(pool, 3)) == set(ADDRESSES)
+
+
+def test_endpoints_consistent_hash():
+    pool = EndpointPool(ADDRESSES, policy='consistent_hash')
+    keys = [f'session-{i}' for i in range(300)]
+    owners = {key: _addresses(pool, 1, key)[0] for key in keys}
+
+    assert _addresses(pool, 3, keys[0]) == [owners[keys[0]]] * 3
+    assert set(owners.values()) == set(ADDRESSES)
+
+    # only the keys of an unavailable endpoint move
+    pool.endpoints[0].connectivity = grpc.ChannelConnectivity.TRANSIENT_FAILURE
+    moved = {key: _addresses(pool, 1, key)[0] for key in keys}
+
+    for key in keys:
+        if owners[key] == 'a:1':
+            assert moved[key] != 'a:1'
+        else:
+            assert moved[key] == owners[key]
+
+
+def test_endpoints_ejection():
+    pool = EndpointPool(ADDRESSES, max_failures=2, ejection_time=0.2)
+    a, b, c = pool.endpoints
+
+    for _ in range(2):
+        pool.release(pool.pick(exclude=(b, c)), ok=False)
+
+    assert 'a:1' not in _addresses(pool, 4)
+
+    # a success resets the failures in a row
+    pool.release(pool.pick(exclude=(a, c)), ok=False)
+    pool.release(pool.pick(exclude=(a, c)), ok=True)
+    pool.release(pool.pick(exclude=(a, c)), ok=False)
+
+    assert 'b:1' in _addresses(pool, 2)
+
+    time.sleep(0.2)
+
+    assert 'a:1' in _addresses(pool, 3)
+
+
+def test_endpoints_unavailable():
+    pool = EndpointPool(ADDRESSES, max_failures=1, ejection_time=60)
+    a, b, c = pool.endpoints
+
+    b.connectivity = grpc.ChannelConnectivity.TRANSIENT_FAILURE
+    pool.release(pool.pick(exclude=(a, b)), ok=False)
+    pool.release(pool.pick(exclude=(b, c)), ok=False)
+
+    # requests are not dropped when no endpoint is available: healthy
+    # endpoints come first, then the ones whose ejection ends first
+    assert pool.pick() is c
+    assert pool.pick(exclude=(c,)) is a
+    assert pool.pick(exclude=(a, c)) is b
+    assert pool.pick(exclude=(a, b, c)) is None
+
+
+@pytest.mark.parametrize(
+    'addresses, kwargs',
+    [
+        ([], {}),
+        (['a:1', 'a:1'], {}),
+        (ADDRESSES, {'policy': 'random'}),
+        (ADDRESSES, {'max_failures': 0}),
+    ],
+)
+def test_endpoints_invalid(addresses, kwargs):
+    with pytest.raises(ValueError):
+        EndpointPool(addresses, **kwargs)
@@ -0,0 +1,89 @@
+import gc
+import io
+
+import numpy as np
+import pytest
+
+from juturna.components import Message
+from juturna.payloads import ImagePayload
+from juturna.utils.mem_utils import FramePool, attach_frame
+
+
+def test_slot_released_on_last_reference():
+    pool = FramePool((2, 2), np.uint8, slots=2)
+
+    slot = pool.acquire()
+    frame = slot.array
+    view = frame[:1]
+
+    del slot, frame
+    gc.collect()
+
+    assert pool.available == 1
+
+    del view
+    gc.collect()
+
+    assert pool.available == 2
+
+
+def test_exhausted_pool_does_not_block():
+    pool = FramePool((2, 2), np.uint8, slots=1)
+
+    held = pool.acquire()
+
+    assert held is not None
+    assert pool.acquire() is None
+    assert pool.misses == 1
+
+
+def test_slots_are_reused():
+    pool = FramePool((2, 2), np.uint8, slots=2)
+    indexes = list()
+
+    for _ in range(4):
+        slot = pool.acquire()
+        indexes.append(slot.index)
+        del slot
+
+    assert indexes == [0, 1, 0, 1]
+
+
+def test_read_into_slot_and_freeze():
+    pool = FramePool((2, 3), np.uint8, slots=1)
+    slot = pool.acquire()
+
+    read = io.BufferedReader(io.BytesIO(bytes(range(6)))).readinto(slot.data)
+
+    message = Message(creator='src', payload=ImagePayload(image=slot.array))
+    message._freeze()
+
+    assert read == 6
+    assert message.payload.image[1, 2] == 5
+
+    with pytest.raises(ValueError):
+        message.payload.image[0, 0] = 1
+
+    # sealing the payload does not affect the next slot acquisitions
+    del slot, message
+    gc.collect()
+
+    assert pool.acquire().array.flags.writeable
+
+
+def test_shared_pool_attach():
+    pool = FramePool((4,), np.float32, slots=2, shared=True)
+
+    try:
+        slot = pool.acquire()
+        slot.array[:] = 1.5
+
+        frame = attach_frame(slot.handle)
+
+        np.testing.assert_array_equal(frame, slot.array)
+        assert not frame.flags.writeable
+        assert not np.shares_memory(frame, slot.array)
+
+        del slot, frame
+    finally:
+        pool.close()
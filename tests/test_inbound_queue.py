@@ -0,0 +1,126 @@
+import pytest
+
+from juturna.components import Message, Node
+from juturna.components._inbound_queue import InboundQueue
+from juturna.payloads import BytesPayload, ControlPayload, ControlSignal
+
+
+def _msg(version, creator='src'):
+    return Message(creator=creator, version=version, payload=BytesPayload())
+
+
+def _stop():
+    return Message(creator='ctrl', payload=ControlPayload(ControlSignal.STOP))
+
+
+def _versions(q):
+    return [m.version for m in q.queue]
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        InboundQueue(maxsize=3, policy='drop_everything')
+
+
+def test_drop_oldest():
+    q = InboundQueue(maxsize=3, policy='drop_oldest')
+
+    dropped = [d for i in range(5) for d in q.offer(_msg(i))]
+
+    assert _versions(q) == [2, 3, 4]
+    assert [d.version for d in dropped] == [0, 1]
+
+
+def test_drop_newest():
+    q = InboundQueue(maxsize=3, policy='drop_newest')
+
+    dropped = [d for i in range(5) for d in q.offer(_msg(i))]
+
+    assert _versions(q) == [0, 1, 2]
+    assert [d.version for d in dropped] == [3, 4]
+
+
+def test_coalesce_latest_per_origin():
+    q = InboundQueue(maxsize=4, policy='coalesce_latest')
+
+    for i in range(5):
+        q.offer(_msg(i, 'cam_a'))
+        q.offer(_msg(i + 100, 'cam_b'))
+
+    assert _versions(q) == [3, 103, 4, 104]
+
+
+def test_coalesce_latest_only_when_full():
+    q = InboundQueue(maxsize=10, policy='coalesce_latest')
+
+    dropped = [d for i in range(5) for d in q.offer(_msg(i, 'cam_a'))]
+
+    assert _versions(q) == [0, 1, 2, 3, 4]
+    assert dropped == []
+
+    q = InboundQueue(maxsize=2, policy='coalesce_latest')
+    q.offer(_msg(0, 'cam_a'))
+    q.offer(_msg(1, 'cam_b'))
+
+    # no queued message from the origin, the oldest one is dropped
+    dropped = q.offer(_msg(2, 'cam_c'))
+
+    assert _versions(q) == [1, 2]
+    assert [d.version for d in dropped] == [0]
+
+
+def test_per_item_policy_overrides_default():
+    q = InboundQueue(maxsize=2, policy='block')
+
+    q.offer(_msg(0))
+    q.offer(_msg(1))
+    dropped = q.offer(_msg(2), policy='drop_oldest')
+
+    assert _versions(q) == [1, 2]
+    assert [d.version for d in dropped] == [0]
+
+
+def test_control_messages_are_never_dropped():
+    q = InboundQueue(maxsize=2, policy='drop_oldest')
+
+    q.offer(_stop())
+    q.offer(_msg(0))
+    q.offer(_msg(1))
+
+    assert isinstance(q.queue[0].payload, ControlPayload)
+    assert q.queue[1].version == 1
+
+    q = InboundQueue(maxsize=2, policy='coalesce_latest')
+
+    q.offer(_msg(0, 'ctrl'))
+    q.offer(_stop())
+    q.offer(_msg(1, 'ctrl'))
+
+    assert isinstance(q.queue[0].payload, ControlPayload)
+    assert q.queue[1].version == 1
+
+
+def test_node_counts_drops():
+    node = Node(node_name='dropping', pipe_name='test_pipe')
+    node.overflow = 'drop_newest'
+    node._queue.maxsize = 2
+
+    for i in range(5):
+        node.put(_msg(i))
+
+    assert node.dropped == 3
+
+
+def test_link_policy_overrides_node_policy():
+    src = Node(node_name='src', pipe_name='test_pipe')
+    dst = Node(node_name='dst', pipe_name='test_pipe')
+    dst._queue.maxsize = 2
+
+    src.add_destination('dst', dst, overflow='drop_oldest')
+
+    for i in range(4):
+        src.transmit(_msg(i))
+
+    assert dst.overflow == 'block'
+    assert dst.dropped == 2
+    assert _versions(dst._queue) == [2, 3]
@@ -360,3 +360,53 @@ def test_message_immutable_payload():
 
     assert "cannot assign to field 'channels'" in str(context.value)
     assert test_message.payload.channels == 2
+
+
+def test_message_freeze_seals_arrays():
+    frame = np.zeros((4, 4), dtype=np.uint8)
+    test_message = Message(
+        creator='tester',
+        version=7,
+        payload=VideoPayload(video=[ImagePayload(image=frame)]),
+    )
+
+    test_message._freeze()
+
+    assert not frame.flags.writeable
+
+    with pytest.raises(ValueError):
+        test_message.payload.video[0].image[0, 0] = 1
+
+
+def test_message_freeze_seals_object_arrays():
+    test_message = Message(
+        creator='tester',
+        version=7,
+        payload=ObjectPayload(boxes=[np.ones(4)], scores=np.ones(2)),
+    )
+
+    test_message._freeze()
+
+    assert not test_message.payload['boxes'][0].flags.writeable
+    assert not test_message.payload['scores'].flags.writeable
+
+
+def test_message_draft_copy_on_write():
+    frame = np.zeros((4, 4), dtype=np.uint8)
+    received = Message(
+        creator='tester', version=7, payload=ImagePayload(image=frame)
+    )
+    received._freeze()
+
+    draft = Draft(ImagePayload, copy_from=received.payload)
+
+    # copied fields are shared, not duplicated
+    assert draft.image is frame
+
+    draft.image = received.payload.image[:2]
+    crop = draft.writable('image')
+    crop[0, 0] = 255
+
+    assert draft.writable('image') is crop
+    assert not np.shares_memory(crop, frame)
+    assert frame[0, 0] == 0
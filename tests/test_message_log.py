@@ -0,0 +1,192 @@
+import pathlib
+import time
+
+import numpy as np
+
+import juturna as jt
+
+from juturna.components import Message, Node
+from juturna.components._message_log import MessageLog, MessageLogWriter
+from juturna.nodes.source._replay.replay import Replay
+from juturna.payloads import AudioPayload, ControlPayload, ControlSignal
+from juturna.payloads import ObjectPayload
+
+
+class Collector(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.received = list()
+
+    def update(self, message):
+        self.received.append((time.monotonic(), message))
+
+
+def _record(path, count, interval=0.0):
+    writer = MessageLogWriter(path)
+
+    for i in range(count):
+        message = Message(
+            creator='origin',
+            version=i,
+            payload=AudioPayload(
+                audio=np.full(16, i, dtype=np.float32),
+                sampling_rate=16000,
+                channels=1,
+            ),
+        )
+        message.meta['index'] = i
+        message._freeze()
+
+        writer.put(message)
+        time.sleep(interval)
+
+    writer.put(Message(creator='origin', payload=ControlPayload(
+        signal=ControlSignal.STOP)))
+    writer.close()
+
+
+def test_message_log_round_trip(tmp_path):
+    path = tmp_path / 'link.jtml'
+
+    _record(path, 5)
+    _record(path, 3)
+
+    # an interrupted recording leaves a truncated record
+    with open(path, 'ab') as f:
+        f.write(b'M\x00\x01')
+
+    with MessageLog(path) as log:
+        messages = [message for _, message in log]
+
+    assert len(messages) == 8
+    assert [m.version for m in messages] == [0, 1, 2, 3, 4, 0, 1, 2]
+    assert messages[3].meta['index'] == 3
+    assert (messages[3].payload.audio == 3).all()
+
+
+def test_replay_pace(tmp_path):
+    path = tmp_path / 'link.jtml'
+    _record(path, 10, interval=0.04)
+
+    for speed, low, high in [(1.0, 0.3, 0.6), (4.0, 0.07, 0.2), (0, 0, 0.05)]:
+        replay = Replay(
+            log_file=str(path), speed=speed, loop=False,
+            node_name='replay', pipe_name='test')
+        collector = Collector(node_name='collector', pipe_name='test')
+        replay.add_destination('collector', collector)
+        collector.origins.append('replay')
+
+        replay.warmup()
+        collector.start()
+        replay.start()
+
+        deadline = time.monotonic() + 5
+
+        while len(collector.received) < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        replay.stop()
+        collector.stop()
+
+        times = [t for t, _ in collector.received]
+
+        assert [m.version for _, m in collector.received] == list(range(10))
+        assert all(m.creator == 'replay' for _, m in collector.received)
+        assert low <= times[-1] - times[0] <= high
+
+
+def test_replay_relative_log_file(tmp_path):
+    _record(tmp_path / 'link.jtml', 5)
+
+    replay = Replay(
+        log_file='link.jtml', speed=0, loop=False,
+        node_name='replay', pipe_name='test')
+    replay.pipe_path = str(tmp_path / 'replay')
+    replay.warmup()
+
+    assert len(replay._log) == 5
+
+    replay.destroy()
+
+
+def test_pipeline_record_and_replay(test_config):
+    folder = pathlib.Path(test_config['test_pipeline_folder'])
+    recording = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'recording_pipeline',
+            'id': 'recording_1',
+            'folder': str(folder / 'recording_pipeline'),
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'data_streamer',
+                    'configuration': {'rate': 50}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'dumper',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'sink_1', 'record': 'link.jtml'}
+            ]
+        }
+    })
+    recording.warmup()
+    recording.start()
+    time.sleep(0.5)
+    recording.stop()
+    recording.destroy()
+
+    log_file = folder / 'recording_pipeline' / 'link.jtml'
+
+    with MessageLog(log_file) as log:
+        recorded = len(log)
+
+    assert recorded > 5
+
+    replaying = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'replaying_pipeline',
+            'id': 'replaying_1',
+            'folder': str(folder / 'replaying_pipeline'),
+            'nodes': [
+                {
+                    'name': 'replay_1',
+                    'type': 'source',
+                    'mark': 'replay',
+                    'configuration': {
+                        'log_file': '../recording_pipeline/link.jtml',
+                        'speed': 0
+                    }
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'dumper',
+                    'configuration': {}
+                }
+            ],
+            'links': [{'from': 'replay_1', 'to': 'sink_1'}]
+        }
+    })
+    replaying.warmup()
+    replaying.start()
+
+    sink = replaying._nodes['sink_1']
+    deadline = time.monotonic() + 5
+
+    while sink._received < recorded and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert sink._received == recorded
+
+    replaying.stop()
+    replaying.destroy()
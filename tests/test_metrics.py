@@ -0,0 +1,100 @@
+import juturna as jt
+
+from juturna.components import Message
+from juturna.components._metrics import Histogram, LatencyTracker, NodeMetrics
+from juturna.payloads import BasePayload
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(50) - 0.5) / 0.5 < 0.04
+    assert abs(histogram.percentile(99) - 0.99) / 0.99 < 0.04
+    assert histogram.percentile(100) == 1.0
+
+    # bucket bounds are within the histogram precision of the requested ones
+    below = histogram.cumulative((0.0001, 0.1, 10.0))
+
+    assert below[0] == 0
+    assert 96 <= below[1] <= 100
+    assert below[2] == 1000
+
+
+def test_latency_follows_data_source():
+    tracker = LatencyTracker()
+    source = NodeMetrics()
+    sink = NodeMetrics()
+    source.tracker = sink.tracker = tracker
+
+    origin = Message[BasePayload](creator='src', payload=BasePayload())
+    object.__setattr__(origin, 'created_at', origin.created_at - 1)
+    source.on_rx(origin)
+
+    produced = Message[BasePayload](creator='src', payload=BasePayload())
+    object.__setattr__(produced, '_data_source_id', origin.id)
+    source.on_tx(produced)
+    sink.on_rx(produced)
+
+    assert sink.latency.count == 1
+    assert 1 <= sink.latency.max < 1.5
+    assert source.snapshot()['tx'] == 1
+    assert sink.snapshot()['latency_ms']['p50'] >= 1000
+
+
+def test_pipeline_metrics(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'metrics_pipeline',
+            'id': 'metrics_1',
+            'folder': f'{p}/metrics_pipeline',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'sink_1'}
+            ]
+        }
+    })
+    pipeline.warmup()
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    metrics = pipeline.status['nodes']['sink_1']['metrics']
+
+    assert metrics['rx'] >= 4
+    assert metrics['update_ms']['count'] >= 4
+    assert metrics['latency_ms']['count'] >= 4
+    assert metrics['queue_depth'] >= 0
+
+    text = pipeline.prometheus_metrics()
+
+    pipeline.stop()
+
+    assert (
+        'juturna_node_rx_total{pipeline="metrics_1",node="sink_1"}' in text
+    )
+    assert (
+        'juturna_node_latency_seconds_bucket'
+        '{pipeline="metrics_1",node="sink_1",le="+Inf"}'
+    ) in text
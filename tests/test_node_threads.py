@@ -56,3 +56,84 @@ def test_stop_draining_no_deadlock_with_real_work(wait_for_condition):
 
     assert not stop_thread.is_alive(), "Deadlock detected in node.stop()"
     assert node._last_data_source_evt_id == 29, f"Not all messages were processed during draining, last processed ID: {node._last_data_source_evt_id}"
+
+def test_idle_node_stops_immediately():
+    node = SlowNode(node_name="idle_node", pipe_name="test_pipe")
+    node.start()
+
+    worker, update = node._worker_thread, node._update_thread
+
+    start = time.perf_counter()
+    node.stop()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5, f"Idle node took {elapsed:.2f}s to stop"
+    assert not worker.is_alive()
+    assert not update.is_alive()
+
+
+def test_idle_node_restarts_after_stop(wait_for_condition):
+    node = SlowNode(node_name="restart_node", pipe_name="test_pipe")
+    node.start()
+    node.stop()
+    node.start()
+
+    node.put(Message(payload=BytesPayload(cnt=b"x"), creator="test_source", version=0))
+
+    assert wait_for_condition(lambda: node._last_data_source_evt_id is not None, timeout=2)
+
+    node.stop()
+
+class BatchingNode(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.groups = list()
+
+    def update_batch(self, messages):
+        time.sleep(0.01)
+        self.groups.append([m.version for m in messages])
+
+        for message in messages:
+            self.transmit(
+                Message(creator=self.name, version=message.version),
+                source=message,
+            )
+
+class Collector(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.messages = list()
+
+    def update(self, message):
+        self.messages.append(message)
+
+def test_micro_batching_groups_and_data_source(wait_for_condition):
+    node = BatchingNode(node_name="batching_node", pipe_name="test_pipe")
+    sink = Collector(node_name="sink", pipe_name="test_pipe")
+    node.micro_batch = {'max_size': 4, 'max_wait_ms': 5}
+    node.add_destination('sink', sink)
+    sink.start()
+    node.start()
+
+    sent = [Message(creator="test_source", version=i) for i in range(20)]
+
+    for msg in sent:
+        node.put(msg)
+
+    assert wait_for_condition(lambda: len(sink.messages) == 20, timeout=5)
+
+    node.put(generate_stop_message())
+    node.join()
+    sink.put(generate_stop_message())
+    sink.join()
+
+    assert [v for group in node.groups for v in group] == list(range(20))
+    assert max(len(group) for group in node.groups) == 4
+    assert len(node.groups) < 20
+    assert [m._data_source_id for m in sink.messages] == [m.id for m in sent]
+
+def test_micro_batching_ignored_without_update_batch():
+    node = SlowNode(node_name="plain_node", pipe_name="test_pipe")
+    node.micro_batch = {'max_size': 4}
+
+    assert node.micro_batch is None
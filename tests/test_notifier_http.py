@@ -0,0 +1,124 @@
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from juturna.components import Message
+from juturna.nodes.sink import NotifierHTTP
+from juturna.payloads import ControlPayload, ControlSignal, ObjectPayload
+
+
+class _Endpoint(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, failures: int = 0):
+        super().__init__(('127.0.0.1', 0), _Handler)
+
+        self.bodies = list()
+        self.clients = set()
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+
+        with self.server.lock:
+            self.server.clients.add(self.client_address)
+            failing = self.server.failures > 0
+            self.server.failures -= 1
+
+            if not failing:
+                self.server.bodies.append(json.loads(body))
+
+        self.send_response(503 if failing else 200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(endpoint: _Endpoint):
+    threading.Thread(target=endpoint.serve_forever, daemon=True).start()
+
+
+def _notify(endpoint: _Endpoint, count: int, **kwargs) -> NotifierHTTP:
+    node = NotifierHTTP(
+        endpoint=endpoint.url,
+        timeout=5,
+        content_type='application/json',
+        node_name='notifier',
+        pipe_name='test',
+        **kwargs,
+    )
+
+    node.warmup()
+    node.start()
+
+    for v in range(count):
+        node.put(
+            Message(creator='src', version=v, payload=ObjectPayload(value=v))
+        )
+
+    node.put(Message(creator='test', payload=ControlPayload(ControlSignal.STOP)))
+    node.join()
+    node.stop()
+    node.destroy()
+
+    return node
+
+
+def test_notifier_http_reuses_connections():
+    endpoint = _Endpoint()
+    _serve(endpoint)
+
+    node = _notify(endpoint, 20, max_in_flight=2)
+    endpoint.shutdown()
+
+    assert len(endpoint.bodies) == 20
+    assert len(endpoint.clients) <= 2
+    assert node.stats['sent'] == 20
+    assert node.stats['failed'] == 0
+    assert all(b['meta']['session_id'] == node.pipe_id for b in endpoint.bodies)
+
+
+def test_notifier_http_batches():
+    endpoint = _Endpoint()
+    _serve(endpoint)
+
+    node = _notify(endpoint, 10, batch_size=4, batch_wait_ms=200)
+    endpoint.shutdown()
+
+    assert all(isinstance(b, list) for b in endpoint.bodies)
+    assert max(len(b) for b in endpoint.bodies) <= 4
+    assert sum(len(b) for b in endpoint.bodies) == 10
+    assert node.stats['sent'] == 10
+
+
+def test_notifier_http_retries():
+    endpoint = _Endpoint(failures=2)
+    _serve(endpoint)
+
+    node = _notify(endpoint, 1, retries=2, backoff=0.01)
+    endpoint.shutdown()
+
+    assert len(endpoint.bodies) == 1
+    assert node.stats['sent'] == 1
+    assert node.stats['failed'] == 0
+
+    endpoint = _Endpoint(failures=2)
+    _serve(endpoint)
+
+    node = _notify(endpoint, 1, retries=1, backoff=0.01)
+    endpoint.shutdown()
+
+    assert endpoint.bodies == []
+    assert node.stats['failed'] == 1
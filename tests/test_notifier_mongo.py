@@ -0,0 +1,296 @@
+import contextlib
+import importlib.util
+import json
+import pathlib
+import sys
+import threading
+import time
+import types
+import uuid
+
+import pytest
+
+from juturna.components import Message
+from juturna.payloads import ObjectPayload
+
+
+_MODULE = (
+    pathlib.Path(__file__).parent.parent
+    / 'plugins/nodes/sink/_notifier_mongo/notifier_mongo.py'
+)
+
+
+class _PyMongoError(Exception):
+    pass
+
+
+class _BulkWriteError(_PyMongoError):
+    def __init__(self, details):
+        super().__init__('bulk write error')
+        self.details = details
+
+
+def _stub_modules() -> dict:
+    """Stand-ins for pymongo and bson, used when they are not installed"""
+    errors = types.ModuleType('pymongo.errors')
+    errors.PyMongoError = _PyMongoError
+    errors.BulkWriteError = _BulkWriteError
+
+    pymongo = types.ModuleType('pymongo')
+    pymongo.MongoClient = None
+    pymongo.errors = errors
+    pymongo.timeout = lambda seconds: contextlib.nullcontext()
+
+    json_util = types.ModuleType('bson.json_util')
+    json_util.dumps = json.dumps
+    json_util.loads = json.loads
+
+    bson = types.ModuleType('bson')
+    bson.json_util = json_util
+
+    return {
+        'pymongo': pymongo,
+        'pymongo.errors': errors,
+        'bson': bson,
+        'bson.json_util': json_util,
+    }
+
+
+@pytest.fixture
+def notifier_mongo(monkeypatch):
+    if importlib.util.find_spec('pymongo') is None:
+        for name, module in _stub_modules().items():
+            monkeypatch.setitem(sys.modules, name, module)
+
+    spec = importlib.util.spec_from_file_location('notifier_mongo', _MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+class _Collection:
+    """A collection that can be made unreachable, or reject documents"""
+
+    def __init__(self, errors: types.ModuleType):
+        self.documents = dict()
+        self.inserts = list()
+        self.down = False
+        self.rejected_versions = set()
+        self.gate = threading.Event()
+        self.gate.set()
+        self._errors = errors
+
+    def insert_many(self, documents, ordered=True):
+        # as pymongo does, ids are assigned before reaching the server
+        for document in documents:
+            document.setdefault('_id', uuid.uuid4().hex)
+
+        self.gate.wait()
+
+        if self.down:
+            raise self._errors.PyMongoError('server unreachable')
+
+        self.inserts.append(len(documents))
+        write_errors = list()
+
+        for index, document in enumerate(documents):
+            if document['_id'] in self.documents:
+                write_errors.append({'index': index, 'code': 11000})
+            elif document['version'] in self.rejected_versions:
+                write_errors.append({'index': index, 'code': 121})
+            else:
+                self.documents[document['_id']] = document
+
+        if write_errors:
+            raise self._errors.BulkWriteError({'writeErrors': write_errors})
+
+    @property
+    def versions(self) -> list:
+        return sorted(d['version'] for d in self.documents.values())
+
+
+def _node(module, tmp_path, **kwargs):
+    collection = _Collection(module)
+
+    class _Client(dict):
+        def close(self):
+            pass
+
+    node = module.NotifierMongo(
+        endpoint='mongodb://stand-in',
+        database='db',
+        collection='cl',
+        timeout=1,
+        node_name='mongo',
+        pipe_name='test',
+        **kwargs,
+    )
+    node._client_cls = lambda endpoint: _Client(db={'cl': collection})
+    node.pipe_path = str(tmp_path)
+
+    events = list()
+    node._rec_telemetry = lambda message, event: events.append(
+        (message.version, event)
+    )
+
+    node.warmup()
+
+    return node, collection, events
+
+
+def _message(version: int) -> Message:
+    return Message(
+        creator='src', version=version, payload=ObjectPayload(value=version)
+    )
+
+
+def test_mongo_bulk_size(notifier_mongo, tmp_path):
+    node, collection, events = _node(
+        notifier_mongo, tmp_path, bulk_size=4, flush_ms=60000
+    )
+    node.start()
+
+    for version in range(10):
+        node.update(_message(version))
+
+    # the partial bulk is flushed when the node stops
+    node.stop()
+    node.destroy()
+
+    assert collection.inserts == [4, 4, 2]
+    assert collection.versions == list(range(10))
+    assert sorted(events) == [(v, 'sent') for v in range(10)]
+
+
+def test_mongo_flush_ms(notifier_mongo, tmp_path):
+    node, collection, _ = _node(
+        notifier_mongo, tmp_path, bulk_size=100, flush_ms=50
+    )
+    node.start()
+
+    for version in range(3):
+        node.update(_message(version))
+
+    deadline = time.monotonic() + 5
+
+    while not collection.inserts and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # written before the bulk is full, once the flush time is elapsed
+    assert collection.inserts == [3]
+
+    node.stop()
+    node.destroy()
+
+
+def test_mongo_spill_and_replay(notifier_mongo, tmp_path):
+    node, collection, events = _node(
+        notifier_mongo, tmp_path, spill_file='spill.jsonl'
+    )
+    spill_file = tmp_path / 'spill.jsonl'
+
+    collection.down = True
+
+    for version in range(3):
+        node.update(_message(version))
+
+    assert spill_file.exists()
+    assert collection.versions == []
+    assert events == [(v, 'failed') for v in range(3)]
+
+    # spilled documents are written back after the next successful write
+    collection.down = False
+    node.update(_message(3))
+
+    assert collection.inserts == [1, 3]
+    assert collection.versions == list(range(4))
+    assert not spill_file.exists()
+
+
+def test_mongo_replay_duplicates(notifier_mongo, tmp_path):
+    node, collection, _ = _node(
+        notifier_mongo, tmp_path, spill_file='spill.jsonl'
+    )
+    node.update(_message(0))
+
+    # a document that reached mongo before the failure is spilled as well
+    written = next(iter(collection.documents.values()))
+    (tmp_path / 'spill.jsonl').write_text(json.dumps(written) + '\n')
+
+    node.update(_message(1))
+
+    assert collection.versions == [0, 1]
+    assert not (tmp_path / 'spill.jsonl').exists()
+
+
+def test_mongo_rejected_documents(notifier_mongo, tmp_path):
+    node, collection, events = _node(
+        notifier_mongo, tmp_path, bulk_size=3, flush_ms=60000
+    )
+    collection.rejected_versions = {1}
+    node.start()
+
+    for version in range(3):
+        node.update(_message(version))
+
+    node.stop()
+    node.destroy()
+
+    assert collection.versions == [0, 2]
+    assert sorted(events) == [(0, 'sent'), (1, 'failed'), (2, 'sent')]
+
+
+def test_mongo_replay_bounded(notifier_mongo, tmp_path, monkeypatch):
+    monkeypatch.setattr(notifier_mongo, '_REPLAY_SIZE', 2)
+
+    node, collection, _ = _node(
+        notifier_mongo, tmp_path, spill_file='spill.jsonl'
+    )
+
+    collection.down = True
+
+    for version in range(5):
+        node.update(_message(version))
+
+    collection.down = False
+    spilled = (tmp_path / 'spill.jsonl').read_bytes()
+
+    # every successful write sends back a bounded chunk of the spill file,
+    # which is read from the previous chunk, not rewritten
+    node.update(_message(5))
+
+    assert collection.inserts == [1, 2]
+    assert (tmp_path / 'spill.jsonl').read_bytes() == spilled
+
+    node.update(_message(6))
+    node.update(_message(7))
+
+    assert collection.inserts == [1, 2, 1, 2, 1, 1]
+    assert collection.versions == list(range(8))
+    assert not (tmp_path / 'spill.jsonl').exists()
+
+
+def test_mongo_max_pending(notifier_mongo, tmp_path):
+    node, collection, _ = _node(
+        notifier_mongo, tmp_path, bulk_size=2, flush_ms=60000, max_pending=4
+    )
+    collection.gate.clear()
+    node.start()
+
+    # the flusher is stuck on the first bulk, and the buffer fills up
+    updates = threading.Thread(
+        target=lambda: [node.update(_message(v)) for v in range(10)]
+    )
+    updates.start()
+    updates.join(timeout=0.5)
+
+    assert updates.is_alive()
+    assert len(node._pending) == 4
+
+    collection.gate.set()
+    updates.join(timeout=5)
+    node.stop()
+    node.destroy()
+
+    assert collection.versions == list(range(10))
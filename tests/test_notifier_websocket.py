@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+
+from websockets.sync.server import serve
+
+from juturna.components import Message
+from juturna.nodes.sink import NotifierWebsocket
+from juturna.payloads import ControlPayload, ControlSignal, ObjectPayload
+
+
+class _Endpoint:
+    def __init__(self, drop_first: bool = False):
+        self.frames = list()
+        self.connections = 0
+        self._drop_first = drop_first
+        self._server = serve(self._handler, '127.0.0.1', 0)
+
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f'ws://127.0.0.1:{self._server.socket.getsockname()[1]}'
+
+    def close(self):
+        self._server.shutdown()
+
+    def _handler(self, ws):
+        self.connections += 1
+        drop = self._drop_first and self.connections == 1
+
+        for frame in ws:
+            self.frames.append(json.loads(frame))
+
+            if drop:
+                return
+
+
+def _message(version: int) -> Message:
+    return Message(
+        creator='src', version=version, payload=ObjectPayload(value=version)
+    )
+
+
+def _node(endpoint: _Endpoint, **kwargs) -> NotifierWebsocket:
+    node = NotifierWebsocket(
+        endpoint=endpoint.url, node_name='notifier', pipe_name='test', **kwargs
+    )
+
+    node.warmup()
+    node.start()
+
+    return node
+
+
+def _stop(node: NotifierWebsocket):
+    node.put(Message(creator='test', payload=ControlPayload(ControlSignal.STOP)))
+    node.join()
+    node.stop()
+    node.destroy()
+
+
+def test_websocket_single_connection_ordered():
+    endpoint = _Endpoint()
+    node = _node(endpoint, reorder_ms=200)
+
+    for version in [3, 1, 4, 0, 2]:
+        node.put(_message(version))
+
+    _stop(node)
+    time.sleep(0.1)
+    endpoint.close()
+
+    assert [f['version'] for f in endpoint.frames] == [0, 1, 2, 3, 4]
+    assert endpoint.frames[0]['meta']['session_id'] == node.pipe_id
+    assert endpoint.connections == 1
+    assert node.sent == 5
+
+
+def test_websocket_coalesce():
+    endpoint = _Endpoint()
+    node = _node(endpoint, coalesce=True, reorder_ms=200)
+
+    for version in range(6):
+        node.put(_message(version))
+
+    _stop(node)
+    time.sleep(0.1)
+    endpoint.close()
+
+    assert all(isinstance(f, list) for f in endpoint.frames)
+    assert [m['version'] for f in endpoint.frames for m in f] == list(range(6))
+
+
+def test_websocket_reconnect_replay():
+    endpoint = _Endpoint(drop_first=True)
+    node = _node(endpoint, reconnect_ms=10)
+
+    node.put(_message(0))
+
+    while not endpoint.frames:
+        time.sleep(0.01)
+
+    time.sleep(0.2)
+
+    for version in range(1, 6):
+        node.put(_message(version))
+
+    _stop(node)
+    time.sleep(0.1)
+    endpoint.close()
+
+    assert [f['version'] for f in endpoint.frames] == list(range(6))
+    assert node.reconnections == 1
+    assert node.discarded == 0
+
+
+def test_websocket_replay_drops_oldest():
+    node = NotifierWebsocket(
+        endpoint='ws://127.0.0.1:1',
+        replay_size=3,
+        node_name='notifier',
+        pipe_name='test',
+    )
+
+    # the first arrival is dropped, even if its version is not the lowest
+    for version in [5, 1, 9, 2]:
+        node.update(_message(version))
+
+    assert sorted(entry[0] for entry in node._pending) == [1, 2, 9]
+    assert node.discarded == 1
+
+    node.update(_message(0))
+
+    assert sorted(entry[0] for entry in node._pending) == [0, 2, 9]
+    assert node._pending[0][0] == 0
+
+
+def test_websocket_endpoint_change():
+    first, second = _Endpoint(), _Endpoint()
+    node = _node(first)
+    stop = threading.Event()
+
+    # the endpoint changes while the sender is busy sending
+    def _switch():
+        time.sleep(0.05)
+        node.set_on_config('endpoint', second.url)
+        stop.set()
+
+    threading.Thread(target=_switch).start()
+
+    version = 0
+
+    while not stop.is_set():
+        node.put(_message(version))
+        version += 1
+        time.sleep(0.001)
+
+    for _ in range(5):
+        node.put(_message(version))
+        version += 1
+
+    _stop(node)
+    time.sleep(0.1)
+    first.close()
+    second.close()
+
+    assert node.sent == version
+    assert second.frames
+    assert [f['version'] for f in first.frames + second.frames] == list(
+        range(version)
+    )
@@ -0,0 +1,32 @@
+"""
+AsyncDelay
+
+@author: not provided
+@email: not provided
+@created_at: 2026-10-17 11:40:12
+
+Test async proc node. Wait for a delay, then transmit received messages.
+"""
+import asyncio
+
+from juturna.components import Message
+from juturna.components import AsyncNode
+
+from juturna.payloads import BasePayload
+
+
+class AsyncDelay(AsyncNode):
+    def __init__(self, delay: float, concurrency: int, **kwargs):
+        super().__init__(concurrency=concurrency, **kwargs)
+
+        self._delay = delay
+
+    async def update(self, message: Message[BasePayload]):
+        await asyncio.sleep(self._delay)
+        await self.transmit(
+            Message(
+                creator=self.name,
+                version=message.version,
+                payload=message.payload,
+            )
+        )
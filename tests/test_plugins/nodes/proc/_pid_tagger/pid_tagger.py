@@ -0,0 +1,35 @@
+"""
+PidTagger
+
+@author: not provided
+@email: not provided
+@created_at: 2026-10-17 10:12:03
+
+Test proc node. Transmit received messages, tagged with the node process id.
+"""
+import os
+
+from juturna.components import Node
+from juturna.components import Message
+
+from juturna.payloads import BasePayload, ObjectPayload
+
+
+class PidTagger(Node[BasePayload, ObjectPayload]):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def start(self):
+        super().start()
+
+    def stop(self):
+        super().stop()
+
+    def update(self, message: Message[BasePayload]):
+        self.transmit(
+            Message[ObjectPayload](
+                creator=self.name,
+                version=message.version,
+                payload=ObjectPayload(pid=os.getpid()),
+            )
+        )
@@ -0,0 +1,121 @@
+import os
+import time
+
+import numpy as np
+
+import juturna as jt
+
+from juturna.components import Message
+from juturna.components._process_node import ProcessNode
+from juturna.components._serialization import dump_message, load_message
+from juturna.payloads import AudioPayload, Batch
+
+
+def _process_pipeline(p: str, name: str) -> dict:
+    return {
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': name,
+            'id': 'process_1',
+            'folder': f'{p}/{name}',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {}
+                },
+                {
+                    'name': 'proc_1',
+                    'type': 'proc',
+                    'mark': 'pid_tagger',
+                    'isolation': 'process',
+                    'configuration': {}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'proc_1'},
+                {'from': 'proc_1', 'to': 'sink_1'}
+            ]
+        }
+    }
+
+
+def test_dump_load_round_trip():
+    message = Message(
+        creator='src',
+        version=3,
+        payload=AudioPayload(audio=np.ones((4, 1)), sampling_rate=8000),
+    )
+    message.meta['k'] = 'v'
+    message._data_source_id = 'src_id'
+    message._freeze()
+
+    batch = Message(creator='sync', payload=Batch(messages=(message,)))
+    batch._freeze()
+
+    loaded = load_message(dump_message(batch))
+    inner = loaded.payload.messages[0]
+
+    assert loaded.id == batch.id
+    assert inner.id == message.id
+    assert inner.version == 3
+    assert inner.meta == {'k': 'v'}
+    assert inner._data_source_id == 'src_id'
+    np.testing.assert_array_equal(inner.payload.audio, message.payload.audio)
+
+
+def test_process_isolated_node(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline(
+        _process_pipeline(p, 'process_pipeline')
+    )
+    pipeline.warmup()
+
+    proc = pipeline._nodes['proc_1']
+
+    assert isinstance(proc, ProcessNode)
+    assert proc.pid != os.getpid()
+
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    pipeline.stop()
+
+    assert [m.version for m in sink.messages] == [0, 1, 2, 3]
+    assert all(m.payload['pid'] == proc.pid for m in sink.messages)
+    assert all(m.creator == 'proc_1' for m in sink.messages)
+
+    pipeline.destroy()
+
+    assert proc.pid is None
+
+
+def test_process_isolated_node_suspended(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline(
+        _process_pipeline(p, 'process_pipeline_suspended')
+    )
+    pipeline.warmup()
+    pipeline.suspend_node('proc_1')
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) > 0)
+
+    pipeline.stop()
+    pipeline.destroy()
+
+    # suspended nodes forward messages with no processing
+    assert all(isinstance(m.payload, AudioPayload) for m in sink.messages)
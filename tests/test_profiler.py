@@ -0,0 +1,52 @@
+import juturna as jt
+
+
+def test_profile_node(test_config):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins', './plugins'],
+        'pipeline': {
+            'name': 'profiled_pipeline',
+            'id': 'profiled_1',
+            'folder': f'{p}/profiled_pipeline',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'data_streamer',
+                    'configuration': {'rate': 20}
+                },
+                {
+                    'name': 'proc_1',
+                    'type': 'proc',
+                    'mark': 'passthrough_identity',
+                    'configuration': {'delay': 0.01}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'proc_1'},
+                {'from': 'proc_1', 'to': 'sink_1'}
+            ]
+        }
+    })
+    pipeline.warmup()
+    pipeline.start()
+
+    profile = pipeline.profile('proc_1', 0.5, interval=0.005, memory=True)
+
+    pipeline.stop()
+
+    lines = profile['stacks'].splitlines()
+
+    assert profile['samples'] > 10
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert all(line.split(';')[0].endswith('proc_1') for line in lines)
+    assert any('PassthroughIdentity.update' in line for line in lines)
+    assert isinstance(profile['memory'], list)
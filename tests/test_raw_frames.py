@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from juturna.components import Message
+from juturna.payloads import AudioPayload
+from juturna.payloads import Batch
+from juturna.payloads import ImagePayload
+from juturna.payloads import VideoPayload
+from juturna.remotizer import _framing
+from juturna.remotizer.utils import create_envelope
+from juturna.remotizer.utils import deserialize_message
+
+
+def _round_trip(message):
+    frames = list()
+    envelope = create_envelope(message, {}, {}, 'test', id='e', frames=frames)
+    data = _framing.encode((envelope, frames))
+    envelope, received = _framing.decode(data)
+
+    return deserialize_message(envelope.message, received), frames, data
+
+
+def test_raw_frames_round_trip():
+    image = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+    small = np.random.rand(16, 1).astype(np.float32)
+    audio = np.random.rand(16000, 2).astype(np.float32)
+
+    message = Message(
+        creator='test',
+        version=3,
+        payload=Batch(
+            messages=(
+                Message(
+                    creator='a',
+                    payload=AudioPayload(
+                        audio=small, sampling_rate=16000, channels=1
+                    ),
+                ),
+                Message(
+                    creator='b',
+                    payload=AudioPayload(
+                        audio=audio, sampling_rate=16000, channels=2
+                    ),
+                ),
+                Message(
+                    creator='c',
+                    payload=VideoPayload(
+                        video=[
+                            ImagePayload(
+                                image=image, width=160, height=120, depth=3
+                            )
+                        ]
+                        * 2,
+                        frames_per_second=25.0,
+                    ),
+                ),
+            )
+        ),
+    )
+
+    out, frames, data = _round_trip(message)
+
+    # the small array travels in the envelope
+    assert len(frames) == 3
+    assert out.version == 3
+
+    first, second, third = out.payload.messages
+
+    assert np.array_equal(first.payload.audio, small)
+    assert np.array_equal(second.payload.audio, audio)
+    assert second.payload.audio.ctypes.data % 16 == 0
+    assert np.shares_memory(second.payload.audio, np.frombuffer(data, np.uint8))
+
+    for frame in third.payload.video:
+        assert np.array_equal(frame.image, image)
+
+
+def test_raw_frames_non_contiguous():
+    image = np.random.randint(0, 255, (240, 320, 3), dtype=np.uint8)[::2, ::2]
+    message = Message(
+        creator='test',
+        payload=ImagePayload(image=image, width=160, height=120, depth=3),
+    )
+
+    out, frames, _ = _round_trip(message)
+
+    assert len(frames) == 1
+    assert np.array_equal(out.payload.image, image)
+
+
+def test_raw_frames_errors():
+    audio = np.zeros((16000, 1), dtype=np.float32)
+    message = Message(
+        creator='test',
+        payload=AudioPayload(audio=audio, sampling_rate=16000, channels=1),
+    )
+
+    frames = list()
+    envelope = create_envelope(message, {}, {}, 'test', id='e', frames=frames)
+    data = _framing.encode((envelope, frames))
+
+    with pytest.raises(ValueError):
+        deserialize_message(envelope.message)
+
+    with pytest.raises(ValueError):
+        _framing.decode(data[:-8])
+
+    with pytest.raises(ValueError):
+        _framing.decode(b'XXXX' + data[4:])
@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+
+import juturna as jt
+
+from juturna.components import Message, Node
+from juturna.components._replicated_node import ReplicatedNode
+from juturna.payloads import ControlPayload, ControlSignal, ObjectPayload
+
+
+class _SlowReplica(Node):
+    def update(self, message):
+        time.sleep(random.uniform(0, 0.02))
+
+        # odd versions produce no output, even ones produce two
+        if message.version % 2:
+            return
+
+        for part in range(2):
+            self.transmit(
+                Message(
+                    creator=self.name,
+                    version=message.version,
+                    payload=ObjectPayload(
+                        part=part,
+                        thread=threading.get_ident(),
+                    ),
+                )
+            )
+
+
+class _StagedReplica(Node):
+    def update(self, message):
+        # outputs of the same input are produced at different times
+        for part in range(2):
+            self.transmit(
+                Message(
+                    creator=self.name,
+                    version=message.version,
+                    payload=ObjectPayload(part=part),
+                )
+            )
+            time.sleep(random.uniform(0, 0.01))
+
+
+class _Sink(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.messages = list()
+
+    def update(self, message):
+        self.messages.append(message)
+
+
+def _replicated(
+    dispatch=None, replicas: int = 4, replica_cls: type = _SlowReplica
+) -> tuple:
+    proxy = ReplicatedNode(
+        replicas=[
+            replica_cls(node_name='slow', pipe_name='test')
+            for _ in range(replicas)
+        ],
+        dispatch=dispatch,
+        node_name='slow',
+        pipe_name='test',
+    )
+    sink = _Sink(node_name='sink', pipe_name='test')
+
+    proxy.add_destination('sink', sink)
+    proxy.warmup()
+    sink.start()
+    proxy.start()
+
+    return proxy, sink
+
+
+def _stop(proxy: ReplicatedNode, sink: Node):
+    for node in (proxy, sink):
+        node.put(
+            Message(creator='test', payload=ControlPayload(ControlSignal.STOP))
+        )
+        node.join()
+
+
+def test_replicas_restore_order():
+    proxy, sink = _replicated()
+
+    for version in range(40):
+        proxy.put(Message(creator='src', version=version))
+
+    _stop(proxy, sink)
+
+    assert [(m.version, m.payload['part']) for m in sink.messages] == [
+        (v, p) for v in range(0, 40, 2) for p in range(2)
+    ]
+    assert len({m.payload['thread'] for m in sink.messages}) > 1
+    assert proxy.pending == 0
+
+
+def test_replicas_restore_order_of_staged_outputs():
+    proxy, sink = _replicated(replicas=2, replica_cls=_StagedReplica)
+
+    sent = [Message(creator='src', version=version) for version in range(30)]
+
+    for message in sent:
+        proxy.put(message)
+
+    _stop(proxy, sink)
+
+    assert [(m.version, m.payload['part']) for m in sink.messages] == [
+        (v, p) for v in range(30) for p in range(2)
+    ]
+    assert [m._data_source_id for m in sink.messages] == [
+        m.id for m in sent for _ in range(2)
+    ]
+
+
+def test_replica_transmits_outside_update():
+    proxy, sink = _replicated(replicas=2)
+
+    # nothing is in flight on the replica, so the message goes straight out
+    proxy.replicas[1].transmit(Message(creator='slow', version=-1))
+
+    for version in range(4):
+        proxy.put(Message(creator='src', version=version))
+
+    _stop(proxy, sink)
+
+    assert [m.version for m in sink.messages] == [-1, 0, 0, 2, 2]
+    assert proxy.pending == 0
+
+
+def test_keyed_dispatch():
+    proxy, sink = _replicated(dispatch={'policy': 'keyed', 'key': 'stream'})
+
+    for version in range(40):
+        message = Message(creator='src', version=version * 2)
+        message.meta['stream'] = f'stream_{version % 3}'
+        proxy.put(message)
+
+    _stop(proxy, sink)
+
+    threads = dict()
+
+    for message in sink.messages[::2]:
+        stream = f'stream_{(message.version // 2) % 3}'
+        threads.setdefault(stream, set()).add(message.payload['thread'])
+
+    assert len(sink.messages) == 80
+    assert all(len(t) == 1 for t in threads.values())
+
+
+def test_replicated_pipeline(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'replicated_pipeline',
+            'id': 'replicated_1',
+            'folder': f'{p}/replicated_pipeline',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {}
+                },
+                {
+                    'name': 'proc_1',
+                    'type': 'proc',
+                    'mark': 'pid_tagger',
+                    'replicas': 2,
+                    'configuration': {}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'proc_1'},
+                {'from': 'proc_1', 'to': 'sink_1'}
+            ]
+        }
+    })
+    pipeline.warmup()
+
+    assert len(pipeline._nodes['proc_1'].replicas) == 2
+
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    pipeline.stop()
+
+    assert [m.version for m in sink.messages] == [0, 1, 2, 3]
+    assert all(m.creator == 'proc_1' for m in sink.messages)
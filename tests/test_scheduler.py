@@ -0,0 +1,223 @@
+import threading
+import time
+
+import pytest
+
+import juturna as jt
+
+from juturna.components import Message, Node
+from juturna.components._inbound_queue import InboundQueue
+from juturna.components._scheduler import PoolScheduler
+from juturna.names import ComponentStatus
+from juturna.payloads import BytesPayload, ControlPayload, ControlSignal
+
+
+class RecordingNode(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.versions = list()
+        self.threads = set()
+
+    def update(self, message: Message):
+        self.versions.append(message.version)
+        self.threads.add(threading.current_thread().name)
+
+
+def _pooled_node(name: str) -> RecordingNode:
+    node = RecordingNode(node_name=name, pipe_name='test_pipe')
+    node.scheduler = PoolScheduler()
+    node.start()
+
+    return node
+
+
+def _stop(node: Node):
+    node.put(
+        Message(creator='test_control', payload=ControlPayload(ControlSignal.STOP))
+    )
+    node.join()
+
+
+def test_pool_scheduler_is_shared():
+    assert PoolScheduler() is PoolScheduler()
+
+
+def test_pooled_node_spawns_no_threads():
+    node = _pooled_node('no_threads')
+
+    assert node.status == ComponentStatus.RUNNING
+    assert node._worker_thread is None
+    assert node._update_thread is None
+
+    _stop(node)
+
+
+def test_pooled_node_keeps_ordering(wait_for_condition):
+    node = _pooled_node('ordering')
+
+    for i in range(500):
+        node.put(Message(creator='src', version=i, payload=BytesPayload(cnt=b'x')))
+
+    assert wait_for_condition(lambda: len(node.versions) == 500, timeout=5)
+    assert node.versions == list(range(500))
+    assert all(t.startswith('_jt_pool') for t in node.threads)
+
+    _stop(node)
+
+
+def test_pooled_nodes_share_the_pool(wait_for_condition):
+    nodes = [_pooled_node(f'shared_{i}') for i in range(50)]
+
+    for node in nodes:
+        for i in range(20):
+            node.put(Message(creator='src', version=i, payload=BytesPayload()))
+
+    assert wait_for_condition(
+        lambda: all(len(n.versions) == 20 for n in nodes), timeout=5
+    )
+
+    used_threads = set().union(*[n.threads for n in nodes])
+
+    assert len(used_threads) <= PoolScheduler().max_workers
+
+    for node in nodes:
+        assert node.versions == list(range(20))
+        _stop(node)
+
+
+class RelayNode(RecordingNode):
+    def update(self, message: Message):
+        super().update(message)
+        self.transmit(
+            Message(creator=self.name, version=message.version, payload=BytesPayload())
+        )
+
+
+class SlowNode(RecordingNode):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.received = list()
+
+    def update(self, message: Message):
+        time.sleep(0.001)
+        super().update(message)
+        self.received.append((message.creator, message.version))
+
+
+def test_pooled_producers_lose_nothing(wait_for_condition):
+    consumer = SlowNode(node_name='slow_consumer', pipe_name='test_pipe')
+    consumer._queue = InboundQueue(maxsize=2)
+    consumer.scheduler = PoolScheduler()
+    consumer.start()
+
+    # with blocking puts, producers would hold every pool thread waiting for
+    # a consumer that never gets one
+    producers = [
+        RelayNode(node_name=f'producer_{i}', pipe_name='test_pipe')
+        for i in range(PoolScheduler().max_workers * 2)
+    ]
+
+    for producer in producers:
+        producer.add_destination('slow_consumer', consumer)
+        producer.scheduler = PoolScheduler()
+        producer.start()
+
+    for producer in producers:
+        for i in range(20):
+            producer.put(Message(creator='src', version=i, payload=BytesPayload()))
+
+    # the default block policy is lossless, and keeps the order of producers
+    assert wait_for_condition(
+        lambda: len(consumer.received) == 20 * len(producers), timeout=10
+    )
+    assert consumer._dropped == 0
+
+    for producer in producers:
+        assert [v for c, v in consumer.received if c == producer.name] == list(
+            range(20)
+        )
+
+    for producer in producers:
+        _stop(producer)
+
+    _stop(consumer)
+
+
+def test_pooled_node_drains_on_stop():
+    node = _pooled_node('draining')
+
+    for i in range(100):
+        node.put(Message(creator='src', version=i, payload=BytesPayload()))
+
+    _stop(node)
+
+    assert node.versions == list(range(100))
+
+
+def test_pipeline_with_pool_scheduler(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+
+    pipeline_config = {
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'pool_scheduler_pipeline',
+            'id': 'pool_1',
+            'folder': f'{p}/pool_scheduler_pipeline',
+            'scheduler': 'pool',
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {'rate': 10},
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {},
+                },
+            ],
+            'links': [{'from': 'source_1', 'to': 'sink_1'}],
+        },
+    }
+
+    pipeline = jt.components.Pipeline(pipeline_config)
+    pipeline.warmup()
+
+    assert all(isinstance(n.scheduler, PoolScheduler) for n in pipeline._nodes.values())
+
+    pipeline.start()
+    assert wait_for_condition(
+        lambda: len(pipeline._nodes['sink_1'].messages) >= 4, timeout=5
+    )
+    pipeline.stop()
+
+    versions = [m.version for m in pipeline._nodes['sink_1'].messages]
+
+    assert versions == sorted(versions)
+
+
+def test_pipeline_unknown_scheduler(test_config):
+    p = test_config['test_pipeline_folder']
+
+    pipeline = jt.components.Pipeline(
+        {
+            'version': '0.2.0',
+            'plugins': [],
+            'pipeline': {
+                'name': 'unknown_scheduler_pipeline',
+                'id': 'pool_2',
+                'folder': f'{p}/unknown_scheduler_pipeline',
+                'scheduler': 'nope',
+                'nodes': [],
+                'links': [],
+            },
+        }
+    )
+
+    with pytest.raises(ValueError):
+        pipeline.warmup()
@@ -0,0 +1,159 @@
+import pytest
+
+from juturna.components import Buffer, Message, Node
+from juturna.components._synchronisers import build_synchroniser
+from juturna.components._synchronisers import event_time
+from juturna.components._synchronisers import CountWindow
+from juturna.components._synchronisers import LatestZip
+from juturna.components._synchronisers import SlidingWindow
+from juturna.components._synchronisers import Synchroniser
+from juturna.components._synchronisers import TimeWindowJoin
+from juturna.payloads import AudioPayload, Batch, ControlPayload
+from juturna.payloads import ControlSignal, ImagePayload, ObjectPayload
+
+
+def _audio(creator, start, version=0):
+    return Message(
+        creator=creator, version=version, payload=AudioPayload(start=start)
+    )
+
+
+def _image(creator, ts, version=0):
+    return Message(
+        creator=creator, version=version, payload=ImagePayload(timestamp=ts)
+    )
+
+
+def _released(buffer):
+    released = list()
+
+    while not buffer.empty():
+        batch = buffer.get(block=False)
+        released.append(
+            [(m.creator, m.version) for m in batch.payload.messages]
+            if isinstance(batch.payload, Batch)
+            else [(batch.creator, batch.version)]
+        )
+
+    return released
+
+
+def test_synchroniser_requires_arrived():
+    class Incomplete(Synchroniser):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_build_synchroniser():
+    assert build_synchroniser(None) is None
+    assert build_synchroniser('local') is None
+    assert isinstance(build_synchroniser('latest_zip'), LatestZip)
+
+    sync = build_synchroniser({'policy': 'time_window', 'tolerance': 0.5})
+
+    assert isinstance(sync, TimeWindowJoin)
+    assert sync.tolerance == 0.5
+
+    with pytest.raises(ValueError):
+        build_synchroniser('nope')
+
+
+def test_node_shares_origins_with_synchroniser():
+    node = Node(
+        node_name='n', pipe_name='test_pipe', synchroniser=LatestZip()
+    )
+    node.origins.append('cam_a')
+
+    assert node.synchroniser.origins == ['cam_a']
+
+
+def test_latest_zip():
+    buffer = Buffer('test', LatestZip(origins=['a', 'b']))
+
+    buffer.put(_image('a', 0, 0))
+    buffer.put(_image('a', 1, 1))
+    buffer.put(_image('b', 1, 2))
+    buffer.put(_image('b', 2, 3))
+    buffer.put(_image('a', 2, 4))
+
+    assert _released(buffer) == [[('a', 1), ('b', 2)], [('a', 4), ('b', 3)]]
+    assert buffer.synchroniser.discarded == 1
+
+
+def test_time_window_join():
+    buffer = Buffer('test', TimeWindowJoin(0.05, origins=['mic', 'cam']))
+
+    buffer.put(_audio('mic', 1.00, 0))
+    buffer.put(_audio('mic', 1.10, 1))
+    buffer.put(_image('cam', 1.12, 2))
+    buffer.put(_image('cam', 1.30, 3))
+    buffer.put(_audio('mic', 1.31, 4))
+
+    assert _released(buffer) == [
+        [('mic', 1), ('cam', 2)],
+        [('mic', 4), ('cam', 3)],
+    ]
+    assert buffer.synchroniser.discarded == 1
+    assert all(len(data) == 0 for data in buffer._data.values())
+
+
+def test_control_messages_are_relayed():
+    buffer = Buffer('test', TimeWindowJoin(0.05, origins=['mic', 'cam']))
+
+    buffer.put(_audio('mic', 1.0, 0))
+    buffer.put(
+        Message(creator='pipe', payload=ControlPayload(ControlSignal.STOP))
+    )
+
+    assert _released(buffer) == [[('pipe', -1)]]
+    assert len(buffer._data['mic']) == 1
+
+
+def test_event_time_fallback():
+    message = Message(creator='a', payload=ObjectPayload(start=10.0))
+
+    assert event_time(message) == message.created_at
+    assert event_time(_audio('a', 2.5)) == 2.5
+
+
+def test_count_window():
+    buffer = Buffer('test', CountWindow(size=2))
+
+    for i in range(5):
+        buffer.put(_image('a' if i % 2 else 'b', i, i))
+
+    assert _released(buffer) == [[('b', 0), ('b', 2)], [('a', 1), ('a', 3)]]
+
+
+def test_sliding_window_watermark():
+    sync = SlidingWindow(length=1.0, slide=0.5, lateness=0.2, origins=[])
+    buffer = Buffer('test', sync)
+
+    buffer.put(_audio('mic', 0.1, 0))
+    buffer.put(_image('cam', 0.6, 1))
+    assert buffer.empty()
+
+    # watermark moves to 0.6, closing the window [-0.5, 0.5)
+    buffer.put(_audio('mic', 0.8, 2))
+    assert _released(buffer) == [[('mic', 0)]]
+
+    # watermark moves to 1.0, closing the window [0, 1)
+    buffer.put(_audio('mic', 1.2, 3))
+    assert _released(buffer) == [[('mic', 0), ('cam', 1), ('mic', 2)]]
+
+    # late, but within the still open window [0.5, 1.5)
+    buffer.put(_image('cam', 0.7, 4))
+    # only belongs to windows already released
+    buffer.put(_image('cam', 0.2, 5))
+
+    assert sync.discarded == 1
+
+    # watermark moves to 2.8, closing [0.5, 1.5) and [1, 2)
+    buffer.put(_audio('mic', 3.0, 6))
+
+    assert _released(buffer) == [
+        [('cam', 1), ('cam', 4), ('mic', 2), ('mic', 3)],
+        [('mic', 3)],
+    ]
@@ -0,0 +1,168 @@
+import pathlib
+import subprocess
+import sys
+
+import juturna as jt
+
+from juturna.cli.commands import _telemetry_tools
+from juturna.cli.commands._telemetry_tools import convert, summarise
+from juturna.components._telemetry_sinks import build_sink, read_telemetry
+from juturna.components._telemetry_sinks import iter_telemetry
+
+
+def _entries(count: int, latency: float = 0.01) -> list:
+    entries = list()
+
+    for i in range(count):
+        entries.append((i, 'rx', 'proc', 'src', i, None, 10))
+        entries.append((i + latency, 'tx', 'proc', 'proc', count + i, i, 12))
+
+    return entries
+
+
+def test_binary_sink_round_trip(tmp_path):
+    sink = build_sink(str(tmp_path / 'tele.jtl'))
+    entries = _entries(10)
+
+    sink.write(entries[:8])
+    sink.write(entries[8:])
+    sink.close()
+
+    # a restarted pipeline appends to the same file
+    sink.write(entries[:2])
+    sink.close()
+
+    columns = read_telemetry(tmp_path / 'tele.jtl')
+
+    assert list(columns['evt']) == [e[1] for e in entries + entries[:2]]
+    assert list(columns['msg_id']) == [e[4] for e in entries + entries[:2]]
+    assert list(columns['src_id'][:4]) == [-1, 0, -1, 1]
+    assert columns['ts'][1] == 0.01
+
+
+def test_sink_format_default(tmp_path):
+    # files with unknown suffixes are written as csv, as they always were
+    sink = build_sink(str(tmp_path / 'run.log'))
+    sink.write(_entries(2))
+    sink.close()
+
+    assert (tmp_path / 'run.log').read_text().startswith('ts,evt,node')
+    assert len(read_telemetry(tmp_path / 'run.log')['ts']) == 4
+
+    # the binary format can be chosen explicitly, with any suffix
+    sink = build_sink(str(tmp_path / 'run.bin'), format='binary')
+    sink.write(_entries(2))
+    sink.close()
+
+    assert list(read_telemetry(tmp_path / 'run.bin')['msg_id']) == [0, 2, 1, 3]
+
+
+def test_sink_rotation_and_compression(tmp_path):
+    sink = build_sink(
+        str(tmp_path / 'tele.csv'), max_bytes=200, compression='gzip'
+    )
+
+    for _ in range(5):
+        sink.write(_entries(2))
+
+    sink.close()
+
+    assert [s.name for s in sink.segments] == [
+        f'tele.{i:05d}.csv.gz' for i in range(1, 6)
+    ]
+    assert sum(len(read_telemetry(s)['ts']) for s in sink.segments) == 20
+
+
+def test_summarise_and_convert(tmp_path):
+    sink = build_sink(str(tmp_path / 'tele.jtl'))
+    sink.write(_entries(100))
+    sink.close()
+
+    summary = summarise([tmp_path / 'tele.jtl'])
+
+    assert summary['proc']['rx'] == 100
+    assert summary['proc']['tx'] == 100
+    assert abs(summary['proc']['p50_ms'] - 10) < 1e-6
+    assert abs(summary['proc']['p99_ms'] - 10) < 1e-6
+
+    written = convert([tmp_path / 'tele.jtl'], str(tmp_path / 'tele.csv'))
+
+    assert summarise(written) == summary
+
+
+def test_summarise_in_chunks(tmp_path, monkeypatch):
+    for name in ('tele.jtl', 'tele.csv'):
+        sink = build_sink(str(tmp_path / name), compression='gzip')
+
+        for start in range(0, 200, 20):
+            sink.write(_entries(100)[start : start + 20])
+
+        sink.close()
+
+        path = sink.segments[0]
+        chunks = list(iter_telemetry(path, chunk_size=30))
+
+        assert len(chunks) > 1
+        assert [m for c in chunks for m in c['msg_id']] == list(
+            read_telemetry(path)['msg_id']
+        )
+
+        summary = summarise([path])
+
+        # receptions and transmissions are matched across chunks
+        monkeypatch.setattr(_telemetry_tools, '_CHUNK', 7)
+
+        assert summarise([path]) == summary
+        assert summary['proc']['rx'] == 100
+
+        monkeypatch.undo()
+
+
+def test_pipeline_binary_telemetry(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline({
+        'version': '0.2.0',
+        'plugins': ['./tests/test_plugins'],
+        'pipeline': {
+            'name': 'telemetry_pipeline',
+            'id': 'telemetry_1',
+            'folder': f'{p}/telemetry_pipeline',
+            'telemetry': {'file': 'tele.jtl', 'compression': 'gzip'},
+            'nodes': [
+                {
+                    'name': 'source_1',
+                    'type': 'source',
+                    'mark': 'sequencer',
+                    'configuration': {}
+                },
+                {
+                    'name': 'sink_1',
+                    'type': 'sink',
+                    'mark': 'crasher',
+                    'configuration': {}
+                }
+            ],
+            'links': [
+                {'from': 'source_1', 'to': 'sink_1'}
+            ]
+        }
+    })
+    pipeline.warmup()
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    pipeline.stop()
+
+    tele_file = pathlib.Path(pipeline.pipe_path, 'tele.jtl.gz')
+    result = subprocess.run(
+        [sys.executable, '-m', 'juturna', 'telemetry', str(tele_file), '-j'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert '"sink_1"' in result.stdout
+    assert read_telemetry(tele_file)['evt'].tolist().count('rx') >= 8
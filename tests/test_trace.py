@@ -0,0 +1,83 @@
+import queue
+import time
+
+import juturna as jt
+
+from juturna.components import Message, Node, Span, Trace
+from juturna.payloads import Batch, ObjectPayload
+from juturna.remotizer.utils import deserialize_message, message_to_proto
+
+from tests.test_process_node import _process_pipeline
+
+
+class _Warp(Node):
+    """Stand-in for a warp node, transmitting a response from a remote node"""
+
+    def update(self, message: Message):
+        response = Message(creator='remote', payload=ObjectPayload(n=1))
+        response.trace = message.trace.extend(
+            Span('remote', time.time(), time.time(), time.time())
+        )
+
+        self.transmit(deserialize_message(message_to_proto(response)))
+
+
+def test_trace_through_isolated_node(test_config, wait_for_condition):
+    p = test_config['test_pipeline_folder']
+    pipeline = jt.components.Pipeline(_process_pipeline(p, 'trace_pipeline'))
+    pipeline.warmup()
+    pipeline.start()
+
+    sink = pipeline._nodes['sink_1']
+
+    assert wait_for_condition(lambda: len(sink.messages) == 4)
+
+    pipeline.stop()
+    pipeline.destroy()
+
+    for message in sink.messages:
+        spans = message.trace.spans
+
+        assert [s.node for s in spans] == ['source_1', 'proc_1']
+        assert all(s.enqueue_ts <= s.start_ts <= s.end_ts for s in spans)
+        assert spans[0].end_ts <= spans[1].enqueue_ts
+
+    assert len({m.trace.root_id for m in sink.messages}) == 4
+
+
+def test_trace_proto_round_trip():
+    span = Span('node_a', 1.0, 1.5, 2.0)
+    inner = Message(creator='a', payload=ObjectPayload(x=1))
+    inner.trace = Trace(7, (span,))
+
+    batch = Message(creator='sync', payload=Batch(messages=(inner,)))
+    batch.trace = Trace(7, (span, Span('node_b', 2.0, 2.0, 3.0)))
+
+    loaded = deserialize_message(message_to_proto(batch))
+
+    assert loaded.trace == batch.trace
+    assert loaded.payload.messages[0].trace == inner.trace
+    assert loaded.payload.messages[0].payload == {'x': 1}
+    assert deserialize_message(message_to_proto(Message(creator='a'))).trace is None
+
+
+def test_trace_keeps_remote_spans():
+    warp = _Warp(node_name='warp_1')
+    out = queue.Queue()
+    warp.add_destination('out', out)
+
+    request = Message(creator='src', payload=ObjectPayload(n=0))
+    request.trace = Trace(3, (Span('src', 0.0, 0.0, 0.0),))
+    request._freeze()
+
+    warp.put(request)
+    warp._enqueue(warp._queue.get())
+    warp._consume_next()
+
+    trace = out.get_nowait().trace
+    remote, local = trace.span('remote'), trace.span('warp_1')
+
+    assert trace.root_id == 3
+    assert [s.node for s in trace.spans] == ['src', 'remote', 'warp_1']
+    assert local.start_ts <= remote.start_ts <= remote.end_ts <= local.end_ts
+    assert local.queued >= 0
@@ -0,0 +1,330 @@
+import socket
+import threading
+import time
+
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+
+from juturna.cli.commands import _bench_tools
+from juturna.cli.commands._juturna_remote_service import MessagingServiceImpl
+from juturna.components import Message
+from juturna.components import Node
+from juturna.nodes.proc import Warp
+from juturna.payloads import AudioPayload
+from juturna.payloads import ObjectPayload
+from juturna.remotizer import _framing
+from juturna.remotizer.c_protos import messaging_service_pb2_grpc
+
+
+class _Recorder(Node):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.versions = list()
+        self.payloads = list()
+        self.cond = threading.Condition()
+
+    def update(self, message):
+        with self.cond:
+            self.versions.append(message.version)
+            self.payloads.append(message.payload)
+            self.cond.notify_all()
+
+
+def _serve():
+    remote = _bench_tools._Relay(node_name='remote', pipe_name='test')
+    remote.start()
+
+    impl = MessagingServiceImpl(remote, remote_name='test')
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    messaging_service_pb2_grpc.add_MessagingServiceServicer_to_server(
+        impl, server
+    )
+    _framing.add_framed_methods(impl, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+
+    def _stop():
+        server.stop(grace=None)
+        impl.shutdown()
+        remote.stop()
+
+    return port, impl, _stop
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def service():
+    port, _, stop = _serve()
+
+    yield port
+
+    stop()
+
+
+def _warp(port, max_in_flight, raw_frames=False, **kwargs):
+    source = Node(node_name='source', pipe_name='test')
+    warp = Warp(
+        grpc_host='localhost',
+        grpc_port=port,
+        timeout=5,
+        remote_config={},
+        max_in_flight=max_in_flight,
+        raw_frames=raw_frames,
+        node_name='warp',
+        **kwargs,
+        pipe_name='test',
+    )
+    sink = _Recorder(node_name='sink', pipe_name='test')
+
+    source.add_destination('warp', warp)
+    warp.add_destination('sink', sink)
+    warp.warmup()
+    sink.start()
+    warp.start()
+
+    return source, warp, sink
+
+
+def test_warp_stream_order(service):
+    source, warp, sink = _warp(service, max_in_flight=8)
+
+    for version in range(100):
+        source.transmit(
+            Message(
+                creator='source',
+                version=version,
+                payload=ObjectPayload(value=version),
+            )
+        )
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 100, timeout=10)
+
+    warp.stop()
+    sink.stop()
+
+    assert sink.versions == list(range(100))
+
+
+def test_warp_transmits_outside_lock(service):
+    source, warp, sink = _warp(service, max_in_flight=8)
+    owned = list()
+    put = sink.put
+
+    def _put(message, overflow=None):
+        owned.append(warp._in_flight_cond._is_owned())
+        put(message, overflow)
+
+    sink.put = _put
+
+    for version in range(20):
+        source.transmit(
+            Message(
+                creator='source',
+                version=version,
+                payload=ObjectPayload(value=version),
+            )
+        )
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 20, timeout=10)
+
+    warp.stop()
+    sink.stop()
+
+    assert sink.versions == list(range(20))
+    assert owned == [False] * 20
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 4])
+def test_warp_raw_frames(service, max_in_flight):
+    source, warp, sink = _warp(service, max_in_flight, raw_frames=True)
+    audio = np.random.rand(48000, 1).astype(np.float32)
+
+    for version in range(10):
+        source.transmit(
+            Message(
+                creator='source',
+                version=version,
+                payload=AudioPayload(
+                    audio=audio, sampling_rate=48000, channels=1
+                ),
+            )
+        )
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 10, timeout=10)
+
+    warp.stop()
+    sink.stop()
+
+    assert sink.versions == list(range(10))
+    assert all(np.array_equal(p.audio, audio) for p in sink.payloads)
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 4])
+def test_warp_encoding(service, max_in_flight):
+    source, warp, sink = _warp(
+        service, max_in_flight, compression='gzip', audio_encoding='int16'
+    )
+    t = np.arange(48000) / 48000
+    audio = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    for version in range(5):
+        source.transmit(
+            Message(
+                creator='source',
+                version=version,
+                payload=AudioPayload(
+                    audio=audio.reshape(-1, 1),
+                    sampling_rate=48000,
+                    channels=1,
+                ),
+            )
+        )
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 5, timeout=10)
+
+    warp.stop()
+    sink.stop()
+
+    assert sink.versions == list(range(5))
+
+    for payload in sink.payloads:
+        assert payload.audio.dtype == np.float32
+        assert np.abs(payload.audio[:, 0] - audio).max() < 1e-4
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 4])
+def test_warp_object_format(service, max_in_flight):
+    pytest.importorskip('msgpack')
+
+    source, warp, sink = _warp(service, max_in_flight, object_format='msgpack')
+
+    for version in range(5):
+        message = Message(
+            creator='source',
+            version=version,
+            payload=ObjectPayload(
+                words=[{'word': 'ciao', 'id': np.int64(i)} for i in range(3)]
+            ),
+        )
+        source.transmit(message)
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 5, timeout=10)
+
+    warp.stop()
+    sink.stop()
+
+    assert sink.versions == list(range(5))
+
+    for payload in sink.payloads:
+        assert [w['id'] for w in payload.words] == [0, 1, 2]
+        assert all(type(w['id']) is int for w in payload.words)
+
+
+@pytest.mark.parametrize('max_in_flight', [1, 4])
+def test_warp_endpoints(max_in_flight):
+    services = [_serve() for _ in range(2)]
+    endpoints = [f'localhost:{port}' for port, *_ in services]
+
+    # requests sent to the unavailable endpoint fail over to the others
+    source, warp, sink = _warp(
+        None,
+        max_in_flight,
+        endpoints=[*endpoints, f'localhost:{_free_port()}'],
+        max_failures=2,
+    )
+
+    for version in range(12):
+        source.transmit(
+            Message(
+                creator='source',
+                version=version,
+                payload=ObjectPayload(value=version),
+            )
+        )
+
+    with sink.cond:
+        sink.cond.wait_for(lambda: len(sink.versions) == 12, timeout=10)
+
+    warp.stop()
+    sink.stop()
+    warp.destroy()
+
+    served = [
+        impl.get_stats()['successful_requests'] for _, impl, _ in services
+    ]
+
+    for *_, stop in services:
+        stop()
+
+    assert sink.versions == list(range(12))
+    assert [p.value for p in sink.payloads] == list(range(12))
+    assert sum(served) == 12
+    assert all(served)
+
+
+def test_warp_invalid_balancing():
+    with pytest.raises(ValueError):
+        Warp(
+            grpc_host='localhost',
+            grpc_port=1,
+            timeout=1,
+            remote_config={},
+            balancing='consistent_hash',
+            node_name='warp',
+            pipe_name='test',
+        )
+
+
+def test_warp_invalid_encoding():
+    with pytest.raises(ValueError):
+        Warp(
+            grpc_host='localhost',
+            grpc_port=1,
+            timeout=1,
+            remote_config={},
+            compression='rar',
+            node_name='warp',
+            pipe_name='test',
+        )
+
+
+def test_warp_stream_invalid_max_in_flight():
+    with pytest.raises(ValueError):
+        Warp(
+            grpc_host='localhost',
+            grpc_port=1,
+            timeout=1,
+            remote_config={},
+            max_in_flight=0,
+            node_name='warp',
+            pipe_name='test',
+        )
+
+
+def test_warp_stream_unavailable():
+    source, warp, sink = _warp(_free_port(), max_in_flight=2)
+
+    for version in range(4):
+        source.transmit(Message(creator='source', version=version))
+
+    started = time.perf_counter()
+    warp.stop()
+    sink.stop()
+
+    assert time.perf_counter() - started < 5
+    assert sink.versions == []